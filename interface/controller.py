@@ -2,8 +2,11 @@
 # -*- coding: utf-8 -*-
 # @Date    : 2025-07-12 10:02:04
 # @Author  : syuansheng (Dalian Maritime University)
+from queue import Queue,Empty
+from threading import Thread,Event
 from viewer import UI
 from model import Model
+from utils.instrument import SearchCancelled
 
 class Controller:
 	"""
@@ -12,6 +15,9 @@ class Controller:
 	def __init__(self):
 		self.view = UI(self) # ui对象
 		self.model = Model() # datamodel对象
+		self.worker = None # 正在求解的工作线程
+		self.messages = Queue() # 工作线程通过它把进度和结果交给tk的主线程
+		self.cancel_event = Event()
 
 	def readFromFile(self):
 		"""
@@ -43,12 +49,57 @@ class Controller:
 
 	def solve(self):
 		"""
-		处理用户在ui中点击运行求解算法的逻辑
+		处理用户在ui中点击运行求解算法的逻辑：在工作线程中求解并生成gif，主线程每隔一段时间从队列中取出进度刷新ui
 		"""
+		if self.worker is not None and self.worker.is_alive():
+			return
 		self.view.update_state_check3()
-		run_time = self.model.run_algorithm(self.view.rbvar.get())
-		self.view.update_ax_1(['dijkstra_gif','astar_gif'][self.view.rbvar.get()-1])
-		self.view.update_state_check2(run_time)
+		self.cancel_event.clear()
+		type = self.view.rbvar.get()
+		self.worker = Thread(target=self._run,args=(type,),daemon=True)
+		self.view.start_progress()
+		self.worker.start()
+		self.view.after(100,self._poll)
+
+	def _run(self,type):
+		# 在工作线程中运行，不能直接操作ui
+		try:
+			giffilename,search_time,render_time = self.model.run_algorithm(type,
+				progress=lambda stage,done,total:self.messages.put(('progress',stage,done,total)),cancel=self.cancel_event)
+			self.messages.put(('done',giffilename,search_time,render_time))
+		except SearchCancelled:
+			self.messages.put(('cancelled',))
+		except Exception as e:
+			self.messages.put(('error',e))
+
+	def _poll(self):
+		# 在主线程中运行，处理工作线程发来的消息
+		while True:
+			try:
+				message = self.messages.get_nowait()
+			except Empty:
+				break
+			if message[0]=='progress':
+				self.view.update_progress(*message[1:])
+				continue
+			if message[0]=='done':
+				giffilename,search_time,render_time = message[1:]
+				self.view.update_ax_1(giffilename)
+				self.view.update_state_check2(search_time,render_time)
+				self.view.finish_progress()
+			elif message[0]=='cancelled':
+				self.view.finish_progress('Cancelled')
+			else:
+				self.view.finish_progress('Error')
+				self.view.show_error(message[1])
+			return
+		self.view.after(100,self._poll)
+
+	def cancel(self):
+		"""
+		处理用户在ui中点击取消的逻辑，工作线程会在下一次报告进度时停下来
+		"""
+		self.cancel_event.set()
 
 	def run(self):
 		self.view.mainloop()
\ No newline at end of file
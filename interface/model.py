@@ -2,32 +2,46 @@
 # -*- coding: utf-8 -*-
 # @Date    : 2025-07-12 15:36:00
 # @Author  : syuansheng (Dalian Maritime University)
-from pandas import read_excel,DataFrame
-from matplotlib.pyplot import subplots
-from utils.rasterbuilder import RasterMap
-from utils.easypathfinder import dijkstra,astar
-from utils.gifbuilder import generate_gif
+from pandas import DataFrame,ExcelWriter
+from utils.rasterbuilder import RasterMap,GridIndex
+from utils.easypathfinder import solve_dijkstra,solve_astar
+from utils.multigoal import solve_nearest
+from utils.connectivity import component_labels
+from utils.exporter import export_trace
+from utils.tracerecorder import TraceRecorder
+from utils.mapfile import MAP_SUFFIX,save_map,load_map,read_excel_map
+from utils.instrument import ObserverGroup,ProgressObserver,SearchCancelled
 from random import random
-from time import time
+from functools import partial
+from time import perf_counter
+from os import makedirs
+from os.path import join
 from numpy import zeros
 
+GIF_FRAMES = 300 # 求解过程的gif最多画多少帧
+
 class Model:
 	"""
 	管理数据和业务逻辑
 	"""
 	def __init__(self):
 		self.maparray = None
+		self.costarray = None # 每个栅格的进入cost，None表示每一步的cost都是1
 		self.rsm = RasterMap()
 
 	def read_data_from_file(self,path):
 		"""
-		从excel中读取数据
+		从excel或.spmap文件中读取数据，excel的第一个sheet是maparray，如果有第二个sheet，它就是和maparray形状相同的costarray
 		"""
-		self.maparray = read_excel(path,header=None).values
-		self.rsm.buildMap(self.maparray)
+		if path.endswith(MAP_SUFFIX):
+			self.maparray,self.costarray = load_map(path)
+		else:
+			self.maparray,self.costarray = read_excel_map(path)
+		self.rsm.buildMap(self.maparray,self.costarray)
 
 	def random_data(self):
 		self.maparray = zeros((20,20))
+		self.costarray = None
 		for i in range(self.maparray.shape[0]):
 			for j in range(self.maparray.shape[1]):
 				if i==19 and j ==0:
@@ -40,29 +54,55 @@ class Model:
 		self.rsm.buildMap(self.maparray)
 
 	def export_data(self,filename):
-		df = DataFrame(self.maparray)
-		df.to_excel(filename,index=False,header=None)
+		if filename.endswith(MAP_SUFFIX):
+			save_map(filename,self.maparray,self.costarray)
+			return
+		with ExcelWriter(filename) as writer:
+			DataFrame(self.maparray).to_excel(writer,index=False,header=None)
+			if self.costarray is not None:
+				DataFrame(self.costarray).to_excel(writer,sheet_name='cost',index=False,header=None)
 
 
-	def run_algorithm(self,type):
-		# 运行求解算法，求解过程的gif生成出来
-		fig,ax = subplots(figsize=(6,6),dpi=100)
-		fig.tight_layout(pad=0.9)
-		if type == 1:
-			# 运行dijkstra
-			st = time()
-			dijkstra(self.maparray,fig,ax,"dijkstra_frame_dir")
-			fig,ax = subplots(figsize=(6,6),dpi=100)
-			fig.tight_layout(pad=0.05)
-			generate_gif("dijkstra_frame_dir","dijkstra_gif",fig,ax)
-			return round(time()-st)
-		elif type==2:
-			# 运行astar
-			st = time()
-			astar(self.maparray,fig,ax,"astar_frame_dir")
-			fig,ax = subplots(figsize=(6,6),dpi=100)
-			fig.tight_layout(pad=0.2)
-			generate_gif("astar_frame_dir","astar_gif",fig,ax)
-			return round(time()-st)
+	def run_algorithm(self,type,progress=None,cancel=None,output_dir='.'):
+		"""
+		运行求解算法，记录求解过程的trace，再根据trace把gif生成出来。不经过matplotlib，可以在工作线程中调用。
+		maparray中有多个起点或终点时，一次搜索找到离起点最近的终点。
+		trace和gif都保存在output_dir中，文件名为算法名加_trace.npz和_gif.gif，会覆盖同一个算法上一次的结果
 
+		Args:
+			type(int): 1为dijkstra，2为astar
+			progress(function): 可选，求解时调用progress('search',已经弹出的栅格数,可以通行的栅格数)，
+				生成gif时调用progress('render',已经写好的帧数,总帧数)
+			cancel(Event): 可选，被set之后抛出SearchCancelled
+			output_dir(str): 保存trace和gif的目录，不存在时会创建
 
+		Returns:
+			(giffilename,search_time,render_time): gif的文件名（不带.gif后缀），求解和生成gif分别用了多少秒。
+				记录trace和报告进度会拖慢搜索，search_time是不挂observer重新求解一次测得的时间
+		"""
+		name = ['dijkstra','astar'][type-1]
+		solve = [solve_dijkstra,solve_astar][type-1]
+		recorder = TraceRecorder()
+		observer = recorder
+		if progress is not None or cancel is not None:
+			observer = ObserverGroup(recorder,ProgressObserver(progress,cancel))
+		grid = GridIndex(self.maparray,self.costarray)
+		component_labels(grid) # 按指纹缓存，同一张栅格图只建立一次，起点和终点不连通时不用搜索
+		if len(grid.starts)>1 or len(grid.ends)>1:
+			solve = partial(solve_nearest,heuristic=type==2)
+		solve(grid,observer=observer)
+		if cancel is not None and cancel.is_set():
+			raise SearchCancelled()
+		search_time = solve(grid).search_time
+		started = perf_counter()
+		makedirs(output_dir,exist_ok=True)
+		giffilename = join(output_dir,name+"_gif")
+		recorder.trace.save(join(output_dir,name+"_trace.npz"))
+		def render_progress(frame,total):
+			if cancel is not None and cancel.is_set():
+				raise SearchCancelled()
+			if progress is not None:
+				progress('render',frame,total)
+		# 搜索很长时合并相邻的步，gif最多GIF_FRAMES帧
+		export_trace(recorder.trace,giffilename+".gif",frame_budget=GIF_FRAMES,progress=render_progress)
+		return giffilename,search_time,perf_counter()-started
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 10:21:37
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+测试共用的检查：路径必须从起点到终点、每一步只走到上下左右相邻的可以通行的栅格；
+reference_cost是直接在maparray上跑的朴素dijkstra，和被测的代码不共用任何实现
+"""
+
+from heapq import heappush,heappop
+from numpy import asarray,argwhere,inf
+
+def path_cost(grid,path,start=None,end=None):
+	"""
+	检查(x,y)坐标数组path是grid上从start到end（默认为grid.start、grid.end）的一条合法路径，返回它的长度（进入cost之和）
+	"""
+	start = grid.start if start is None else start
+	end = grid.end if end is None else end
+	indexes = [grid.index(x,y) for x,y in asarray(path).tolist()]
+	assert indexes[0]==start and indexes[-1]==end
+	total = 0
+	for previous,current in zip(indexes,indexes[1:]):
+		assert current in grid.neighbors(previous)
+		total += 1 if grid.weight is None else grid.weight[current].item()
+	return total
+
+def free_pairs(grid,rng,count):
+	# 随机选count对可以通行的栅格的索引
+	free = (grid.state!=3).nonzero()[0]
+	return [(int(a),int(b)) for a,b in free[rng.integers(len(free),size=(count,2))]]
+
+def reference_cost(maparray,costarray=None,start=None,end=None):
+	"""
+	maparray上start到end的最短路长度，start、end是maparray中的(行,列)，默认为值为1、2的栅格，不可达时为inf
+	"""
+	maparray = asarray(maparray)
+	start = tuple(argwhere(maparray==1)[0].tolist()) if start is None else tuple(start)
+	end = tuple(argwhere(maparray==2)[0].tolist()) if end is None else tuple(end)
+	nrows,ncols = maparray.shape
+	dist = {start:0}
+	heap = [(0,start)]
+	while heap:
+		d,(i,j) = heappop(heap)
+		if (i,j)==end:
+			return d
+		if d>dist[(i,j)]:
+			continue
+		for ni,nj in ((i+1,j),(i-1,j),(i,j+1),(i,j-1)):
+			if 0<=ni<nrows and 0<=nj<ncols and maparray[ni,nj]!=3:
+				nd = d+(1 if costarray is None else costarray[ni,nj].item())
+				if nd<dist.get((ni,nj),inf):
+					dist[(ni,nj)] = nd
+					heappush(heap,(nd,(ni,nj)))
+	return inf
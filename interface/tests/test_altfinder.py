@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 17:50:31
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal,inf,where
+from numpy.random import default_rng
+from pytest import raises
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_dijkstra,solve_astar
+from utils.distancefield import distance_field
+from utils.altfinder import LandmarkTable,landmark_table,solve_alt
+from .common import path_cost,free_pairs
+
+def _grids():
+	rng = default_rng(0)
+	for seed in range(6):
+		maparray = maze_maparray(31,0.1,seed) if seed%2 else random_maparray(30,0.3,seed)
+		yield GridIndex(maparray,rng.integers(1,9,maparray.shape) if seed%3==0 else None)
+
+def test_matches_dijkstra():
+	# 随机的起点和终点，ALT的cost和dijkstra一样，在迷宫上扩展的栅格比astar少
+	rng = default_rng(1)
+	alt_expanded = astar_expanded = 0
+	for grid in _grids():
+		table = landmark_table(grid,4)
+		for start,end in free_pairs(grid,rng,15):
+			grid.start,grid.end = start,end
+			expected = solve_dijkstra(grid).cost
+			for queue in ('heap','bucket'):
+				result = solve_alt(grid,queue=queue,landmarks=table)
+				assert result.cost==expected
+				if expected<inf:
+					assert path_cost(grid,result.path)==expected
+			if grid.weight is None:
+				alt_expanded += result.expanded
+				astar_expanded += solve_astar(grid).expanded
+	assert alt_expanded<astar_expanded
+
+def test_landmark_distances_and_heuristic():
+	# 距离表的每一行就是从地标出发的最短路长度；启发函数不会高估，并且是一致的
+	rng = default_rng(2)
+	for grid in _grids():
+		table = LandmarkTable.build(grid,4)
+		for landmark,row in zip(table.landmarks.tolist(),table.distance):
+			field = distance_field(grid,grid.coord(landmark),cache=None)
+			assert array_equal(where(field.cost<inf,field.cost,-1),row)
+		target = free_pairs(grid,rng,1)[0][1]
+		hath = table.heuristic(grid,target)
+		for index,_ in free_pairs(grid,rng,60):
+			field = distance_field(grid,grid.coord(index),cache=None)
+			assert hath(index)<=field.cost[target]
+			for neighbor in grid.neighbors(index):
+				step = 1 if grid.weight is None else grid.weight[neighbor]
+				assert hath(index)<=step+hath(neighbor)
+		assert hath(target)==0
+
+def test_save_load(tmp_path):
+	grid = next(_grids())
+	table = LandmarkTable.build(grid,4)
+	table.save(str(tmp_path/'landmarks.npz'))
+	loaded = LandmarkTable.load(str(tmp_path/'landmarks.npz'))
+	assert loaded.shape==table.shape and loaded.fingerprint==table.fingerprint
+	assert array_equal(loaded.landmarks,table.landmarks) and array_equal(loaded.distance,table.distance)
+	assert solve_alt(grid,landmarks=loaded).cost==solve_dijkstra(grid).cost
+	with raises(AssertionError):
+		solve_alt(GridIndex(random_maparray(30,0.3,99)),landmarks=loaded)
+
+def test_unreachable_ndarray_is_rejected():
+	# 直接传入maparray时先建立连通分量，起点和终点不连通时不用搜索
+	maparray = random_maparray(20,0.1,3)
+	maparray[-2,0] = maparray[-1,1] = 3
+	result = solve_alt(maparray)
+	assert result.cost==inf and result.expanded==0
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 15:26:10
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import inf
+from numpy.random import default_rng
+from pytest import raises
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_dijkstra
+from utils.batchsolver import ALGORITHMS,BatchSolver
+from .common import path_cost,free_pairs
+
+def _queries(grid,count,seed=0):
+	pairs = free_pairs(grid,default_rng(seed),count)
+	coords = [[list(grid.coord(start)),list(grid.coord(end))] for start,end in pairs]
+	expected = []
+	for start,end in pairs:
+		single = GridIndex.fromArrays(grid.shape,grid.state.copy(),grid.weight,start,end)
+		expected.append(solve_dijkstra(single).cost)
+	return pairs,coords,expected
+
+def _check(grid,result,pairs,expected):
+	assert len(result)==len(pairs) and result.costs.tolist()==expected
+	for i,(start,end) in enumerate(pairs):
+		if expected[i]<inf:
+			assert path_cost(grid,result.path(i),start,end)==expected[i]
+		else:
+			assert len(result.path(i))==0
+
+def test_matches_single_solves():
+	# 每个算法、单进程和多进程的结果都和逐个用dijkstra求解一样
+	grid = GridIndex(random_maparray(20,0.3,1))
+	pairs,coords,expected = _queries(grid,24)
+	solver = BatchSolver(grid)
+	for algorithm in ALGORITHMS:
+		for processes in (1,2):
+			_check(grid,solver.solve(coords,algorithm=algorithm,processes=processes,chunksize=5),pairs,expected)
+
+def test_weighted_in_shared_memory():
+	# 权重也放进共享内存，工作进程看到的是同一张带权栅格图
+	maparray = maze_maparray(21,0.2,2)
+	costarray = default_rng(2).integers(1,9,maparray.shape)
+	grid = GridIndex(maparray,costarray)
+	pairs,coords,expected = _queries(grid,16,2)
+	solver = BatchSolver(maparray,costarray)
+	for algorithm in ('dijkstra','astar','bidirectional_astar'):
+		_check(grid,solver.solve(coords,algorithm=algorithm,processes=2,chunksize=4),pairs,expected)
+
+def test_invalid_queries():
+	maparray = random_maparray(10,0.3,3)
+	solver = BatchSolver(maparray)
+	obstacle = list(solver.grid.coord(int((solver.grid.state==3).nonzero()[0][0])))
+	with raises(AssertionError):
+		solver.solve([[[0,0],obstacle]],processes=1)
+	with raises(AssertionError):
+		solver.solve([[[0,0],[10,0]]],processes=1)
+	with raises(AssertionError):
+		solver.solve([[[0,0],[1,1]]],algorithm='greedy')
+	assert len(solver.solve([],processes=1))==0
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 17:02:19
+# @Author  : syuansheng (Dalian Maritime University)
+
+from copy import deepcopy
+from numpy import array_equal,inf
+from utils.benchmark import (SOLVERS,random_maparray,maze_maparray,memory_benchmark,hpa_benchmark,alt_benchmark,
+	run_benchmark,render_benchmark,save_report,load_report,compare_reports)
+from .common import reference_cost
+
+def test_maps_are_seeded():
+	# 同一个种子总是同一张图，起点在左下角、终点在右上角；不拆墙的迷宫是一棵生成树，起点和终点一定连通
+	assert array_equal(random_maparray(30,0.2,5),random_maparray(30,0.2,5))
+	assert not array_equal(random_maparray(30,0.2,5),random_maparray(30,0.2,6))
+	maparray = random_maparray(30,0.2,5)
+	assert maparray[-1,0]==1 and maparray[0,-1]==2 and 0.1<(maparray==3).mean()<0.3
+	for seed in range(5):
+		maze = maze_maparray(21,0,seed)
+		assert array_equal(maze,maze_maparray(21,0,seed)) and reference_cost(maze)<inf
+
+def test_run_benchmark_records():
+	# 每个(求解器,边长,障碍物比例)一条记录，精确的求解器cost都和朴素实现一样，HPA*不会更短
+	records = run_benchmark(sizes=(20,30),densities=(0.1,0.3),repeat=1)
+	assert len(records)==2*2*len(SOLVERS)
+	for record in records:
+		expected = reference_cost(random_maparray(record['size'],record['density'],record['seed']))
+		if record['solver']=='hpa':
+			assert record['cost']>=expected
+		else:
+			assert record['cost']==expected
+		assert record['wall_seconds']>=0 and record['peak_bytes']>=0
+		assert record['expanded']>0 or record['cost']==inf
+
+def test_compare_reports(tmp_path):
+	# 保存再读回来和原来一样；cost、扩展的栅格数变了或者明显变慢时报告出来，太短的计时不算
+	report = {'search':run_benchmark(sizes=(20,),densities=(0.2,),solvers=['astar','jps'],repeat=1)}
+	save_report(report,str(tmp_path/'report.json'))
+	baseline = load_report(str(tmp_path/'report.json'))
+	assert baseline==report and compare_reports(baseline,report)==[]
+	current = deepcopy(report)
+	current['search'][0]['cost'] += 1
+	current['search'][1]['expanded'] += 1
+	problems = compare_reports(baseline,current)
+	assert len(problems)==2 and 'cost changed' in problems[0] and 'expanded changed' in problems[1]
+	current = deepcopy(report)
+	baseline['search'][0]['wall_seconds'] = 0.1
+	current['search'][0]['wall_seconds'] = 0.2
+	baseline['search'][1]['wall_seconds'] = 0.001
+	current['search'][1]['wall_seconds'] = 0.004
+	problems = compare_reports(baseline,current)
+	assert len(problems)==1 and '0.1000s -> 0.2000s' in problems[0]
+
+def test_other_benchmarks():
+	record = render_benchmark(size=8)
+	assert record['frames']>1 and record['gif_bytes']>0
+	assert all(record[name]>=0 for name in ('search_seconds','recorded_search_seconds','replay_seconds','draw_seconds','encode_seconds'))
+	record = hpa_benchmark(size=40,queries=5,cluster_size=8)
+	assert 0<record['queries']<=5 and 0<=record['mean_optimality_gap']<=record['max_optimality_gap']
+	record = alt_benchmark(size=31,queries=5,count=4)
+	assert record['alt_expanded_per_query']<=record['astar_expanded_per_query']
+	record = memory_benchmark(size=50)
+	assert 0<record['grid_bytes_per_cell']<record['points_bytes_per_cell']
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 10:24:03
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy.random import default_rng
+from utils.benchmark import random_maparray
+from utils.easypathfinder import solve_dijkstra,solve_bidirectional_dijkstra,solve_bidirectional_astar
+from utils.rasterbuilder import GridIndex
+from .common import path_cost,free_pairs
+
+SOLVERS = (solve_bidirectional_dijkstra,solve_bidirectional_astar)
+
+def test_matches_dijkstra():
+	rng = default_rng(0)
+	for seed in range(5):
+		grid = GridIndex(random_maparray(25,0.3,seed))
+		costarray = rng.integers(1,6,grid.shape)
+		weighted = GridIndex(random_maparray(25,0.3,seed),costarray)
+		for target in (grid,weighted):
+			for start,end in free_pairs(target,rng,10):
+				target.start,target.end = start,end
+				expected = solve_dijkstra(target).cost
+				for solve in SOLVERS:
+					result = solve(target)
+					assert result.cost==expected
+					if result.path.size:
+						assert path_cost(target,result.path)==expected
+
+def test_start_equals_end():
+	grid = GridIndex(random_maparray(10,0.0,0))
+	grid.end = grid.start = grid.index(0,6)
+	for solve in SOLVERS:
+		result = solve(grid)
+		assert result.cost==0 and result.path.tolist()==[[0,6]]
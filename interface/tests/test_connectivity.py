@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 10:05:12
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import isinf,stack,unique
+from numpy.random import default_rng
+from utils.benchmark import random_maparray
+from utils.connectivity import ComponentLabels,cached_labels,component_labels
+from utils.easypathfinder import solve_astar,solve_dijkstra
+from utils.rasterbuilder import GridIndex
+
+def _same_partition(first,second):
+	# 两组编号把栅格分成同样的几块（编号本身可以不同）
+	if ((first<0)!=(second<0)).any():
+		return False
+	passable = first>=0
+	pairs = unique(stack((first[passable],second[passable]),axis=1),axis=0)
+	return len(pairs)==len(unique(first[passable]))==len(unique(second[passable]))
+
+def test_labels_match_search():
+	# 编号相同当且仅当dijkstra找得到路
+	grid = GridIndex(random_maparray(15,0.4,3))
+	labels = ComponentLabels.build(grid)
+	grid.start = int((grid.state!=3).nonzero()[0][0])
+	grid.end = grid.start
+	solve_dijkstra(grid)
+	workspace = grid.workspace
+	reached = workspace.stamp==workspace.generation
+	assert ((labels.label==labels.label[grid.start])==reached).all()
+	assert sum(labels.sizes)==(grid.state!=3).sum()
+
+def test_incremental_updates_match_rebuild(tmp_path):
+	rng = default_rng(1)
+	grid = GridIndex(random_maparray(20,0.35,1))
+	labels = ComponentLabels.build(grid)
+	for _ in range(300):
+		index = int(rng.integers(len(grid)))
+		value = 0 if grid.state[index]==3 else 3
+		grid.setState(index,value)
+		labels.setState(index,value)
+		rebuilt = ComponentLabels.build(grid)
+		assert _same_partition(labels.label,rebuilt.label)
+		assert sorted(size for size in labels.sizes if size)==sorted(rebuilt.sizes)
+	labels.save(tmp_path/'labels.npz')
+	loaded = ComponentLabels.load(tmp_path/'labels.npz')
+	assert (loaded.label==labels.label).all() and loaded.sizes==labels.sizes
+
+def test_unreachable_queries_are_rejected():
+	maparray = random_maparray(30,0.0,0)
+	maparray[:,15] = 3
+	# 传入ndarray时建立编号，不用搜索
+	result = solve_astar(maparray)
+	assert isinf(result.cost) and result.expanded==0 and len(result.path)==0
+	# 直接传入的GridIndex不会为了这个检查建立编号，缓存了编号之后才会
+	maparray[0,0] = 0 # 换一张指纹不同的栅格图
+	grid = GridIndex(maparray)
+	assert cached_labels(grid) is None
+	assert isinf(solve_astar(grid).cost) and solve_astar(grid).expanded>0
+	assert cached_labels(grid) is None
+	component_labels(grid)
+	assert solve_astar(grid).expanded==0
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 15:48:52
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal,inf
+from numpy.random import default_rng
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_dijkstra
+from utils.distancefield import DistanceField,DistanceFieldCache,distance_field
+from .common import path_cost,free_pairs
+
+def _check_field(grid,field,rng):
+	# 随机的终点，距离场的cost和路径都和单独求解的dijkstra一样
+	source = field.source
+	for _,end in free_pairs(grid,rng,30):
+		single = GridIndex.fromArrays(grid.shape,grid.state.copy(),grid.weight,source,end)
+		expected = solve_dijkstra(single).cost
+		x,y = grid.coord(end)
+		assert field.getCost(x,y)==expected
+		path = field.path(x,y)
+		if expected<inf:
+			assert path_cost(grid,path,source,end)==expected
+		else:
+			assert len(path)==0
+
+def test_matches_dijkstra():
+	rng = default_rng(0)
+	for seed in range(6):
+		maparray = random_maparray(20,0.3,seed) if seed%2 else maze_maparray(21,0.1,seed)
+		costarray = rng.integers(1,9,maparray.shape) if seed%3==0 else None
+		grid = GridIndex(maparray,costarray)
+		source = free_pairs(grid,rng,1)[0][0]
+		field = distance_field(grid,grid.coord(source),cache=None)
+		_check_field(grid,field,rng)
+		assert field.getCost(*grid.coord(source))==0 and len(field.path(*grid.coord(source)))==1
+
+def test_cache_eviction():
+	# 同一张栅格图、同一个起点只算一次；超过内存上限时淘汰最久没用过的距离场
+	grid = GridIndex(random_maparray(20,0.2,1))
+	size = DistanceField.build(grid,0).nbytes
+	cache = DistanceFieldCache(max_bytes=2*size)
+	first = distance_field(grid,(0,0),cache=cache)
+	assert distance_field(GridIndex(random_maparray(20,0.2,1)),(0,0),cache=cache) is first
+	second = distance_field(grid,(0,1),cache=cache)
+	assert distance_field(grid,(0,0),cache=cache) is first # (0,0)变成最近用过的
+	distance_field(grid,(0,2),cache=cache)
+	assert len(cache)==2 and cache.nbytes==2*size
+	assert (grid.fingerprint(),0) in cache and (grid.fingerprint(),1) not in cache
+	assert distance_field(grid,(0,1),cache=cache) is not second
+	cache.clear()
+	assert len(cache)==0 and cache.nbytes==0
+
+def test_save_load(tmp_path):
+	grid = GridIndex(maze_maparray(21,0.1,2),default_rng(2).integers(1,5,(21,21)))
+	field = distance_field(grid,cache=None)
+	field.save(str(tmp_path/'field.npz'))
+	loaded = DistanceField.load(str(tmp_path/'field.npz'))
+	assert loaded.shape==field.shape and loaded.source==field.source
+	assert array_equal(loaded.cost,field.cost) and array_equal(loaded.direction,field.direction)
+	_check_field(grid,loaded,default_rng(3))
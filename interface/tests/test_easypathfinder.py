@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 13:05:42
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import inf
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import SearchObserver,solve_dijkstra,solve_astar
+from .common import path_cost,reference_cost
+
+class _Counter(SearchObserver):
+	def __init__(self):
+		self.pops = self.expands = 0
+		self.finished = None
+
+	def pop(self,index):
+		self.pops += 1
+
+	def expand(self,index):
+		self.expands += 1
+
+	def finish(self,grid,path,result):
+		self.finished = result
+
+def test_matches_reference():
+	# dijkstra、提前结束的dijkstra和astar的cost都和朴素实现一样，路径合法且长度等于cost
+	for seed in range(20):
+		maparray = random_maparray(20,0.3,seed) if seed%2 else maze_maparray(21,0.1,seed)
+		expected = reference_cost(maparray)
+		grid = GridIndex(maparray)
+		results = [solve_dijkstra(maparray),solve_dijkstra(maparray,early_exit=True),solve_astar(maparray),solve_astar(grid)]
+		for result in results:
+			assert result.cost==expected
+			if expected<inf:
+				assert path_cost(grid,result.path)==expected
+			else:
+				assert len(result.path)==0
+		assert results[2].expanded<=results[0].expanded
+
+def test_observer_sees_the_search():
+	# observer看到的弹出和扩展次数和SearchResult中的统计一致，不挂observer时结果一样
+	maparray = random_maparray(20,0.2,3)
+	observer = _Counter()
+	result = solve_astar(maparray,observer=observer)
+	assert observer.finished is result and observer.expands==result.expanded
+	assert observer.pops==result.expanded==result.pops-result.stale
+	assert solve_astar(maparray).cost==result.cost
+
+def test_start_equals_end():
+	grid = GridIndex(random_maparray(10,0.2,0))
+	grid.end = grid.start
+	for solve in (solve_dijkstra,solve_astar):
+		result = solve(grid)
+		assert result.cost==0 and len(result.path)==1
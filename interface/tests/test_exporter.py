@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 11:20:54
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal,asarray,uint8
+from pytest import raises
+from PIL import Image
+from utils.benchmark import random_maparray
+from utils.easypathfinder import solve_dijkstra
+from utils.tracerecorder import TraceRecorder,PATH
+from utils.exporter import LAST_FRAME_HOLD,select_steps,FrameRenderer,export_trace
+
+def _trace(size=30,seed=0):
+	recorder = TraceRecorder()
+	solve_dijkstra(random_maparray(size,0.2,seed),observer=recorder)
+	return recorder.trace
+
+def _decode(filename):
+	frames,durations = [],[]
+	with Image.open(filename) as image:
+		for i in range(getattr(image,'n_frames',1)):
+			image.seek(i)
+			frames.append(asarray(image.convert('RGB')))
+			durations.append(image.info['duration'])
+	return frames,durations
+
+def test_select_steps_budget():
+	# 不超过预算，最后一步总被选中，最短路的每一步在预算够时都单独成帧
+	trace = _trace()
+	events = trace.events
+	path_steps = set(events['step'][events['state']==PATH].tolist())
+	assert select_steps(trace).tolist()==list(range(len(trace)))
+	for budget in (2,3,5,10,50,4*len(path_steps),len(trace)):
+		steps = select_steps(trace,budget).tolist()
+		assert len(steps)<=budget and steps==sorted(set(steps)) and steps[-1]==len(trace)-1
+		if budget>=4*len(path_steps):
+			assert path_steps<=set(steps)
+
+def test_export_gif_budget(tmp_path):
+	# 帧数不超过预算，最后一帧是搜索结束时的样子，多进程和单进程写出一样的帧
+	trace = _trace()
+	renderer = FrameRenderer(trace,5)
+	colors = asarray(renderer.palette,dtype=uint8).reshape(-1,3)
+	last = colors[renderer.render([len(trace)-1])[0]]
+	decoded = []
+	for processes in (1,2):
+		filename = str(tmp_path/'{}.gif'.format(processes))
+		count = export_trace(trace,filename,frame_budget=50,FPS=25,cell_size=5,processes=processes)
+		assert count==len(select_steps(trace,50))
+		frames,durations = _decode(filename)
+		assert len(frames)<=count and array_equal(frames[-1],last)
+		assert sum(durations)==count*40+LAST_FRAME_HOLD
+		decoded.append(frames)
+	assert all(array_equal(a,b) for a,b in zip(*decoded))
+
+def test_export_duration(tmp_path):
+	# 给了duration时帧数不超过duration*FPS，总时长大约是duration
+	trace = _trace()
+	filename = str(tmp_path/'trace.png')
+	count = export_trace(trace,filename,duration=2,FPS=10,cell_size=3)
+	frames,durations = _decode(filename)
+	assert len(frames)==count<=20
+	assert abs(sum(durations)-LAST_FRAME_HOLD-2000)<=count
+
+def test_export_progress_abort(tmp_path):
+	# progress中抛出的异常中止导出
+	reports = []
+	def progress(done,total):
+		reports.append((done,total))
+		if done>=total//2:
+			raise KeyboardInterrupt()
+	with raises(KeyboardInterrupt):
+		export_trace(_trace(),str(tmp_path/'trace.gif'),progress=progress,cell_size=2)
+	assert reports and all(done<=total for done,total in reports)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 16:10:05
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal,inf
+from numpy.random import default_rng
+from pytest import raises
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_dijkstra
+from utils.distancefield import distance_field
+from utils.hpafinder import HPAGraph,hpa_graph,solve_hpa
+from .common import path_cost,free_pairs
+
+def _grids():
+	rng = default_rng(0)
+	for seed in range(6):
+		maparray = random_maparray(40,0.3,seed) if seed%2 else maze_maparray(41,0.1,seed)
+		yield GridIndex(maparray,rng.integers(1,6,maparray.shape) if seed%3==0 else None)
+
+def test_paths_are_valid_and_never_shorter():
+	# HPA*的路径总是合法的，长度不短于最短路；起点和终点连通时一定能找到路径
+	rng = default_rng(1)
+	for grid in _grids():
+		for cluster_size in (5,8):
+			graph = hpa_graph(grid,cluster_size)
+			for start,end in free_pairs(grid,rng,15):
+				grid.start,grid.end = start,end
+				expected = solve_dijkstra(grid).cost
+				result = solve_hpa(grid,graph=graph)
+				if expected==inf:
+					assert result.cost==inf and len(result.path)==0
+				else:
+					assert expected<=result.cost==path_cost(grid,result.path)
+
+def test_edges_are_real_paths():
+	# 抽象图上每条边的cost都不小于两个节点之间真正的最短路，相邻簇之间的边就是进入目标栅格的cost
+	for grid in _grids():
+		graph = HPAGraph.build(grid,6)
+		for node in graph.nodes[::7].tolist():
+			field = distance_field(grid,grid.coord(node),cache=None)
+			for target,cost in zip(*graph.edges(node)):
+				assert cost>=field.cost[target]
+				if graph.cluster(node)!=graph.cluster(target):
+					assert target in grid.neighbors(node) and cost==(1 if grid.weight is None else grid.weight[target])
+
+def test_save_load(tmp_path):
+	grid = next(_grids())
+	graph = HPAGraph.build(grid,8)
+	graph.save(str(tmp_path/'graph.npz'))
+	loaded = HPAGraph.load(str(tmp_path/'graph.npz'))
+	assert loaded.shape==graph.shape and loaded.cluster_size==graph.cluster_size and loaded.fingerprint==graph.fingerprint
+	for name in ('nodes','cluster_ptr','indptr','targets','costs'):
+		assert array_equal(getattr(loaded,name),getattr(graph,name))
+	assert solve_hpa(grid,graph=loaded).cost==solve_hpa(grid,graph=graph).cost
+	other = GridIndex(random_maparray(40,0.3,99))
+	with raises(AssertionError):
+		solve_hpa(other,graph=loaded)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 17:25:40
+# @Author  : syuansheng (Dalian Maritime University)
+
+from threading import Event
+from pstats import Stats
+from pytest import raises,approx
+from utils.benchmark import random_maparray
+from utils.easypathfinder import SearchObserver,solve_dijkstra,solve_astar
+from utils.instrument import SearchStats,HookObserver,ObserverGroup,SearchCancelled,ProgressObserver,profile_solve
+
+class _Log(SearchObserver):
+	def __init__(self,log,name):
+		self.log = log
+		self.name = name
+
+	def start(self,grid):
+		self.log.append((self.name,'start'))
+
+	def finish(self,grid,path,result):
+		self.log.append((self.name,'finish'))
+
+def test_hooks_see_every_event():
+	# 钩子收到的事件次数和SearchResult中的统计一致，最后一次relax终点时的cost就是最短路长度
+	maparray = random_maparray(25,0.25,0)
+	events = {event:[] for event in HookObserver.EVENTS}
+	hooks = HookObserver(**{event:(lambda *args,event=event:events[event].append(args)) for event in HookObserver.EVENTS})
+	result = solve_astar(maparray,observer=hooks)
+	assert len(events['start'])==len(events['finish'])==1 and events['finish'][0][2] is result
+	assert len(events['pop'])==len(events['expand'])==result.expanded
+	grid = events['start'][0][0]
+	assert [cost for index,parent,cost in events['relax'] if index==grid.end][-1]==result.cost
+	assert len(events['relax'])<=result.pushes
+	extra = []
+	hook = lambda index:extra.append(index)
+	hooks.add('expand',hook)
+	hooks.remove('expand',hook)
+	solve_astar(maparray,observer=hooks)
+	assert not extra
+	with raises(AssertionError):
+		hooks.add('draw',hook)
+
+def test_observer_group_order():
+	log = []
+	solve_dijkstra(random_maparray(10,0.2,1),observer=ObserverGroup(_Log(log,'a'),_Log(log,'b')))
+	assert log==[('a','start'),('b','start'),('a','finish'),('b','finish')]
+
+def test_search_stats():
+	# 画图和保存帧文件的时间从搜索时间中扣掉
+	result = solve_astar(random_maparray(20,0.2,2))
+	result.search_time = 1.0
+	drawer = SearchObserver()
+	drawer.render_time,drawer.io_time = 0.25,0.5
+	stats = SearchStats.fromResult(result,ObserverGroup(drawer,SearchObserver()))
+	assert stats.search_time==approx(0.25) and stats.total_time==approx(1.0)
+	assert stats.expanded==result.expanded and stats.asdict()['total_time']==approx(1.0)
+	assert SearchStats.fromResult(result).search_time==1.0
+
+def test_progress_and_cancel():
+	# 每弹出every个栅格报告一次，最后报告完成；取消之后在下一次报告时结束
+	maparray = random_maparray(40,0.1,3)
+	reports = []
+	observer = ProgressObserver(lambda *report:reports.append(report),every=50)
+	result = solve_dijkstra(maparray,observer=observer)
+	total = int((maparray!=3).sum())
+	assert reports[-1]==('search',total,total)
+	assert [done for _,done,_ in reports[:-1]]==list(range(50,result.expanded+1,50))
+	cancel = Event()
+	def progress(stage,done,total):
+		if done>=100:
+			cancel.set()
+	with raises(SearchCancelled):
+		solve_dijkstra(maparray,observer=ProgressObserver(progress,cancel,every=50))
+	with raises(SearchCancelled):
+		solve_astar(maparray,observer=ProgressObserver(cancel=cancel))
+
+def test_profile_solve(tmp_path):
+	maparray = random_maparray(30,0.2,4)
+	expected = solve_astar(maparray).cost
+	result,text = profile_solve(solve_astar,maparray,mode='cprofile',report=str(tmp_path/'astar.prof'))
+	assert result.cost==expected and '_search' in text
+	assert Stats(str(tmp_path/'astar.prof')).total_calls>0
+	result,text = profile_solve(solve_astar,maparray,mode='tracemalloc',report=str(tmp_path/'astar.txt'))
+	assert result.cost==expected and text.startswith('current')
+	assert open(str(tmp_path/'astar.txt')).read()==text
+	with raises(ValueError):
+		profile_solve(solve_astar,maparray,mode='perf')
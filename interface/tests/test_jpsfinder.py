@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 14:40:33
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal,inf
+from numpy.random import default_rng
+from pytest import raises
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_dijkstra,solve_astar
+from utils.jpsfinder import JumpTable,jump_table,solve_jps
+from .common import path_cost,free_pairs
+
+def test_matches_dijkstra():
+	# 随机的起点和终点，跳点搜索的cost和dijkstra一样，展开的跳点连起来是一条合法的最短路
+	rng = default_rng(0)
+	for seed in range(12):
+		grid = GridIndex(random_maparray(25,0.3,seed) if seed%2 else maze_maparray(25,0.1,seed))
+		for start,end in free_pairs(grid,rng,15):
+			grid.start,grid.end = start,end
+			expected = solve_dijkstra(grid).cost
+			for queue in ('heap','bucket'):
+				result = solve_jps(grid,queue=queue)
+				assert result.cost==expected
+				if expected<inf:
+					assert path_cost(grid,result.path)==expected
+				else:
+					assert len(result.path)==0
+
+def test_jump_table_cache_and_file(tmp_path):
+	# 同一张栅格图只预处理一次，栅格图变了就重新预处理；保存再读回来的表得到同样的结果
+	grid = GridIndex(maze_maparray(21,0.1,3))
+	table = jump_table(grid)
+	assert jump_table(GridIndex(maze_maparray(21,0.1,3))) is table
+	table.save(str(tmp_path/'table.npz'))
+	loaded = JumpTable.load(str(tmp_path/'table.npz'))
+	assert loaded.shape==table.shape and array_equal(loaded.table,table.table)
+	result = solve_jps(grid,table=loaded)
+	assert result.cost==solve_dijkstra(grid).cost
+	free = int((grid.state==0).nonzero()[0][0])
+	grid.setState(free,3)
+	assert jump_table(grid) is not table
+	assert solve_jps(grid).cost==solve_dijkstra(grid).cost
+
+def test_expands_fewer_blocks():
+	# 开阔的栅格图上对称的最短路很多，跳点搜索展开的栅格比astar少
+	maparray = random_maparray(40,0.05,1)
+	assert solve_jps(maparray).expanded*2<solve_astar(maparray).expanded
+
+def test_rejects_weighted_maps():
+	maparray = random_maparray(10,0.2,0)
+	with raises(AssertionError):
+		solve_jps(GridIndex(maparray,maparray*0+2))
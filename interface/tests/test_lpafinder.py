@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 20:31:06
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy.random import default_rng
+from utils.benchmark import random_maparray
+from utils.easypathfinder import solve_dijkstra
+from utils.lpafinder import IncrementalPlanner
+
+def test_weighted_clear_obstacle_replan():
+	# 清除障碍物之后进入它的cost是costarray中原来的值，重新规划的结果和从头求解的dijkstra一样
+	rng = default_rng(0)
+	for seed in range(10):
+		maparray = random_maparray(15,0.3,seed)
+		costarray = rng.integers(1,10,maparray.shape)
+		planner = IncrementalPlanner(maparray,costarray)
+		planner.solve()
+		for _ in range(5):
+			changes = []
+			for i,j in zip(*rng.integers(0,15,(2,4))):
+				if maparray[i,j] in (0,3):
+					value = 0 if maparray[i,j]==3 else 3
+					maparray[i,j] = value
+					changes.append((15-i-1,j,value))
+			planner.update(changes)
+			assert planner.solve().cost==solve_dijkstra(maparray,costarray=costarray).cost
+
+def test_cleared_cheaper_obstacle_rescales():
+	# 障碍物的cost比所有可以通行的栅格都小，清除之后min_weight变小，启发函数跟着缩小，结果仍然最优
+	rng = default_rng(1)
+	for seed in range(10):
+		maparray = random_maparray(15,0.3,seed)
+		costarray = rng.integers(4,10,maparray.shape)
+		costarray[maparray==3] = rng.integers(1,4,(maparray==3).sum())
+		planner = IncrementalPlanner(maparray,costarray)
+		assert planner.scale==costarray[maparray!=3].min()
+		planner.solve()
+		obstacles = list(zip(*(maparray==3).nonzero()))
+		for k in rng.permutation(len(obstacles))[:20]:
+			i,j = obstacles[k]
+			maparray[i,j] = 0
+			planner.update([(15-i-1,j,0)])
+			assert planner.scale==costarray[maparray!=3].min()
+			assert planner.solve().cost==solve_dijkstra(maparray,costarray=costarray).cost
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 16:35:44
+# @Author  : syuansheng (Dalian Maritime University)
+
+from os.path import getsize
+from numpy import array_equal,nan
+from numpy.random import default_rng
+from pytest import raises
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_dijkstra,solve_astar
+from utils.altfinder import solve_alt,landmark_table
+from utils.mapfile import MAP_SUFFIX,save_map,open_map,load_map,open_landmarks,read_excel_map,convert_excel
+
+EXCEL = '../testdata/rasterbuilder_test_data.xlsx'
+
+def _maps():
+	rng = default_rng(0)
+	maparray = random_maparray(13,0.3,0) # 栅格数不是4的倍数
+	yield maparray,None
+	yield maparray,rng.integers(1,9,maparray.shape)
+	costarray = rng.random(maparray.shape)+0.5
+	costarray[maparray==3] = nan
+	yield maparray,costarray
+
+def test_round_trip(tmp_path):
+	# 保存再打开，state、权重、起点终点和指纹都不变，求解的结果也不变
+	for i,(maparray,costarray) in enumerate(_maps()):
+		grid = GridIndex(maparray,costarray)
+		for packed in (False,True):
+			filename = str(tmp_path/'{}{}{}'.format(i,packed,MAP_SUFFIX))
+			save_map(filename,maparray,costarray,packed=packed)
+			opened = open_map(filename)
+			assert opened.shape==grid.shape and (opened.start,opened.end)==(grid.start,grid.end)
+			assert opened.min_weight==grid.min_weight and opened.fingerprint()==grid.fingerprint()
+			assert array_equal(opened.state,grid.state)
+			assert (opened.weight is None)==(grid.weight is None)
+			if grid.weight is not None:
+				assert array_equal(opened.weight,grid.weight) and opened.weight.dtype==grid.weight.dtype
+			loaded,loaded_cost = load_map(filename)
+			rebuilt = GridIndex(loaded,loaded_cost) # 在只读的视图上建立的GridIndex有自己的数组，可以修改
+			assert array_equal(loaded,maparray) and rebuilt.fingerprint()==grid.fingerprint()
+			rebuilt.setState(rebuilt.end,0)
+			assert solve_astar(opened).cost==solve_dijkstra(maparray,costarray=costarray).cost
+		assert getsize(str(tmp_path/'{}True{}'.format(i,MAP_SUFFIX)))<getsize(str(tmp_path/'{}False{}'.format(i,MAP_SUFFIX)))
+
+def test_memmap_modes(tmp_path):
+	# 'r+'时setState直接写回文件，'c'时修改只留在内存中
+	filename = str(tmp_path/('map'+MAP_SUFFIX))
+	save_map(filename,random_maparray(10,0.0,1))
+	grid = open_map(filename,mode='c')
+	grid.setState(5,3)
+	assert open_map(filename).state[5]==0
+	grid = open_map(filename,mode='r+')
+	grid.setState(5,3)
+	grid.state.flush()
+	assert open_map(filename).state[5]==3
+	with raises(ValueError):
+		open_map(filename).state[5] = 0 # 'r'是只读的
+
+def test_landmarks(tmp_path):
+	# 地标距离表和栅格图一起保存，读回来之后ALT的结果不变
+	maparray = maze_maparray(21,0.1,2)
+	grid = GridIndex(maparray)
+	table = landmark_table(grid,4)
+	filename = str(tmp_path/('maze'+MAP_SUFFIX))
+	save_map(filename,maparray,landmarks=table)
+	loaded = open_landmarks(filename)
+	assert array_equal(loaded.landmarks,table.landmarks) and array_equal(loaded.distance,table.distance)
+	assert solve_alt(open_map(filename),landmarks=loaded).cost==solve_dijkstra(maparray).cost
+	save_map(filename,maparray)
+	assert open_landmarks(filename) is None
+
+def test_excel(tmp_path):
+	# Excel转换成.spmap之后读出来的和直接读Excel一样；不是.spmap的文件会被拒绝
+	maparray,costarray = read_excel_map(EXCEL)
+	filename = str(tmp_path/('excel'+MAP_SUFFIX))
+	convert_excel(EXCEL,filename,packed=True)
+	loaded,loaded_cost = load_map(filename)
+	assert array_equal(loaded,maparray)
+	assert (loaded_cost is None)==(costarray is None)
+	with raises(AssertionError):
+		open_map(EXCEL)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 10:47:21
+# @Author  : syuansheng (Dalian Maritime University)
+
+from threading import Event
+from os import listdir
+from pytest import raises
+from PIL import Image
+from utils.benchmark import random_maparray
+from utils.easypathfinder import solve_dijkstra
+from utils.tracerecorder import Trace,TraceReplay,PATH
+from utils.instrument import SearchCancelled
+from model import Model,GIF_FRAMES
+
+def _model(seed):
+	model = Model()
+	model.maparray = random_maparray(10,0.2,seed)
+	return model
+
+def test_run_algorithm_writes_next_to_gif(tmp_path):
+	# trace和gif都写到output_dir中，trace最后一步画出的路径就是最短路
+	for type in (1,2):
+		model = _model(type)
+		giffilename,search_time,render_time = model.run_algorithm(type,output_dir=str(tmp_path/'out'))
+		assert giffilename==str(tmp_path/'out'/['dijkstra_gif','astar_gif'][type-1])
+		assert search_time>=0 and render_time>=0
+		trace = Trace.load(str(tmp_path/'out'/(['dijkstra','astar'][type-1]+'_trace.npz')))
+		with Image.open(giffilename+'.gif') as image:
+			assert getattr(image,'n_frames',1)<=GIF_FRAMES
+		state = TraceReplay(trace).frame(len(trace)-1)
+		result = solve_dijkstra(model.maparray)
+		assert (state==PATH).sum()==len(result.path)
+	assert sorted(listdir(tmp_path/'out'))==['astar_gif.gif','astar_trace.npz','dijkstra_gif.gif','dijkstra_trace.npz']
+
+def test_run_algorithm_cancelled(tmp_path):
+	# 取消之后抛出SearchCancelled，不写任何文件
+	cancel = Event()
+	cancel.set()
+	with raises(SearchCancelled):
+		_model(0).run_algorithm(1,cancel=cancel,output_dir=str(tmp_path/'out'))
+	assert not (tmp_path/'out').exists()
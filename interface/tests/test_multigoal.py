@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 10:46:52
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import full,inf,minimum,where
+from numpy.random import default_rng
+from utils.benchmark import random_maparray
+from utils.easypathfinder import solve_dijkstra
+from utils.multigoal import solve_nearest
+from utils.rasterbuilder import GridIndex
+from .common import path_cost
+
+def _distances(grid,sources):
+	# 从所有起点出发的最短路长度，不可达为inf
+	best = full(len(grid),inf)
+	for source in sources:
+		grid.start = grid.end = source
+		solve_dijkstra(grid)
+		workspace = grid.workspace
+		best = minimum(best,where(workspace.stamp==workspace.generation,workspace.cost,inf))
+	return best
+
+def test_nearest_goals_match_dijkstra():
+	rng = default_rng(0)
+	for seed,count in ((0,3),(1,5),(2,40)):
+		for weighted in (False,True):
+			maparray = random_maparray(20,0.3,seed)
+			costarray = rng.integers(1,6,maparray.shape) if weighted else None
+			grid = GridIndex(maparray,costarray)
+			free = (grid.state!=3).nonzero()[0]
+			chosen = rng.choice(free,size=count+2,replace=False).tolist()
+			sources,goals = chosen[:2],chosen[2:]
+			distance = _distances(grid,sources)
+			expected = sorted(distance[goals])
+			for heuristic in (True,False):
+				result = solve_nearest(grid,k=count,sources=grid.coords(sources).tolist(),goals=grid.coords(goals).tolist(),heuristic=heuristic)
+				reached = [cost for cost in expected if cost<inf]
+				assert result.costs.tolist()==reached
+				assert result.cost==(reached[0] if reached else inf)
+				for path,cost in zip(result.paths,result.costs):
+					first,last = grid.index(*path[0]),grid.index(*path[-1])
+					assert first in sources and last in goals
+					assert path_cost(grid,path,first,last)==cost
+
+def test_unreachable_goals_are_skipped():
+	maparray = random_maparray(20,0.0,0)
+	maparray[:,10] = 3
+	maparray[5,15] = 2 # 和起点不连通的终点
+	maparray[5,3] = 2
+	result = solve_nearest(maparray,k=2)
+	assert len(result.costs)==1 and result.goals.tolist()==[[14,3]]
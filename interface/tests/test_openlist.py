@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 14:02:16
+# @Author  : syuansheng (Dalian Maritime University)
+
+from pytest import raises
+from numpy.random import default_rng
+from utils.benchmark import random_maparray,maze_maparray
+from utils.openlist import HeapOpenList,BucketOpenList,make_open_list
+from utils.easypathfinder import solve_dijkstra,solve_astar,solve_bidirectional_dijkstra,solve_bidirectional_astar
+from .common import reference_cost
+
+def _random_ops(open_list,seed):
+	# 随机push（同一个栅格反复push，f有大有小）和pop，和一个只记录每个栅格当前f的字典对照
+	rng = default_rng(seed)
+	keys = {}
+	popped = 0
+	last = 0
+	for _ in range(2000):
+		if keys and rng.random()<0.4:
+			index,f = open_list.pop()
+			assert keys.pop(index)==f and f<=min(keys.values(),default=f)
+			assert f>=last # 只push不小于上一次弹出的f时，弹出的f单调不减
+			last = f
+			popped += 1
+		else:
+			index = int(rng.integers(50))
+			f = last+int(rng.integers(0,20))
+			accepted = index not in keys or f<keys[index]
+			assert open_list.push(index,f)==accepted
+			if accepted:
+				keys[index] = f
+		assert len(open_list)==len(keys) and all(index in open_list for index in keys)
+		if keys:
+			assert open_list.peek()[1]==min(keys.values())
+	while keys:
+		index,f = open_list.pop()
+		assert keys.pop(index)==f and f<=min(keys.values(),default=f)
+		popped += 1
+	# 有效的弹出次数对得上，集合空了之后剩下的最多是还没被丢掉的stale条目
+	assert open_list.pops-open_list.stale==popped and open_list.pops<=open_list.pushes
+	assert open_list.peak>0
+
+def test_random_operations():
+	for seed in range(5):
+		_random_ops(HeapOpenList(),seed)
+		_random_ops(BucketOpenList(),seed)
+
+def test_stale_entries():
+	# 同一个栅格以更小的f再push一次，旧的条目在pop或peek时被当作stale丢掉
+	for open_list in (HeapOpenList(),BucketOpenList()):
+		assert open_list.push(1,5) and open_list.push(2,4)
+		assert not open_list.push(1,5) and not open_list.push(1,7)
+		assert open_list.push(1,3)
+		assert open_list.pushes==3 and len(open_list)==2
+		assert open_list.pop()==(1,3) and open_list.pop()==(2,4)
+		assert not open_list
+		assert open_list.push(1,5) # 弹出之后可以再放进来，和桶里的旧条目f相同
+		assert open_list.peek()==(1,5) and open_list.pop()==(1,5)
+		assert open_list.pops-open_list.stale==3 and open_list.stale<=1
+
+def test_order_and_keys():
+	heap = HeapOpenList()
+	heap.push(1,3,2)
+	heap.push(2,3,1)
+	heap.push(3,2.5)
+	assert [heap.pop()[0] for _ in range(3)]==[3,2,1] # f相同时tiebreak小的先出
+	bucket = BucketOpenList()
+	with raises(AssertionError):
+		bucket.push(1,2.5)
+	bucket.push(1,3)
+	bucket.push(2,3)
+	assert bucket.pop()==(2,3) # 同一个桶中后放入的先出
+	with raises(ValueError):
+		make_open_list('fibonacci')
+
+def test_solvers_with_buckets():
+	# 换成桶队列之后所有求解器的cost都不变
+	solvers = (solve_dijkstra,solve_astar,solve_bidirectional_dijkstra,solve_bidirectional_astar)
+	for seed in range(10):
+		maparray = random_maparray(20,0.3,seed) if seed%2 else maze_maparray(21,0.1,seed)
+		expected = reference_cost(maparray)
+		for solve in solvers:
+			assert solve(maparray,queue='bucket').cost==solve(maparray).cost==expected
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 10:12:35
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal,asarray
+from numpy.random import default_rng
+from PIL import Image
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from utils.benchmark import random_maparray
+from utils.easypathfinder import solve_astar
+from utils.tracerecorder import TraceRecorder,TraceReplay
+from utils.player import GifFrames,TraceFrames,AnimationPlayer
+
+def _trace(seed=0):
+	recorder = TraceRecorder()
+	solve_astar(random_maparray(12,0.2,seed),observer=recorder)
+	return recorder.trace
+
+def _gif(filename,trace):
+	replay = TraceReplay(trace)
+	images = [Image.fromarray(replay.render(step)) for step in range(len(replay))]
+	images[0].save(filename,save_all=True,append_images=images[1:],duration=40,loop=0)
+	with Image.open(filename) as image:
+		expected = []
+		for i in range(image.n_frames):
+			image.seek(i)
+			expected.append(asarray(image.convert('RGB')))
+	return expected
+
+def _closed(image):
+	# Pillow在图像关闭之后seek到另一帧会抛出ValueError
+	try:
+		image.seek(1 if image.tell()==0 else 0)
+	except ValueError:
+		return True
+	return False
+
+def test_trace_frames_any_order():
+	# 顺序、倒序、随机跳着取帧，结果都和从头重建的render一样
+	trace = _trace()
+	replay = TraceReplay(trace)
+	frames = TraceFrames(trace,cache_size=4)
+	order = list(range(len(frames)))
+	order += order[::-1]+list(default_rng(0).integers(0,len(frames),50))
+	for step in order:
+		assert array_equal(frames[step],replay.render(step))
+
+def test_gif_frames_any_order(tmp_path):
+	filename = str(tmp_path/'trace.gif')
+	expected = _gif(filename,_trace(1))
+	frames = GifFrames(filename,cache_size=4)
+	assert len(frames)==len(expected) and frames.interval==40
+	for i in list(range(len(frames)))[::-1]+list(default_rng(1).integers(0,len(frames),30)):
+		assert array_equal(frames[i],expected[i])
+	frames.close()
+	assert _closed(frames.image) and not frames._cache
+
+def test_player_close_releases_gif(tmp_path):
+	# 换一个动画之前close旧的播放器，gif文件被关闭，计时器不再运行
+	filename = str(tmp_path/'trace.gif')
+	_gif(filename,_trace(3))
+	fig = Figure()
+	FigureCanvasAgg(fig)
+	ax = fig.add_subplot()
+	players = []
+	for _ in range(3):
+		if players:
+			players[-1].close()
+		ax.cla()
+		players.append(AnimationPlayer(fig,ax,GifFrames(filename)))
+	for player in players[:-1]:
+		assert _closed(player.source.image)
+	assert not _closed(players[-1].source.image)
+	players[-1].close()
+	assert _closed(players[-1].source.image)
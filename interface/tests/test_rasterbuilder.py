@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 11:12:25
+# @Author  : syuansheng (Dalian Maritime University)
+
+from pytest import raises
+from numpy import array_equal,asarray,allclose,iinfo,isinf,uint32
+from numpy.random import default_rng
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+from utils.benchmark import random_maparray
+from utils.rasterbuilder import FACECOLORS,Point,PointGroup,GridIndex,RasterMap
+from utils.tracerecorder import TraceRecorder,TraceReplay
+from utils.easypathfinder import solve_dijkstra,solve_astar
+from .common import free_pairs
+
+def _coords(group):
+	return sorted((point.x,point.y) for point in group)
+
+def test_groups_match_maparray():
+	maparray = random_maparray(12,0.3,0)
+	rsm = RasterMap()
+	start,end,obstacles,blocks = rsm.buildMap(maparray)
+	nrows = maparray.shape[0]
+	# Point(x,y)对应maparray的第nrows-x-1行第y列
+	expected = sorted((nrows-i-1,j) for i,j in zip(*(maparray==3).nonzero()))
+	assert _coords(obstacles)==expected
+	assert len(blocks)==maparray.size and len(obstacles)==len(expected)
+	assert (start.x,start.y)==(0,0) and (end.x,end.y)==(11,11)
+	x,y = expected[0]
+	assert obstacles.getPoint(x,y) is blocks.getPoint(x,y) # 同一个栅格总是同一个Point对象
+	assert Point(x,y) in obstacles and obstacles.getPoint(0,0) is None and blocks.getPoint(12,0) is None
+
+def test_group_changes_write_through():
+	rsm = RasterMap()
+	_,_,obstacles,blocks = rsm.buildMap(random_maparray(8,0.0,0))
+	grid = rsm.grid
+	obstacles.append(Point(3,4))
+	assert grid.state[grid.index(3,4)]==3 and _coords(obstacles)==[(3,4)]
+	obstacles += [Point(1,1),Point(2,2)]
+	assert len(obstacles)==3
+	obstacles.remove(Point(1,1))
+	obstacles.delPoint(2,2)
+	assert _coords(obstacles)==[(3,4)] and grid.state[grid.index(1,1)]==0
+	del obstacles[0]
+	assert len(obstacles)==0
+	with raises(ValueError):
+		obstacles.remove(Point(5,5))
+	# 起点组的变化也会改变grid.start
+	rsm.start_point_group.append(Point(4,4))
+	assert grid.start==grid.index(4,4) and len(rsm.start_point_group)==2
+	rsm.start_point_group.remove(Point(4,4))
+	assert grid.start==grid.index(0,0)
+	with raises(TypeError):
+		blocks.append(Point(0,1))
+	with raises(TypeError):
+		obstacles[0] = Point(0,1)
+
+def test_point_group_index_stays_in_sync():
+	group = PointGroup("test",[Point(0,0),Point(1,2)])
+	group.append(Point(3,3))
+	assert Point(3,3) in group and group.getPoint(1,2) is group[1]
+	group.pop(0)
+	group.pop()
+	assert Point(0,0) not in group and Point(3,3) not in group and len(group)==1
+	group[0] = Point(5,5)
+	assert group.getPoint(5,5) is group[0] and group.getPoint(1,2) is None
+	group.delPoint(5,5)
+	assert len(group)==0
+
+def _axes():
+	fig = Figure()
+	FigureCanvasAgg(fig)
+	return fig,fig.add_subplot()
+
+def test_draw_map_is_one_image():
+	# 不管栅格图多大，drawMap都只画一张图像和一组边框线，图像的第y行第x列是Point(x,y)的颜色
+	for size in (5,40):
+		maparray = random_maparray(size,0.3,size)
+		rsm = RasterMap()
+		rsm.buildMap(maparray)
+		fig,ax = _axes()
+		rsm.drawMap(ax)
+		assert len(ax.images)==1 and len(ax.collections)==1 and not ax.patches
+		rgba = ax.images[0].get_array()
+		assert rgba.shape==(size,size,4)
+		grid = rsm.grid
+		for point in rsm.all_point_group:
+			assert allclose(rgba[point.y,point.x],to_rgba(FACECOLORS[grid.state[grid.index(point.x,point.y)]]))
+		fig.canvas.draw()
+
+def test_update_map_blends_one_pixel():
+	# updateMap只改一个像素，两次叠加和TraceReplay画出来的颜色一样，画出来的图也跟着变
+	maparray = random_maparray(10,0.2,0)
+	rsm = RasterMap()
+	rsm.buildMap(maparray)
+	fig,ax = _axes()
+	rsm.drawMap(ax)
+	fig.canvas.draw()
+	before_canvas = asarray(fig.canvas.buffer_rgba()).copy()
+	rgba = ax.images[0].get_array()
+	before = rgba.copy()
+	point = rsm.end_point
+	rsm.updateMap(ax,point,'yellow')
+	rsm.updateMap(ax,point,'blue')
+	changed = (rgba!=before).any(axis=2)
+	assert changed.sum()==1 and changed[point.y,point.x]
+	palette = TraceReplay(_trace(maparray))._palette
+	assert allclose(rgba[point.y,point.x,:3]*255,palette[2,2],atol=0.5)
+	fig.canvas.draw()
+	assert not array_equal(asarray(fig.canvas.buffer_rgba()),before_canvas)
+
+def _trace(maparray):
+	recorder = TraceRecorder()
+	solve_astar(maparray,observer=recorder)
+	return recorder.trace
+
+def test_build_map_several_starts():
+	# maparray中有多个起点、终点时都归到对应的组里，start_point和end_point是最后一个
+	maparray = random_maparray(10,0.2,1)
+	maparray[5,5] = maparray[6,6] = 1
+	maparray[2,3] = 2
+	rsm = RasterMap()
+	start,end,_,_ = rsm.buildMap(maparray)
+	assert _coords(rsm.start_point_group)==sorted([(0,0),(4,5),(3,6)])
+	assert _coords(rsm.end_point_group)==sorted([(9,9),(7,3)])
+	assert (start.x,start.y) in _coords(rsm.start_point_group) and (end.x,end.y) in _coords(rsm.end_point_group)
+
+def _fresh(grid,start,end):
+	return GridIndex.fromArrays(grid.shape,grid.state.copy(),start=start,end=end)
+
+def test_workspace_reuse():
+	# 同一个GridIndex上反复求解不同的起点和终点，结果和每次新建GridIndex一样，workspace不会重新分配
+	grid = GridIndex(random_maparray(20,0.25,2))
+	rng = default_rng(0)
+	workspace = None
+	for start,end in free_pairs(grid,rng,40):
+		grid.start,grid.end = start,end
+		solve = solve_astar if start%2 else solve_dijkstra
+		result,expected = solve(grid),solve(_fresh(grid,start,end))
+		assert result.cost==expected.cost and array_equal(result.path,expected.path)
+		assert result.expanded==expected.expanded
+		workspace = workspace or grid.workspace
+		assert grid.workspace is workspace
+
+def test_workspace_generation_wraps():
+	# 代数计数器用完之后清空一次，之前留下的数据不会被当成有效的
+	grid = GridIndex(random_maparray(15,0.2,3))
+	expected = solve_dijkstra(grid)
+	grid.workspace.generation = iinfo(uint32).max-2
+	for _ in range(5):
+		result = solve_dijkstra(grid)
+		assert result.cost==expected.cost and array_equal(result.path,expected.path)
+		assert grid.visited.sum()==expected.expanded
+	assert grid.workspace.generation<10
+
+def test_points_are_slotted_and_lazy():
+	# Point没有__dict__；buildMap不为每个栅格创建Point，用到哪个才创建哪个，之后总是同一个对象
+	point = Point(1,2)
+	assert not hasattr(point,'__dict__')
+	with raises(AttributeError):
+		point.color = 'red'
+	rsm = RasterMap()
+	_,_,obstacles,_ = rsm.buildMap(random_maparray(50,0.2,4))
+	grid = rsm.grid
+	assert len(grid._points)<=2
+	points = list(obstacles)
+	assert len(grid._points)<=2+len(points)<grid.state.size
+	index = grid.index(points[0].x,points[0].y)
+	assert grid.point(index) is points[0] and points[0].facecolor=='black'
+	grid.setState(index,0)
+	assert points[0].facecolor=='white'
+
+def test_dense_search_data():
+	# cost、parent、visited是最后一次搜索的数据，沿着parent回溯就是最短路
+	grid = GridIndex(random_maparray(20,0.25,5))
+	result = solve_dijkstra(grid)
+	cost,parent,visited = grid.cost,grid.parent,grid.visited
+	path = [grid.index(x,y) for x,y in result.path.tolist()]
+	assert cost[grid.end]==result.cost and cost[grid.start]==0 and parent[grid.start]==-1
+	assert all(parent[b]==a and cost[b]==cost[a]+1 for a,b in zip(path,path[1:]))
+	assert visited.sum()==result.expanded and not isinf(cost[visited]).any()
+	assert (parent[isinf(cost)]==-1).all()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 20:12:40
+# @Author  : syuansheng (Dalian Maritime University)
+
+import asyncio
+from pytest import raises
+from utils.benchmark import random_maparray
+from utils.easypathfinder import solve_astar
+from utils.rasterbuilder import GridIndex
+from utils.service import SolveService
+
+def test_upload_during_batch_window():
+	# 查询还在攒批次时上传另一张栅格图，max_maps=1也不能把这张栅格图淘汰掉，请求不能卡住
+	maparray = random_maparray(30,0.2,0)
+	grid = GridIndex(maparray)
+	pair = [[0,0],[29,29]]
+
+	async def run():
+		service = SolveService(processes=0,max_maps=1,batch_window=0.05)
+		try:
+			key = service.upload({'map':maparray.tolist()})['map']
+			solving = asyncio.ensure_future(service.solve({'map':key,'pairs':[pair],'algorithm':'astar'}))
+			await asyncio.sleep(0)
+			service.upload({'map':random_maparray(20,0.2,1).tolist()})
+			reply = await asyncio.wait_for(solving,5)
+			assert not service._inflight and not service._pending
+			# 批次完成之后旧的栅格图才被淘汰，之后的查询立刻报错而不是合并到一个不会完成的Future上
+			with raises(KeyError):
+				await asyncio.wait_for(service.solve({'map':key,'pairs':[pair]}),5)
+			return reply
+		finally:
+			service.close()
+
+	reply = asyncio.run(run())
+	assert reply['costs']==[solve_astar(grid).cost]
+
+def test_failed_batch_releases_queries():
+	# 求解出错时等待这一批的请求都收到异常，_inflight里不留下已经失败的Future
+	maparray = random_maparray(20,0.2,0)
+
+	async def run():
+		service = SolveService(processes=0,batch_window=0.01)
+		try:
+			key = service.upload({'map':maparray.tolist()})['map']
+			service._maps[key].spec = (key,(1,1),'missing_shared_memory',None,None,1)
+			for _ in range(2):
+				with raises(FileNotFoundError):
+					await asyncio.wait_for(service.solve({'map':key,'pairs':[[[0,0],[19,19]]]*2}),5)
+				assert not service._inflight
+		finally:
+			service.close()
+
+	asyncio.run(run())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 13:31:08
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal
+from numpy.random import default_rng
+from utils.benchmark import random_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_astar
+from utils.tracerecorder import EXPANDED,PATH,Trace,TraceRecorder,TraceReplay
+
+def _record(seed=0):
+	grid = GridIndex(random_maparray(15,0.2,seed))
+	recorder = TraceRecorder()
+	result = solve_astar(grid,observer=recorder)
+	return grid,result,recorder.trace
+
+def _naive(trace,step):
+	# 一个事件一个事件地叠加
+	state = trace.state.copy()
+	for event in trace.events:
+		if event['step']<=step:
+			state[event['cell']] = event['state']
+	return state
+
+def test_trace_matches_result(tmp_path):
+	# 每扩展一个栅格、画出最短路上的一个栅格都是一步，最后一帧的最短路就是求解的结果；保存再读回来不变
+	grid,result,trace = _record()
+	assert len(trace)==1+result.expanded+len(result.path)
+	final = TraceReplay(trace).frame(len(trace)-1)
+	path = [grid.index(x,y) for x,y in result.path.tolist()]
+	assert sorted((final==PATH).nonzero()[0].tolist())==sorted(path)
+	assert (final>=EXPANDED).sum()==len(set(path)|set((trace.events['cell'][trace.events['state']==EXPANDED]).tolist()))
+	trace.save(str(tmp_path/'trace.npz'))
+	loaded = Trace.load(str(tmp_path/'trace.npz'))
+	assert loaded.shape==trace.shape and array_equal(loaded.state,trace.state) and array_equal(loaded.events,trace.events)
+
+def test_seek_any_order():
+	# seek顺序、倒序、随机跳都和逐个事件叠加的结果一样，render画的是同一个状态
+	_,_,trace = _record(1)
+	replay = TraceReplay(trace)
+	steps = list(range(len(trace)))
+	for step in steps+steps[::-1]+default_rng(0).integers(0,len(trace),40).tolist():
+		expected = _naive(trace,step)
+		assert array_equal(replay.seek(step),expected)
+		assert array_equal(replay.frame(step),expected)
+	assert array_equal(replay.render(len(trace)-1),replay.image(_naive(trace,len(trace)-1)))
+
+def test_render_colors():
+	# 最短路上的栅格画成黄色再叠蓝色，(x,y)处的像素在image[y,x]
+	grid,result,trace = _record(2)
+	replay = TraceReplay(trace)
+	image = replay.render(len(trace)-1)
+	assert image.shape==(grid.ncols,grid.nrows,3)
+	for x,y in result.path.tolist():
+		index = grid.index(x,y)
+		assert array_equal(image[y,x],replay._palette[2,trace.state[index]])
+	before = replay.render(0)
+	x,y = result.path[len(result.path)//2].tolist()
+	assert array_equal(before[y,x],replay._palette[0,trace.state[grid.index(x,y)]])
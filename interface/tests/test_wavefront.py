@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 18:12:57
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import array_equal,asarray,inf,where
+from numpy.random import default_rng
+from pytest import raises
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import SearchObserver,solve_dijkstra
+from utils.wavefront import wavefront,solve_wavefront
+from .common import path_cost,free_pairs
+
+class _Expanded(SearchObserver):
+	def __init__(self):
+		self.order = []
+
+	def expand(self,index):
+		self.order.append(index)
+
+def _grids():
+	for seed in range(8):
+		yield GridIndex(random_maparray(30,0.35,seed) if seed%2 else maze_maparray(31,0.1,seed))
+
+def test_cost_and_direction_match_dijkstra():
+	# 整张图的cost和dijkstra一样，每个到达的栅格沿direction走一步就是cost小1的邻居
+	rng = default_rng(0)
+	for grid in _grids():
+		offsets = asarray((1,-1,-grid.ncols,grid.ncols))
+		for source,_ in free_pairs(grid,rng,3):
+			cost,direction = wavefront(grid,source)
+			grid.start = grid.end = source
+			solve_dijkstra(grid)
+			assert array_equal(cost,where(grid.cost<inf,grid.cost,-1))
+			reached = (cost>0).nonzero()[0]
+			parents = reached+offsets[direction[reached]]
+			assert all(parent in grid.neighbors(index) for index,parent in zip(reached.tolist(),parents.tolist()))
+			assert array_equal(cost[parents],cost[reached]-1)
+			assert direction[source]==-1 and (direction[cost<0]==-1).all()
+
+def test_solve_matches_dijkstra():
+	# 随机的起点和终点，提前停下和不提前停下的cost都和dijkstra一样，路径合法
+	rng = default_rng(1)
+	for grid in _grids():
+		for start,end in free_pairs(grid,rng,10):
+			grid.start,grid.end = start,end
+			expected = solve_dijkstra(grid).cost
+			for early_exit in (True,False):
+				result = solve_wavefront(grid,early_exit=early_exit)
+				assert result.cost==expected
+				if expected<inf:
+					assert path_cost(grid,result.path)==expected
+				else:
+					assert len(result.path)==0
+
+def test_observer_sees_layers():
+	# expand按层调用，每个到达的栅格一次，cost不减
+	grid = next(_grids())
+	observer = _Expanded()
+	result = solve_wavefront(grid,observer=observer,early_exit=False)
+	cost,_ = wavefront(grid,grid.start)
+	assert len(observer.order)==len(set(observer.order))==result.expanded==(cost>=0).sum()
+	layers = cost[observer.order]
+	assert (layers[1:]>=layers[:-1]).all()
+
+def test_rejects_weighted_maps():
+	maparray = random_maparray(10,0.2,0)
+	with raises(AssertionError):
+		solve_wavefront(GridIndex(maparray,maparray*0+2))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-18 15:02:47
+# @Author  : syuansheng (Dalian Maritime University)
+
+from numpy import inf,nan,int64,float64
+from numpy.random import default_rng
+from pytest import raises,approx
+from utils.benchmark import random_maparray,maze_maparray
+from utils.rasterbuilder import GridIndex
+from utils.easypathfinder import solve_dijkstra,solve_astar,solve_bidirectional_dijkstra,solve_bidirectional_astar
+from utils.altfinder import solve_alt
+from .common import path_cost,reference_cost
+
+SOLVERS = (solve_dijkstra,solve_astar,solve_bidirectional_dijkstra,solve_bidirectional_astar,solve_alt)
+
+def _maps(count):
+	rng = default_rng(0)
+	for seed in range(count):
+		maparray = random_maparray(20,0.25,seed) if seed%2 else maze_maparray(21,0.2,seed)
+		# 最便宜的一步也比1贵，启发函数必须按min_weight缩放才不会漏掉最短路
+		yield maparray,rng.integers(3,12,maparray.shape)
+
+def test_integer_weights_match_reference():
+	for maparray,costarray in _maps(10):
+		expected = reference_cost(maparray,costarray)
+		grid = GridIndex(maparray,costarray)
+		assert grid.weight.dtype==int64 and grid.min_weight==costarray[maparray!=3].min()
+		for solve in SOLVERS:
+			for queue in ('heap','bucket'):
+				result = solve(maparray,queue=queue,costarray=costarray)
+				assert result.cost==expected
+				if expected<inf:
+					assert path_cost(grid,result.path)==expected
+
+def test_float_weights_match_reference():
+	for maparray,costarray in _maps(6):
+		costarray = costarray/4+0.01
+		expected = reference_cost(maparray,costarray)
+		grid = GridIndex(maparray,costarray)
+		assert grid.weight.dtype==float64
+		for solve in SOLVERS:
+			result = solve(maparray,costarray=costarray)
+			assert result.cost==approx(expected)
+			if expected<inf:
+				assert path_cost(grid,result.path)==approx(expected)
+		if expected<inf:
+			# 桶队列只接受整数的f
+			with raises(AssertionError):
+				solve_dijkstra(maparray,queue='bucket',costarray=costarray)
+
+def test_invalid_weights():
+	# 障碍物上的空格子换成1，可以通行的栅格的cost必须是正数
+	maparray = random_maparray(10,0.3,1)
+	costarray = maparray*0+2.0
+	costarray[maparray==3] = nan
+	grid = GridIndex(maparray,costarray)
+	assert (grid.weight[grid.state==3]==1).all() and grid.min_weight==2
+	assert solve_dijkstra(maparray,costarray=costarray).cost==2*solve_dijkstra(maparray).cost
+	costarray[maparray==0] = 0
+	with raises(AssertionError):
+		GridIndex(maparray,costarray)
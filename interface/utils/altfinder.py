@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 18:02:26
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了基于地标的astar（ALT：A*, Landmarks and Triangle inequality），用于迷宫、围墙很多的栅格图。
+
+在这类栅格图上曼哈顿距离远远小于真正的最短路长度，astar扩展的栅格几乎和dijkstra一样多。
+ALT先选出几个地标L，求出每个地标到所有栅格的最短路长度d(L,.)，由三角不等式，任意栅格v到终点t的最短路长度满足
+	d(v,t) >= d(L,t)-d(L,v)
+	d(v,t) >= d(v,L)-d(t,L)
+对所有地标取最大值，再和曼哈顿距离取最大值作为启发函数，它仍然不会高估，但比曼哈顿距离准确得多。
+
+- 地标的选择：只在最大的连通分量里选，第一个地标是离任意一个栅格最远的栅格，之后每次选离已有地标最近距离最大的栅格（farthest point）；
+- 距离表：每个地标一行，每一步的cost都是整数时保存为int32，不可达为-1，可以单独保存为.npz文件，也可以和栅格图一起保存在.spmap文件里（见mapfile模块）；
+- 每次查询只取出各个地标到终点的距离，栅格的启发函数值在搜索第一次用到它时才从距离表中算出来，不会为整张栅格图建立临时数组。
+同一张栅格图的LandmarkTable会按栅格图的指纹（GridIndex.fingerprint）缓存起来。
+
+Usage:
+from utils.altfinder import solve_alt
+result = solve_alt(maparray,count=8)
+"""
+
+from collections import OrderedDict
+from numpy import argmax,asarray,empty,flatnonzero,load,minimum,savez_compressed,where,int32,intp
+from .connectivity import as_grid,component_labels
+from .easypathfinder import _search,solve_dijkstra
+from .wavefront import wavefront
+
+class LandmarkTable:
+	"""
+	地标和它们的距离表。landmarks[i]是第i个地标的索引，distance[i][index]是从第i个地标到栅格index的最短路长度，不可达为-1
+	"""
+
+	def __init__(self,shape,landmarks,distance,fingerprint=None):
+		self.shape = tuple(int(n) for n in shape)
+		self.landmarks = asarray(landmarks,dtype=intp)
+		self.distance = asarray(distance)
+		self.fingerprint = None if fingerprint is None else str(fingerprint)
+
+	def __len__(self):
+		return len(self.landmarks)
+
+	def __str__(self):
+		return "<LandmarkTable with {} landmarks on a {}x{} map>".format(len(self),*self.shape)
+
+	@classmethod
+	def build(cls,grid,count=8):
+		"""
+		在grid上选出count个地标，并从每个地标出发跑一次完整的dijkstra（每一步的cost都是1时是逐层的宽度优先搜索）
+		"""
+		labels = component_labels(grid)
+		if not labels.count:
+			return cls(grid.shape,empty(0,dtype=intp),empty((0,len(grid)),dtype=int32),grid.fingerprint())
+		cells = flatnonzero(labels.label==argmax(labels.sizes))
+		# 任意一个栅格出发，离它最远的栅格作为第一个地标
+		nearest = _distances(grid,int(cells[0]))
+		landmarks,rows = [],[]
+		while len(landmarks)<min(count,len(cells)):
+			landmark = int(cells[argmax(nearest[cells])])
+			if landmarks and nearest[landmark]<=0:
+				break # 所有栅格都已经是地标了
+			row = _distances(grid,landmark)
+			nearest = row if not landmarks else minimum(nearest,row)
+			landmarks.append(landmark)
+			rows.append(row)
+		return cls(grid.shape,landmarks,asarray(rows),grid.fingerprint())
+
+	def save(self,filename):
+		savez_compressed(filename,shape=asarray(self.shape),landmarks=self.landmarks,distance=self.distance,fingerprint=self.fingerprint or '')
+
+	@classmethod
+	def load(cls,filename):
+		with load(filename) as data:
+			return cls(data['shape'],data['landmarks'],data['distance'],str(data['fingerprint']) or None)
+
+	def heuristic(self,grid,target=None):
+		"""
+		返回到target（默认为grid.end）的启发函数hath(index)，是地标给出的下界和曼哈顿距离中的最大值。
+		只预先取出每个地标到target的距离，栅格的值在第一次被问到时才从距离表的那一列算出来，然后记下来
+		"""
+		target = grid.end if target is None else target
+		ncols,min_weight,weight = grid.ncols,grid.min_weight,grid.weight
+		end_x,end_y = divmod(target,ncols)
+		# 和终点不在同一个连通分量里的地标不起作用
+		useful = flatnonzero(self.distance[:,target]>=0)
+		rows = slice(None) if useful.size==len(self) else useful
+		distance = self.distance
+		to_target = distance[rows,target].tolist()
+		target_weight = 0 if weight is None else weight[target].item()
+		values = {}
+
+		def hath(index):
+			value = values.get(index)
+			if value is None:
+				x,y = divmod(index,ncols)
+				value = (abs(x-end_x)+abs(y-end_y))*min_weight
+				column = distance[rows,index].tolist()
+				if weight is None:
+					for d,t in zip(column,to_target):
+						value = max(value,abs(d-t))
+				else:
+					# 进入栅格的cost算在被进入的栅格上，所以d(v,L)=d(L,v)-w(v)+w(L)
+					offset = target_weight-weight[index].item()
+					for d,t in zip(column,to_target):
+						value = max(value,t-d,d-t+offset)
+				values[index] = value
+			return value
+		return hath
+
+def _distances(grid,source):
+	"""
+	从source出发到每个栅格的最短路长度，不可达为-1，每一步的cost都是整数时为int32
+	"""
+	if grid.weight is None:
+		return wavefront(grid,source)[0]
+	start,end = grid.start,grid.end
+	grid.start = grid.end = source # 终点就是起点，不提前结束的dijkstra会检查所有能到达的栅格
+	integral = grid.weight is None or grid.weight.dtype.kind=='i'
+	try:
+		solve_dijkstra(grid,queue='bucket' if integral else 'heap')
+	finally:
+		grid.start,grid.end = start,end
+	workspace = grid.workspace
+	distance = where(workspace.stamp==workspace.generation,workspace.cost,-1)
+	if integral and distance.max()<2**31:
+		return distance.astype(int32)
+	return distance
+
+_tables = OrderedDict() # (指纹,地标数) -> LandmarkTable，最近用过的放在最后
+
+def landmark_table(grid,count=8,cache_size=4):
+	"""
+	返回grid的LandmarkTable，同一张栅格图只预处理一次，最多缓存cache_size张栅格图
+	"""
+	key = (grid.fingerprint(),count)
+	if key in _tables:
+		_tables.move_to_end(key)
+		return _tables[key]
+	table = _tables[key] = LandmarkTable.build(grid,count)
+	while len(_tables)>cache_size:
+		_tables.popitem(last=False)
+	return table
+
+def solve_alt(maparray,observer=None,queue='heap',landmarks=None,count=8,costarray=None):
+	"""
+	不画图、不保存文件的ALT，得到的最短路长度和dijkstra、astar一样，但扩展的栅格更少
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex
+		observer(SearchObserver): 可选，需要观察求解过程时传入
+		queue(str): 'heap'或'bucket'
+		landmarks(LandmarkTable): 可选，不传入时使用按指纹缓存的LandmarkTable
+		count(int): 不传入landmarks时选多少个地标
+		costarray(ndarray): 可选，每个栅格的进入cost
+
+	Returns:
+		result(SearchResult)
+	"""
+	grid = as_grid(maparray,costarray)
+	table = landmarks if landmarks is not None else landmark_table(grid,count)
+	assert table.fingerprint is None or table.fingerprint==grid.fingerprint(),"The LandmarkTable was built for another map!"
+	return _search(grid,hath=table.heuristic(grid),observer=observer,queue=queue)
+
+__all__ = ['LandmarkTable','landmark_table','solve_alt']
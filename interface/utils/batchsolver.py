@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 14:31:08
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块用于在同一张栅格图上批量求解大量的起点-终点对。
+
+BatchSolver只解析、索引栅格图一次，把state（和权重）放进共享内存，再把查询分块交给进程池，
+每个工作进程直接在共享内存上建立GridIndex，不复制栅格图，也不写任何文件。结果以NumPy数组的形式返回。
+
+Usage:
+from utils.batchsolver import BatchSolver
+solver = BatchSolver(maparray)
+result = solver.solve([[[0,0],[19,19]],[[3,4],[10,2]]],algorithm='astar',processes=4)
+result.costs # 每个查询的最短路长度
+result.path(0) # 第0个查询的最短路，(x,y)坐标数组
+"""
+
+from multiprocessing import Pool,cpu_count
+from multiprocessing.shared_memory import SharedMemory
+from numpy import asarray,concatenate,cumsum,empty,ndarray,zeros,float64,int32,int64
+from .rasterbuilder import GridIndex
+from .easypathfinder import solve_dijkstra,solve_astar,solve_bidirectional_dijkstra,solve_bidirectional_astar
+from .jpsfinder import solve_jps,JumpTable
+from .wavefront import solve_wavefront
+
+def _solve_jps(grid):
+	# 每个进程只预处理一次JumpTable
+	if getattr(grid,'_jump_table',None) is None:
+		grid._jump_table = JumpTable.build(grid)
+	return solve_jps(grid,table=grid._jump_table)
+
+ALGORITHMS = {
+	'dijkstra':lambda grid:solve_dijkstra(grid,early_exit=True),
+	'astar':solve_astar,
+	'bidirectional_dijkstra':solve_bidirectional_dijkstra,
+	'bidirectional_astar':solve_bidirectional_astar,
+	'jps':_solve_jps,
+	'wavefront':solve_wavefront,
+}
+
+class BatchResult:
+	"""
+	批量求解的结果
+
+	Attributes:
+		costs(ndarray): 每个查询的最短路长度，不可达为inf，形状为(n,)
+		expanded(ndarray): 每个查询扩展的栅格数量，形状为(n,)
+		offsets(ndarray): 第i个查询的最短路是coords[offsets[i]:offsets[i+1]]，形状为(n+1,)
+		coords(ndarray): 所有最短路的(x,y)坐标首尾相接，形状为(m,2)
+	"""
+
+	def __init__(self,costs,expanded,offsets,coords):
+		self.costs = costs
+		self.expanded = expanded
+		self.offsets = offsets
+		self.coords = coords
+
+	def __len__(self):
+		return self.costs.size
+
+	def __str__(self):
+		return "<BatchResult of {} queries>".format(len(self))
+
+	def path(self,i):
+		return self.coords[self.offsets[i]:self.offsets[i+1]]
+
+_worker = {} # 工作进程中的GridIndex和共享内存
+
+def _share(array):
+	shm = SharedMemory(create=True,size=max(array.nbytes,1))
+	ndarray(array.shape,array.dtype,buffer=shm.buf)[:] = array
+	return shm
+
+def _attach(name,shape,dtype):
+	# 工作进程和主进程共用同一个resource_tracker，共享内存只由主进程unlink
+	shm = SharedMemory(name=name)
+	return shm,ndarray(shape,dtype,buffer=shm.buf)
+
+def _init_worker(shape,state_name,weight_name,weight_dtype):
+	state_shm,state = _attach(state_name,(shape[0]*shape[1],),'uint8')
+	shms = [state_shm]
+	weight = None
+	if weight_name is not None:
+		weight_shm,weight = _attach(weight_name,(shape[0]*shape[1],),weight_dtype)
+		shms.append(weight_shm)
+	_worker['shms'] = shms # 保持引用，否则共享内存会被关闭
+	_worker['grid'] = GridIndex.fromArrays(shape,state,weight)
+
+def _solve_chunk(args):
+	"""
+	在当前进程的GridIndex上求解一组查询，返回(costs,expanded,每个查询最短路的栅格索引)
+	"""
+	algorithm,queries = args
+	grid = _worker['grid']
+	solve = ALGORITHMS[algorithm]
+	costs = empty(len(queries),dtype=float64)
+	expanded = empty(len(queries),dtype=int64)
+	paths = []
+	for i,(start,end) in enumerate(queries):
+		grid.start,grid.end = int(start),int(end)
+		result = solve(grid)
+		costs[i] = result.cost
+		expanded[i] = result.expanded
+		paths.append(asarray(result.path,dtype=int32).reshape(-1,2))
+	return costs,expanded,paths
+
+class BatchSolver:
+	"""
+	在同一张栅格图上批量求解起点-终点对
+	"""
+
+	def __init__(self,maparray,costarray=None):
+		"""
+		Args:
+			maparray(ndarray): 也可以直接传入GridIndex，maparray中的起点和终点会被忽略
+			costarray(ndarray): 可选，每个栅格的进入cost
+		"""
+		self.grid = maparray if isinstance(maparray,GridIndex) else GridIndex(maparray,costarray)
+
+	def __str__(self):
+		return "<BatchSolver on a {}x{} map>".format(*self.grid.shape)
+
+	def _indexes(self,pairs):
+		# (n,2,2)的(x,y)坐标 -> (n,2)的栅格索引
+		pairs = asarray(pairs,dtype=int64).reshape(-1,2,2)
+		x,y = pairs[...,0],pairs[...,1]
+		assert ((x>=0)&(x<self.grid.nrows)&(y>=0)&(y<self.grid.ncols)).all(),"Every start and goal must be inside the map!"
+		indexes = x*self.grid.ncols+y
+		assert (self.grid.state[indexes]!=3).all(),"Starts and goals cannot be obstacle blocks!"
+		return indexes
+
+	def solve(self,pairs,algorithm='astar',processes=None,chunksize=None):
+		"""
+		求解一批查询
+
+		Args:
+			pairs(array_like): 形状为(n,2,2)，第i个查询是[[起点x,起点y],[终点x,终点y]]，坐标和Point一样
+			algorithm(str): 'dijkstra'（找到终点就结束）、'astar'、'bidirectional_dijkstra'、'bidirectional_astar'、'jps'或'wavefront'
+			processes(int): 进程数，默认为CPU核数，为1时在当前进程中求解
+			chunksize(int): 每个任务包含的查询数量，默认让每个进程分到大约4个任务
+
+		Returns:
+			result(BatchResult)
+		"""
+		assert algorithm in ALGORITHMS,"algorithm must be one of {}".format(sorted(ALGORITHMS))
+		indexes = self._indexes(pairs)
+		processes = processes or cpu_count()
+		chunksize = chunksize or max(1,-(-len(indexes)//(4*processes)))
+		chunks = [(algorithm,indexes[i:i+chunksize].tolist()) for i in range(0,len(indexes),chunksize)]
+		if processes==1 or len(chunks)<=1:
+			_worker['grid'] = self.grid
+			outputs = [_solve_chunk(chunk) for chunk in chunks]
+			_worker.clear()
+		else:
+			shms = [_share(self.grid.state)]
+			if self.grid.weight is not None:
+				shms.append(_share(self.grid.weight))
+			try:
+				initargs = (self.grid.shape,shms[0].name,shms[1].name if len(shms)>1 else None,
+					self.grid.weight.dtype.str if self.grid.weight is not None else None)
+				with Pool(processes,initializer=_init_worker,initargs=initargs) as pool:
+					outputs = pool.map(_solve_chunk,chunks)
+			finally:
+				for shm in shms:
+					shm.close()
+					shm.unlink()
+		return self._collect(outputs,len(indexes))
+
+	def _collect(self,outputs,n):
+		costs = concatenate([output[0] for output in outputs]) if outputs else zeros(0)
+		expanded = concatenate([output[1] for output in outputs]) if outputs else zeros(0,dtype=int64)
+		paths = [path for output in outputs for path in output[2]]
+		offsets = zeros(n+1,dtype=int64)
+		offsets[1:] = cumsum([len(path) for path in paths])
+		coords = concatenate(paths) if paths else zeros((0,2),dtype=int32)
+		return BatchResult(costs,expanded,offsets,coords)
+
+__all__ = ['ALGORITHMS','BatchResult','BatchSolver']
@@ -0,0 +1,398 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 12:20:37
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+性能测试工具。
+
+run_benchmark在不同边长、不同障碍物比例的随机栅格图（由种子决定，可以复现）上不画图地运行各个求解器，
+记录耗时、扩展的栅格数、open list的操作次数和内存峰值；render_benchmark把生成gif的几个阶段分开计时。
+结果可以保存为JSON，和以前保存的结果比较就能发现性能回退。
+
+在interface目录下运行：
+python -m utils.benchmark --output benchmark.json
+python -m utils.benchmark --baseline benchmark.json # 和以前的结果比较
+python -m utils.benchmark --solvers astar --profile cprofile # 只做性能分析
+"""
+
+import json
+from argparse import ArgumentParser
+from io import BytesIO
+from platform import platform,python_version
+from time import perf_counter,strftime
+from tracemalloc import start,stop,get_traced_memory,reset_peak
+from numpy import arange,argwhere,asarray,full,isfinite,mean,zeros,__version__ as numpy_version
+from numpy.random import default_rng
+from PIL import Image
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from .rasterbuilder import GridIndex,RasterMap
+from .easypathfinder import solve_dijkstra,solve_astar,solve_bidirectional_dijkstra,solve_bidirectional_astar
+from .jpsfinder import solve_jps,jump_table
+from .hpafinder import HPAGraph,solve_hpa,hpa_graph
+from .altfinder import LandmarkTable,solve_alt,landmark_table
+from .wavefront import solve_wavefront
+from .tracerecorder import TraceRecorder,TraceReplay
+from .gifbuilder import draw_trace_frame
+from .instrument import profile_solve
+
+SOLVERS = {
+	'dijkstra':solve_dijkstra,
+	'astar':solve_astar,
+	'bidirectional_dijkstra':solve_bidirectional_dijkstra,
+	'bidirectional_astar':solve_bidirectional_astar,
+	'jps':solve_jps,
+	'hpa':solve_hpa,
+	'alt':solve_alt,
+	'wavefront':solve_wavefront,
+}
+# 只和栅格图有关的预处理，单独计时，求解时直接使用缓存
+PREPARE = {
+	'jps':jump_table,
+	'hpa':hpa_graph,
+	'alt':landmark_table,
+}
+
+def random_maparray(size,density=0.2,seed=0):
+	"""
+	生成一个随机的maparray，左下角为起点，右上角为终点
+
+	Args:
+		size(int): 栅格图的边长
+		density(float): 障碍物所占的比例
+		seed(int): 随机数种子，相同的种子总是生成相同的栅格图
+	"""
+	maparray = zeros((size,size))
+	maparray[default_rng(seed).random((size,size))<density] = 3
+	maparray[-1,0] = 1
+	maparray[0,-1] = 2
+	return maparray
+
+def maze_maparray(size,loops=0.05,seed=0):
+	"""
+	生成一个迷宫形状的maparray，左下角为起点，右上角为终点。
+	x、y都是偶数的栅格是房间，先用随机的深度优先搜索打通一棵生成树，再随机拆掉loops比例的墙，让迷宫中出现环
+
+	Args:
+		size(int): 栅格图的边长，偶数时最后一行、一列除了起点和终点都是墙
+		loops(float): 额外拆掉的墙所占的比例
+		seed(int): 随机数种子
+	"""
+	rng = default_rng(seed)
+	maparray = full((size,size),3.0)
+	rooms = (size+1)//2
+	visited = zeros((rooms,rooms),dtype=bool)
+	stack = [(0,0)]
+	visited[0,0] = True
+	maparray[0,0] = 0
+	while stack:
+		i,j = stack[-1]
+		unvisited = [(i+di,j+dj) for di,dj in ((1,0),(-1,0),(0,1),(0,-1)) if 0<=i+di<rooms and 0<=j+dj<rooms and not visited[i+di,j+dj]]
+		if not unvisited:
+			stack.pop()
+			continue
+		ni,nj = unvisited[rng.integers(len(unvisited))]
+		visited[ni,nj] = True
+		maparray[2*ni,2*nj] = maparray[i+ni,j+nj] = 0 # 房间和中间的墙
+		stack.append((ni,nj))
+	# 两个房间之间的墙：一个坐标是奇数，另一个是偶数
+	walls = argwhere((maparray==3)&((arange(size)[:,None]+arange(size))%2==1))
+	opened = walls[rng.random(len(walls))<loops]
+	maparray[opened[:,0],opened[:,1]] = 0
+	maparray[-1,0] = 1
+	maparray[0,-1] = 2
+	return maparray
+
+def _traced(function):
+	# 返回function()的结果和它执行期间新分配的内存峰值（字节）
+	start()
+	reset_peak()
+	base = get_traced_memory()[0]
+	result = function()
+	peak = get_traced_memory()[1]-base
+	stop()
+	return result,peak
+
+def memory_benchmark(size=500):
+	"""
+	比较每个栅格占用的内存：GridIndex本身、第一次搜索时分配的SearchWorkspace，以及把所有Point对象都创建出来之后
+
+	Returns:
+		report(dict): 每个栅格的字节数
+	"""
+	maparray = random_maparray(size)
+	cells = maparray.size
+	grid,grid_bytes = _traced(lambda:GridIndex(maparray))
+	workspace,workspace_bytes = _traced(lambda:grid.workspace)
+	rsm = RasterMap()
+	rsm.buildMap(maparray)
+	points,points_bytes = _traced(lambda:list(rsm.all_point_group))
+	return {
+		'size':size,
+		'grid_bytes_per_cell':grid_bytes/cells,
+		'workspace_bytes_per_cell':workspace_bytes/cells,
+		'points_bytes_per_cell':points_bytes/cells,
+	}
+
+def hpa_benchmark(size=500,density=0.2,queries=20,cluster_size=16,seed=0):
+	"""
+	在同一张随机栅格图上比较astar和分层寻路（HPA*）：随机选queries对起点终点，比较平均每次查询的时间和路径长度
+
+	Returns:
+		report(dict): 预处理时间、实际求解的查询数（起点和终点相同的不算）、两者平均每次查询的秒数，以及HPA*路径比最短路长出的比例（平均和最大）
+	"""
+	maparray = random_maparray(size,density,seed)
+	grid = GridIndex(maparray)
+	started = perf_counter()
+	graph = HPAGraph.build(grid,cluster_size)
+	build_time = perf_counter()-started
+	free = argwhere(grid.state.reshape(grid.shape)!=3)
+	pairs = free[default_rng(seed).integers(len(free),size=(queries,2))]
+	astar_time = hpa_time = 0
+	gaps = []
+	runs = 0 # 起点和终点相同的查询跳过，平均值只按实际求解的查询算
+	for (sx,sy),(ex,ey) in pairs.tolist():
+		grid.start,grid.end = grid.index(sx,sy),grid.index(ex,ey)
+		if grid.start==grid.end:
+			continue
+		runs += 1
+		optimal = solve_astar(grid)
+		result = solve_hpa(grid,graph=graph)
+		astar_time += optimal.search_time
+		hpa_time += result.search_time
+		if isfinite(optimal.cost) and optimal.cost>0:
+			gaps.append(result.cost/optimal.cost-1)
+	return {
+		'size':size,
+		'cluster_size':cluster_size,
+		'nodes':len(graph),
+		'build_seconds':build_time,
+		'queries':runs,
+		'astar_seconds_per_query':astar_time/max(runs,1),
+		'hpa_seconds_per_query':hpa_time/max(runs,1),
+		'mean_optimality_gap':float(mean(gaps)) if gaps else 0.0,
+		'max_optimality_gap':max(gaps) if gaps else 0.0,
+	}
+
+def alt_benchmark(size=201,queries=20,count=8,loops=0.05,seed=0,maparray=None):
+	"""
+	在同一张迷宫上比较astar和ALT：随机选queries对起点终点，比较平均每次查询扩展的栅格数和时间
+
+	Args:
+		maparray(ndarray): 可选，不传入时用maze_maparray(size,loops,seed)
+
+	Returns:
+		report(dict): 预处理时间、两者平均每次查询扩展的栅格数和秒数，以及ALT扩展的栅格数占astar的比例
+	"""
+	if maparray is None:
+		maparray = maze_maparray(size,loops,seed)
+	grid = GridIndex(maparray)
+	started = perf_counter()
+	table = LandmarkTable.build(grid,count)
+	build_time = perf_counter()-started
+	free = argwhere(grid.state.reshape(grid.shape)!=3)
+	pairs = free[default_rng(seed).integers(len(free),size=(queries,2))]
+	astar_expanded = alt_expanded = 0
+	astar_time = alt_time = 0
+	for (sx,sy),(ex,ey) in pairs.tolist():
+		grid.start,grid.end = grid.index(sx,sy),grid.index(ex,ey)
+		optimal = solve_astar(grid)
+		result = solve_alt(grid,landmarks=table)
+		assert result.cost==optimal.cost,"ALT must find a shortest path!"
+		astar_expanded += optimal.expanded
+		alt_expanded += result.expanded
+		astar_time += optimal.search_time
+		alt_time += result.search_time
+	return {
+		'size':int(grid.shape[0]),
+		'landmarks':len(table),
+		'build_seconds':build_time,
+		'astar_expanded_per_query':astar_expanded/queries,
+		'alt_expanded_per_query':alt_expanded/queries,
+		'expanded_ratio':alt_expanded/max(astar_expanded,1),
+		'astar_seconds_per_query':astar_time/queries,
+		'alt_seconds_per_query':alt_time/queries,
+	}
+
+def _solve(solver,maparray):
+	# 在新建的GridIndex上求解一次，返回(result,墙上时间)，预处理已经做过了。
+	# 查预处理缓存要用的指纹在计时之前算好，墙上时间只包括求解
+	grid = GridIndex(maparray)
+	grid.fingerprint()
+	started = perf_counter()
+	result = SOLVERS[solver](grid)
+	return result,perf_counter()-started
+
+def run_benchmark(sizes=(50,200,500),densities=(0.1,0.2,0.3),solvers=None,seed=0,repeat=3):
+	"""
+	在每个边长、每个障碍物比例的随机栅格图上运行每个求解器
+
+	Args:
+		sizes(tuple): 栅格图的边长
+		densities(tuple): 障碍物所占的比例
+		solvers(list): SOLVERS中的名字，默认为全部
+		seed(int): 随机数种子
+		repeat(int): 计时重复的次数，取最快的一次
+
+	Returns:
+		records(list): 每个(求解器,边长,障碍物比例)一条记录
+	"""
+	records = []
+	for size in sizes:
+		for density in densities:
+			maparray = random_maparray(size,density,seed)
+			for solver in solvers or SOLVERS:
+				started = perf_counter()
+				if solver in PREPARE:
+					PREPARE[solver](GridIndex(maparray))
+				prepare_time = perf_counter()-started
+				timings = [_solve(solver,maparray) for i in range(repeat)]
+				result,wall_time = min(timings,key=lambda timing:timing[1])
+				# tracemalloc会拖慢求解，内存峰值单独再跑一次
+				_,peak = _traced(lambda:_solve(solver,maparray))
+				records.append({
+					'solver':solver,
+					'size':size,
+					'density':density,
+					'seed':seed,
+					'cost':result.cost,
+					'prepare_seconds':prepare_time,
+					'wall_seconds':wall_time,
+					'search_seconds':result.search_time,
+					'expanded':result.expanded,
+					'pushes':result.pushes,
+					'pops':result.pops,
+					'stale':result.stale,
+					'peak_open':result.peak_open,
+					'peak_bytes':peak,
+				})
+	return records
+
+def render_benchmark(size=20,density=0.05,seed=0,solver='astar',FPS=24,DPI=100):
+	"""
+	把生成gif的过程拆成几个阶段分别计时：不记录trace的求解、记录trace的求解、由trace逐帧重建栅格图（每一帧只叠加这一帧的事件）、
+	matplotlib画出每一帧、Pillow编码gif（写到内存里，不产生文件）。
+	每一帧重建、画好之后马上交给Pillow，不把所有帧都留在内存里，重建和画图的时间在编码的过程中分别累加
+
+	Returns:
+		record(dict): 各个阶段的秒数、帧数和gif的字节数
+	"""
+	maparray = random_maparray(size,density,seed)
+	_,search_time = _solve(solver,maparray)
+	recorder = TraceRecorder()
+	started = perf_counter()
+	SOLVERS[solver](GridIndex(maparray),observer=recorder)
+	record_time = perf_counter()-started
+	replay = TraceReplay(recorder.trace)
+	# 和Model.run_algorithm一样大小的图，但不经过pyplot
+	fig = Figure(figsize=(6,6),dpi=DPI)
+	canvas = FigureCanvasAgg(fig)
+	ax = fig.add_subplot()
+	fig.tight_layout(pad=0.05)
+	timings = {'replay':0.0,'draw':0.0}
+	started = perf_counter()
+	im = draw_trace_frame(ax,replay.render(0))
+	timings['draw'] += perf_counter()-started
+
+	def images():
+		for step in range(len(replay)):
+			started = perf_counter()
+			frame = replay.image(replay.seek(step))
+			timings['replay'] += perf_counter()-started
+			started = perf_counter()
+			im.set_data(frame)
+			canvas.draw()
+			image = Image.fromarray(asarray(canvas.buffer_rgba())).convert('RGB')
+			timings['draw'] += perf_counter()-started
+			yield image
+
+	frames = images()
+	first = next(frames)
+	measured = sum(timings.values())
+	gif = BytesIO()
+	started = perf_counter()
+	first.save(gif,format='GIF',save_all=True,append_images=frames,duration=1000/FPS,loop=0)
+	encode_time = perf_counter()-started-(sum(timings.values())-measured)
+	replay_time,draw_time = timings['replay'],timings['draw']
+	return {
+		'solver':solver,
+		'size':size,
+		'density':density,
+		'seed':seed,
+		'frames':len(replay),
+		'search_seconds':search_time,
+		'recorded_search_seconds':record_time,
+		'replay_seconds':replay_time,
+		'draw_seconds':draw_time,
+		'encode_seconds':encode_time,
+		'gif_bytes':gif.tell(),
+	}
+
+def save_report(report,filename):
+	with open(filename,'w') as f:
+		json.dump(report,f,indent=1)
+
+def load_report(filename):
+	with open(filename) as f:
+		return json.load(f)
+
+def compare_reports(baseline,current,tolerance=0.25,min_seconds=0.005):
+	"""
+	比较两次run_benchmark的结果，返回发现的问题（字符串列表）：
+	墙上时间比以前慢了超过tolerance（两次都短于min_seconds的不算，太短了计时不准），或者cost、扩展的栅格数变了
+	"""
+	key = lambda record:(record['solver'],record['size'],record['density'],record['seed'])
+	previous = {key(record):record for record in baseline['search']}
+	problems = []
+	for record in current['search']:
+		old = previous.get(key(record))
+		if old is None:
+			continue
+		name = "{} size={} density={} seed={}".format(*key(record))
+		if record['cost']!=old['cost']:
+			problems.append("{}: cost changed from {} to {}".format(name,old['cost'],record['cost']))
+		if record['expanded']!=old['expanded']:
+			problems.append("{}: expanded changed from {} to {}".format(name,old['expanded'],record['expanded']))
+		if max(record['wall_seconds'],old['wall_seconds'])>=min_seconds and record['wall_seconds']>old['wall_seconds']*(1+tolerance):
+			problems.append("{}: {:.4f}s -> {:.4f}s".format(name,old['wall_seconds'],record['wall_seconds']))
+	return problems
+
+if __name__ == '__main__':
+	parser = ArgumentParser(description='Benchmark the path finding solvers on seeded random maps.')
+	parser.add_argument('--sizes',type=int,nargs='+',default=[50,200,500])
+	parser.add_argument('--densities',type=float,nargs='+',default=[0.1,0.2,0.3])
+	parser.add_argument('--solvers',nargs='+',choices=list(SOLVERS),default=list(SOLVERS))
+	parser.add_argument('--seed',type=int,default=0)
+	parser.add_argument('--repeat',type=int,default=3)
+	parser.add_argument('--no-render',action='store_true',help='skip the rendering and gif encoding stages')
+	parser.add_argument('--output',help='save the report as JSON')
+	parser.add_argument('--baseline',help='compare with a report saved earlier')
+	parser.add_argument('--tolerance',type=float,default=0.25)
+	parser.add_argument('--profile',choices=['cprofile','tracemalloc'],help='only profile each solver once on the largest map and print the reports')
+	args = parser.parse_args()
+	if args.profile:
+		maparray = random_maparray(max(args.sizes),max(args.densities),args.seed)
+		for solver in args.solvers:
+			print("=== {} ===".format(solver))
+			print(profile_solve(SOLVERS[solver],GridIndex(maparray),mode=args.profile)[1])
+		raise SystemExit
+	report = {
+		'created':strftime('%Y-%m-%d %H:%M:%S'),
+		'python':python_version(),
+		'numpy':numpy_version,
+		'platform':platform(),
+		'search':run_benchmark(args.sizes,args.densities,args.solvers,args.seed,args.repeat),
+		'render':[] if args.no_render else [render_benchmark(seed=args.seed)],
+		'memory':memory_benchmark(max(args.sizes)),
+	}
+	for record in report['search']:
+		print("{solver:>22} size={size:<5} density={density:<4} cost={cost:<8} {wall_seconds:.4f}s expanded={expanded} peak={peak_bytes}".format(**record))
+	for record in report['render']:
+		print(record)
+	print(report['memory'])
+	if args.output:
+		save_report(report,args.output)
+	if args.baseline:
+		problems = compare_reports(load_report(args.baseline),report,args.tolerance)
+		print('\n'.join(problems) if problems else 'No regressions against {}'.format(args.baseline))
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 17:48:04
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块给栅格图中可以通行的栅格标上连通分量的编号，只能上下左右移动时，编号不同的两个栅格之间一定没有路。
+求解函数在搜索之前先查一次编号，起点和终点不在同一个连通分量里时直接返回终点不可达的结果，不用把能到达的栅格都检查一遍。
+建立编号要读整张栅格图：求解函数收到ndarray时（反正要新建GridIndex，已经读了整张栅格图）会建立编号，按指纹缓存；
+收到GridIndex时只使用已经缓存的编号，不会为了这个检查去读整张栅格图（比如open_map得到的memmap），需要时先调用一次component_labels(grid)。
+
+- 建立：用NumPy做向量化的并查集，每一轮把相邻两个栅格中编号大的根挂到编号小的根上，再用指针跳跃把每棵树压平，
+  直到相邻的可以通行的栅格编号都相同；
+- 增量更新：某个栅格在0和3之间变化时，变得可以通行就把它周围的连通分量合并（较小的几块改成最大那块的编号），
+  变成障碍物就从它的几个邻居同时做广度优先搜索，先搜完的那一块已经和其它部分断开了，给它一个新编号。
+同一张栅格图的ComponentLabels会按栅格图的指纹（GridIndex.fingerprint）缓存起来，也可以保存为.npz文件。
+
+Usage:
+from utils.connectivity import component_labels
+labels = component_labels(grid)
+labels.connected(grid.start,grid.end)
+solve_astar(grid) # 之后的求解会先查编号
+"""
+
+from collections import OrderedDict,deque
+from numpy import arange,asarray,bincount,concatenate,full,load,maximum,minimum,savez_compressed,int32,intp
+from .rasterbuilder import GridIndex
+
+class ComponentLabels:
+	"""
+	连通分量的编号。label[index]是栅格index所在的连通分量的编号，障碍物为-1；sizes[k]是第k个连通分量有多少个栅格。
+	增量更新之后有的编号可能不再有栅格（size为0），编号不保证是连续的
+	"""
+
+	def __init__(self,shape,label,sizes=None):
+		self.shape = tuple(int(n) for n in shape)
+		self.nrows,self.ncols = self.shape
+		self.label = asarray(label,dtype=int32)
+		if sizes is None:
+			passable = self.label[self.label>=0]
+			sizes = bincount(passable) if passable.size else []
+		self.sizes = [int(size) for size in sizes]
+
+	def __str__(self):
+		return "<ComponentLabels with {} components on a {}x{} map>".format(self.count,*self.shape)
+
+	@property
+	def count(self):
+		# 现在还有栅格的连通分量的数量
+		return sum(1 for size in self.sizes if size>0)
+
+	@classmethod
+	def build(cls,grid):
+		nrows,ncols = grid.shape
+		free = (grid.state!=3).reshape(nrows,ncols)
+		index = arange(nrows*ncols,dtype=int32).reshape(nrows,ncols)
+		# 相邻的两个可以通行的栅格：y方向上index和index+1，x方向上index和index+ncols
+		right = index[:,:-1][free[:,:-1]&free[:,1:]]
+		below = index[:-1][free[:-1]&free[1:]]
+		first,second = concatenate((right,below)),concatenate((right+1,below+ncols))
+		root = index.ravel().copy()
+		while first.size:
+			a,b = root[first],root[second]
+			joined = a!=b
+			# 已经在同一棵树里的边以后也不会再分开，直接丢掉
+			first,second,a,b = first[joined],second[joined],a[joined],b[joined]
+			if not first.size:
+				break
+			# a、b都是根，大的挂到小的上，挂到同一个根上的多条边取最小的那个
+			minimum.at(root,maximum(a,b),minimum(a,b))
+			while True:
+				jumped = root[root]
+				if (jumped==root).all():
+					break
+				root = jumped
+		# 按根的位置从0开始重新编号
+		passable = free.ravel()
+		is_root = passable&(root==index.ravel())
+		label = full(nrows*ncols,-1,dtype=int32)
+		label[passable] = (is_root.cumsum(dtype=int32)-1)[root[passable]]
+		return cls((nrows,ncols),label)
+
+	def copy(self):
+		return ComponentLabels(self.shape,self.label.copy(),self.sizes)
+
+	def save(self,filename):
+		savez_compressed(filename,shape=asarray(self.shape),label=self.label,sizes=asarray(self.sizes,dtype=intp))
+
+	@classmethod
+	def load(cls,filename):
+		with load(filename) as data:
+			return cls(data['shape'],data['label'],data['sizes'])
+
+	def component(self,index):
+		# 栅格index所在的连通分量的编号，障碍物为-1
+		return int(self.label[index])
+
+	def connected(self,first,second):
+		"""
+		索引为first和second的两个栅格之间是否有路
+		"""
+		label = self.label
+		return bool(label[first]>=0 and label[first]==label[second])
+
+	def _neighbors(self,index):
+		# 上下左右四个方向上可以通行的邻居，和GridIndex.neighbors的顺序一致
+		x,y = divmod(index,self.ncols)
+		label = self.label
+		neighbors = []
+		if y+1<self.ncols and label[index+1]>=0:
+			neighbors.append(index+1)
+		if y>0 and label[index-1]>=0:
+			neighbors.append(index-1)
+		if x>0 and label[index-self.ncols]>=0:
+			neighbors.append(index-self.ncols)
+		if x+1<self.nrows and label[index+self.ncols]>=0:
+			neighbors.append(index+self.ncols)
+		return neighbors
+
+	def setState(self,index,value):
+		"""
+		栅格index的值变为value之后更新编号，只有可以通行（0、1、2）和障碍物（3）之间的变化才需要做事情
+		"""
+		passable = value!=3
+		if passable==(self.label[index]>=0):
+			return
+		if passable:
+			self._join(index)
+		else:
+			self._cut(index)
+
+	def _join(self,index):
+		# 新出现的可以通行的栅格把周围的连通分量连在一起，留下最大的那个编号，
+		# 其余较小的连通分量从它们在index旁边的栅格出发做广度优先搜索改成这个编号，花的时间只和较小的那几块有关
+		label = self.label
+		neighbors = self._neighbors(index)
+		components = sorted({int(label[neighbor]) for neighbor in neighbors},key=lambda k:-self.sizes[k])
+		if not components:
+			label[index] = len(self.sizes)
+			self.sizes.append(1)
+			return
+		keep = components[0]
+		for other in components[1:]:
+			seed = next(neighbor for neighbor in neighbors if label[neighbor]==other)
+			label[seed] = keep
+			queue = deque([seed])
+			while queue:
+				for neighbor in self._neighbors(queue.popleft()):
+					if label[neighbor]==other:
+						label[neighbor] = keep
+						queue.append(neighbor)
+			self.sizes[keep] += self.sizes[other]
+			self.sizes[other] = 0
+		label[index] = keep
+		self.sizes[keep] += 1
+
+	def _cut(self,index):
+		"""
+		栅格index变成障碍物之后它的几个邻居可能不再连通。从每个邻居同时做广度优先搜索，轮流各走一步，
+		两次搜索相遇就合并成一次；某次搜索先搜完时，它搜到的栅格已经和其它部分断开了，给它们一个新编号。
+		只剩下一次搜索时就可以停下来，所以花的时间只和断开的较小的那几块有关
+		"""
+		label = self.label
+		old = int(label[index])
+		label[index] = -1
+		self.sizes[old] -= 1
+		seeds = self._neighbors(index)
+		if len(seeds)<2:
+			return
+		owner = {seed:i for i,seed in enumerate(seeds)} # 栅格 -> 最先搜到它的那次搜索
+		group = list(range(len(seeds))) # 相遇之后合并到了哪次搜索
+		frontier = [deque([seed]) for seed in seeds]
+		cells = [[seed] for seed in seeds]
+		active = list(range(len(seeds)))
+		def find(i):
+			while group[i]!=i:
+				i = group[i]
+			return i
+		while len(active)>1:
+			for i in list(active):
+				if i not in active or len(active)==1:
+					continue
+				if not frontier[i]:
+					# 搜完了也没有碰到别的搜索
+					component = len(self.sizes)
+					self.sizes.append(len(cells[i]))
+					self.sizes[old] -= len(cells[i])
+					label[cells[i]] = component
+					active.remove(i)
+					continue
+				current = frontier[i].popleft()
+				for neighbor in self._neighbors(current):
+					j = owner.get(neighbor)
+					if j is None:
+						owner[neighbor] = i
+						cells[i].append(neighbor)
+						frontier[i].append(neighbor)
+						continue
+					j = find(j)
+					if j!=i:
+						group[j] = i
+						frontier[i].extend(frontier[j])
+						cells[i].extend(cells[j])
+						active.remove(j)
+
+_labels = OrderedDict() # 指纹 -> ComponentLabels，最近用过的放在最后
+
+def component_labels(grid,cache_size=8):
+	"""
+	返回grid的ComponentLabels，同一张栅格图只计算一次，最多缓存cache_size张栅格图。
+	缓存中的ComponentLabels可能被别的地方用着，需要增量更新时先copy一份
+	"""
+	key = grid.fingerprint()
+	if key in _labels:
+		_labels.move_to_end(key)
+		return _labels[key]
+	labels = _labels[key] = ComponentLabels.build(grid)
+	while len(_labels)>cache_size:
+		_labels.popitem(last=False)
+	return labels
+
+def as_grid(maparray,costarray=None):
+	"""
+	求解函数的入口用它得到GridIndex：传入GridIndex时原样返回，只使用已经缓存的编号；
+	传入ndarray时新建GridIndex并建立（或者从缓存中取出）它的编号，起点和终点不连通的查询不用搜索
+	"""
+	if isinstance(maparray,GridIndex):
+		return maparray
+	grid = GridIndex(maparray,costarray)
+	component_labels(grid)
+	return grid
+
+def cached_labels(grid):
+	"""
+	返回grid已经缓存的ComponentLabels，没有缓存时返回None。它不会计算指纹，也不会建立编号
+	"""
+	key = grid._fingerprint # 指纹还没有算过时这张栅格图一定不在缓存里
+	if key is None or key not in _labels:
+		return None
+	_labels.move_to_end(key)
+	return _labels[key]
+
+def reachable(grid,labels=None):
+	"""
+	grid的起点和终点是否可能在同一个连通分量里，求解函数在搜索之前调用它。
+	不传入labels时只查已经缓存的编号（as_grid或者component_labels建立的），没有缓存时返回True，
+	这样直接传入的GridIndex第一次求解不用为了这个检查把整张栅格图读一遍（算指纹、建立编号），open_map得到的memmap也只会读入搜索用到的部分
+	"""
+	labels = labels if labels is not None else cached_labels(grid)
+	return labels is None or labels.connected(grid.start,grid.end)
+
+__all__ = ['ComponentLabels','as_grid','component_labels','cached_labels','reachable']
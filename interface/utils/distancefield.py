@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 15:02:41
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了单源距离场：从一个起点出发跑一次完整的dijkstra，保留到每个栅格的cost和指向parent的方向。
+之后任意终点的查询都不用再搜索，沿parent方向回溯即可，复杂度只和最短路的长度有关。
+
+一个起点、很多终点（比如一个仓库、很多目标）时，同一个起点的距离场只算一次：
+距离场按（栅格图指纹，起点）缓存在DistanceFieldCache里，超过内存上限时淘汰最久没用过的距离场。
+
+Usage:
+from utils.distancefield import distance_field
+field = distance_field(maparray,(0,0))
+field.getCost(19,19) # 从(0,0)到(19,19)的最短路长度
+field.path(19,19) # 从(0,0)到(19,19)的最短路，(x,y)坐标数组
+"""
+
+from collections import OrderedDict
+from numpy import arange,asarray,full,load,savez_compressed,where,zeros,inf,int8,intp
+from .rasterbuilder import GridIndex
+from .easypathfinder import solve_dijkstra
+from .wavefront import wavefront
+
+UP,DOWN,LEFT,RIGHT = 0,1,2,3 # 与GridIndex.neighbors的上、下、左、右一致：y+1,y-1,x-1,x+1
+
+class DistanceField:
+	"""
+	从source出发的距离场。cost[index]是从source到index的最短路长度，不可达为inf；
+	direction[index]是index的parent所在的方向（UP、DOWN、LEFT、RIGHT），source和不可达的栅格为-1。
+	"""
+
+	def __init__(self,shape,source,cost,direction):
+		self.shape = tuple(shape)
+		self.nrows,self.ncols = self.shape
+		self.source = int(source)
+		self.cost = asarray(cost)
+		self.direction = asarray(direction,dtype=int8)
+		# 沿各个方向走一步时索引的变化
+		self.offsets = (1,-1,-self.ncols,self.ncols)
+
+	def __str__(self):
+		return "<DistanceField from {} on a {}x{} map>".format(divmod(self.source,self.ncols),*self.shape)
+
+	@property
+	def nbytes(self):
+		return self.cost.nbytes+self.direction.nbytes
+
+	@classmethod
+	def build(cls,grid,source):
+		"""
+		在grid上从索引为source的栅格出发跑一次完整的dijkstra，每一步的cost都是1时用NumPy逐层搜索（见wavefront模块）
+		"""
+		assert 0<=source<len(grid) and grid.state[source]!=3,"The source must be a block inside the map that is not an obstacle!"
+		if grid.weight is None:
+			cost,direction = wavefront(grid,source)
+			return cls(grid.shape,source,where(cost>=0,cost,inf),direction)
+		start,end = grid.start,grid.end
+		grid.start = grid.end = source # 终点就是起点，不提前结束的dijkstra会检查所有能到达的栅格
+		try:
+			solve_dijkstra(grid)
+		finally:
+			grid.start,grid.end = start,end
+		workspace = grid.workspace
+		reached = workspace.stamp==workspace.generation
+		cost = where(reached,workspace.cost,inf)
+		direction = full(len(grid),-1,dtype=int8)
+		has_parent = reached&(workspace.parent>=0)
+		delta = workspace.parent-arange(len(grid))
+		for value,offset in enumerate((1,-1,-grid.ncols,grid.ncols)):
+			direction[has_parent&(delta==offset)] = value
+		return cls(grid.shape,source,cost,direction)
+
+	def save(self,filename):
+		savez_compressed(filename,shape=asarray(self.shape),source=self.source,cost=self.cost,direction=self.direction)
+
+	@classmethod
+	def load(cls,filename):
+		with load(filename) as data:
+			return cls(data['shape'],data['source'],data['cost'],data['direction'])
+
+	def index(self,x,y):
+		assert 0<=x<self.nrows and 0<=y<self.ncols,"({},{}) is outside the map!".format(x,y)
+		return x*self.ncols+y
+
+	def getCost(self,x,y):
+		return float(self.cost[self.index(x,y)])
+
+	def path(self,x,y):
+		"""
+		从(x,y)开始沿parent方向回溯，返回从source到(x,y)的最短路，形状为(n,2)的(x,y)坐标数组，不可达时为空数组
+		"""
+		index = self.index(x,y)
+		if self.cost[index]==inf:
+			return zeros((0,2),dtype=intp)
+		direction,offsets = self.direction,self.offsets
+		path = [index]
+		while direction[index]>=0:
+			index += offsets[direction[index]]
+			path.append(index)
+		path.reverse()
+		return asarray(divmod(asarray(path,dtype=intp),self.ncols)).T
+
+class DistanceFieldCache:
+	"""
+	按（栅格图指纹，起点）缓存距离场，所有距离场占用的内存超过max_bytes时淘汰最久没用过的距离场
+	"""
+
+	def __init__(self,max_bytes=256*2**20):
+		self.max_bytes = max_bytes
+		self.nbytes = 0
+		self._fields = OrderedDict() # (指纹,起点) -> DistanceField，最近用过的放在最后
+
+	def __len__(self):
+		return len(self._fields)
+
+	def __contains__(self,key):
+		return key in self._fields
+
+	def get(self,grid,source):
+		key = (grid.fingerprint(),source)
+		if key in self._fields:
+			self._fields.move_to_end(key)
+			return self._fields[key]
+		field = DistanceField.build(grid,source)
+		self._fields[key] = field
+		self.nbytes += field.nbytes
+		# 刚算好的距离场即使单独超过上限也保留，直到下一个距离场进来
+		while self.nbytes>self.max_bytes and len(self._fields)>1:
+			self.nbytes -= self._fields.popitem(last=False)[1].nbytes
+		return field
+
+	def clear(self):
+		self._fields.clear()
+		self.nbytes = 0
+
+_fields = DistanceFieldCache()
+
+def distance_field(maparray,source=None,costarray=None,cache=_fields):
+	"""
+	返回从source出发的距离场，同一张栅格图、同一个起点只计算一次
+
+	Args:
+		maparray(ndarray): 也可以直接传入GridIndex
+		source(tuple): 起点的(x,y)坐标，坐标和Point一样，默认为maparray中的起点
+		costarray(ndarray): 可选，每个栅格的进入cost
+		cache(DistanceFieldCache): 为None时不缓存
+
+	Returns:
+		field(DistanceField)
+	"""
+	grid = maparray if isinstance(maparray,GridIndex) else GridIndex(maparray,costarray)
+	source = grid.start if source is None else grid.index(*source)
+	assert source>=0,"source must be inside the map, or maparray must contain a starting block (1)!"
+	if cache is None:
+		return DistanceField.build(grid,source)
+	return cache.get(grid,source)
+
+__all__ = ['DistanceField','DistanceFieldCache','distance_field']
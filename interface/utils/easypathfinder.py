@@ -4,14 +4,351 @@
 # @Author  : syuansheng (Dalian Maritime University)
 
 """
-这个模块实现了dijkstar和astar算法，并且同步保存了求解过程的每一帧图像，用户可以在算法运行结束后使用gifbuilder的generate_gif函数生成动图。
+这个模块实现了dijkstar和astar算法。
+默认每一步的cost都是1，传入和maparray形状相同的costarray后，进入每个栅格的cost由costarray给出。
+
+solve_dijkstra和solve_astar只需要maparray，不画图也不写文件，直接返回SearchResult，适合批量求解。
+dijkstra和astar会挂上一个FrameObserver，同步保存了求解过程的每一帧图像，用户可以在算法运行结束后使用gifbuilder的generate_gif函数生成动图。
+如果想在求解过程中做别的事情，可以继承SearchObserver，把它传给solve_dijkstra或solve_astar，
+instrument模块提供了现成的统计、挂钩子和性能分析工具。没有observer时求解过程中不会调用任何钩子。
 """
 
-from time import time
+from time import time,perf_counter
+from numpy import inf
 from .rasterbuilder import *
+from .openlist import make_open_list
+from .connectivity import as_grid,reachable
 from .gifbuilder import *
 
-def dijkstra(maparray,fig,ax,result_dir='result_pic'):
+class SearchResult:
+	"""
+	一次求解的结果
+
+	Attributes:
+		cost(float): 起点到终点的最短路长度，终点不可达时为inf（已经缓存了连通分量的编号并且起点和终点不连通时不会搜索，expanded为0，见connectivity）
+		path(ndarray): 最短路上从起点到终点每个栅格的(x,y)坐标，形状为(n,2)，终点不可达时n=0
+		expanded(int): 被扩展（检查邻居）过的栅格数量
+		pushes(int): 放入open list的次数
+		pops(int): 从open list弹出的次数（包括被丢掉的stale条目）
+		stale(int): 弹出后发现已经过期而被丢掉的条目数量
+		peak_open(int): open list中同时存在的栅格数量的最大值（双向搜索是两个open list的峰值之和）
+		search_time(float): 求解用了多少秒（包括observer花的时间）
+	"""
+
+	def __init__(self,cost,path,expanded,pushes=0,pops=0,stale=0,search_time=0.0,peak_open=0):
+		self.cost = cost
+		self.path = path
+		self.expanded = expanded
+		self.pushes = pushes
+		self.pops = pops
+		self.stale = stale
+		self.search_time = search_time
+		self.peak_open = peak_open
+
+	def __str__(self):
+		return "<SearchResult cost={} with {} blocks in path, {} expanded, {} pushes, {} pops>".format(self.cost,len(self.path),self.expanded,self.pushes,self.pops)
+
+class SearchObserver:
+	"""
+	求解过程的观察者，求解函数会在对应的时刻调用这些方法，默认什么都不做，按需重写即可。
+	下面的index都是GridIndex中的索引。
+	"""
+
+	def start(self,grid):
+		# 开始搜索之前
+		pass
+
+	def pop(self,index):
+		# 每次从待检查集合中取出一个栅格（过期的冗余条目已经被open list跳过了）
+		pass
+
+	def expand(self,index):
+		# 栅格index被检查，即将更新它的邻居
+		pass
+
+	def relax(self,index,parent,cost):
+		# 找到了一条经过parent到达index的更短的路，cost是新的cost
+		pass
+
+	def finish(self,grid,path,result):
+		# 搜索结束，path是最短路上栅格的索引列表
+		pass
+
+class FrameObserver(SearchObserver):
+	"""
+	把求解过程画到ax上，并把每一帧保存到result_dir中，dijkstra和astar就是通过它来保存图像的。
+	render_time和io_time分别是画图和保存帧文件用了多少秒
+	"""
+
+	def __init__(self,rsm,fig,ax,result_dir='result_pic'):
+		self.rsm = rsm
+		self.fig = fig
+		self.ax = ax
+		self.result_dir = result_dir
+		self.render_time = 0.0
+		self.io_time = 0.0
+
+	def _render(self,index,color):
+		started = perf_counter()
+		self.rsm.updateMap(self.ax,self.rsm.grid.point(index),color)
+		self.render_time += perf_counter()-started
+
+	def _save(self,filename):
+		started = perf_counter()
+		self.fig.savefig(filename)
+		self.io_time += perf_counter()-started
+
+	def start(self,grid):
+		# 检查放帧文件的目录
+		check_dir(self.result_dir)
+		started = perf_counter()
+		self.rsm.drawMap(self.ax)
+		self.render_time += perf_counter()-started
+		# 把第一张图保存为cover
+		self._save("./cover.png")
+
+	def pop(self,index):
+		self._save('./{}/{}.png'.format(self.result_dir,time()))
+
+	def expand(self,index):
+		self._render(index,"yellow") # 已经检查过的点颜色改成黄色
+
+	def finish(self,grid,path,result):
+		for index in path:
+			self._render(index,"blue") # 将起点到终点最短路上的点标记未蓝色
+			self._save('./{}/{}.png'.format(self.result_dir,time()))
+
+def _search(grid,hath=None,observer=None,queue='heap',early_exit=False):
+	"""
+	在grid上从grid.start搜索到grid.end，hath为None时就是dijkstra，否则是以hath为启发函数的astar
+
+	Args:
+		grid(GridIndex)
+		hath(function): 输入栅格索引，返回到终点的估计距离
+		observer(SearchObserver)
+		queue(str): open list的实现，'heap'或者'bucket'，见openlist模块
+		early_exit(bool): dijkstra检查到终点后是否立即结束，astar总是立即结束
+
+	Returns:
+		result(SearchResult)
+	"""
+	started = perf_counter()
+	start,end = grid.start,grid.end
+	assert start>=0 and end>=0,"maparray must contain a starting block (1) and an endpoint block (2)!"
+	grid.reset()
+	if observer is not None:
+		observer.start(grid)
+	# 只有stamp等于本次generation的cost、parent才有效，closed等于generation的栅格已经被检查过
+	workspace = grid.workspace
+	generation = workspace.generation
+	cost,parent,stamp,closed = workspace.cost,workspace.parent,workspace.stamp,workspace.closed
+	cost[start] = 0
+	parent[start] = -1
+	stamp[start] = generation
+	weight = grid.weight # None时每一步的cost都是1
+	to_be_checked_group = make_open_list(queue)
+	# 起点和终点不在同一个连通分量里时不用搜索，open list是空的，直接得到终点不可达的结果
+	if reachable(grid):
+		to_be_checked_group.push(start,hath(start) if hath else 0)
+	expanded = 0
+	while to_be_checked_group:
+		current,f = to_be_checked_group.pop() # 取出f最小的栅格，过期的冗余条目open list会自己跳过
+		if observer is not None:
+			observer.pop(current)
+		closed[current] = generation
+		expanded += 1
+		if observer is not None:
+			observer.expand(current)
+		if (hath or early_exit) and current==end:
+			# 已经找到起点到终点的最短路了，结束；不提前结束的dijkstra要把所有能到达的点都检查完
+			break
+		g = (f-hath(current) if hath else f) if weight is None else cost[current]
+		for neighbor in grid.neighbors(current):
+			gcost = g+(1 if weight is None else weight[neighbor]) # 进入neighbor的cost
+			if stamp[neighbor]!=generation or gcost < cost[neighbor]:
+				# 更新cost和parent，astar里已经检查过的点能找到更短的路时要重新检查
+				cost[neighbor] = gcost
+				parent[neighbor] = current
+				stamp[neighbor] = generation
+				closed[neighbor] = 0
+				if observer is not None:
+					observer.relax(neighbor,current,gcost)
+				if hath:
+					# f相同时h小（离终点近）的先出
+					hcost = hath(neighbor)
+					to_be_checked_group.push(neighbor,gcost+hcost,hcost)
+				else:
+					to_be_checked_group.push(neighbor,gcost)
+	# 从终点开始回溯parent，找到构成最短路的栅格
+	path = grid.path(end)
+	result = SearchResult(float(workspace.getCost(end)),grid.coords(path),expanded,to_be_checked_group.pushes,to_be_checked_group.pops,to_be_checked_group.stale,
+		peak_open=to_be_checked_group.peak)
+	if observer is not None:
+		observer.finish(grid,path,result)
+	result.search_time = perf_counter()-started
+	return result
+
+def _bidirectional(grid,astar=False,observer=None,queue='heap'):
+	"""
+	从grid.start和grid.end同时搜索，两边在中间相遇。正向的数据在grid.workspace，反向的在grid.reverse_workspace
+
+	Args:
+		grid(GridIndex)
+		astar(bool): False为双向dijkstra，True为两边分别以对方的起点为目标的双向astar
+		observer(SearchObserver)
+		queue(str): 'heap'或'bucket'
+
+	Returns:
+		result(SearchResult)
+	"""
+	started = perf_counter()
+	start,end = grid.start,grid.end
+	assert start>=0 and end>=0,"maparray must contain a starting block (1) and an endpoint block (2)!"
+	grid.reset()
+	grid.reverse_workspace.reset()
+	if observer is not None:
+		observer.start(grid)
+	weight = grid.weight
+	connected = reachable(grid) # 起点和终点不在同一个连通分量里时两边都不用搜索
+	sides = []
+	for origin,target,workspace in ((start,end,grid.workspace),(end,start,grid.reverse_workspace)):
+		hath = _manhattan(grid,target) if astar else (lambda index:0)
+		workspace.cost[origin] = 0
+		workspace.parent[origin] = -1
+		workspace.stamp[origin] = workspace.generation
+		open_list = make_open_list(queue)
+		if connected:
+			open_list.push(origin,hath(origin))
+		sides.append((workspace,hath,open_list))
+	best,meet = inf,-1 # 目前找到的最短路长度和相遇的栅格
+	if start==end:
+		# 两边一开始就在同一个栅格相遇，不用搜索
+		best,meet = 0.0,start
+	expanded = 0
+	while sides[0][2] and sides[1][2]:
+		forward_top,backward_top = sides[0][2].peek()[1],sides[1][2].peek()[1]
+		# 停止条件：dijkstra是两边堆顶之和不小于best；启发函数一致时astar只要有一边的堆顶f不小于best
+		if (max(forward_top,backward_top) if astar else forward_top+backward_top)>=best:
+			break
+		# 每次扩展open list较小的那一边
+		side = 0 if len(sides[0][2])<=len(sides[1][2]) else 1
+		(workspace,hath,open_list),other = sides[side],sides[1-side][0]
+		current,f = open_list.pop()
+		if observer is not None:
+			observer.pop(current)
+		workspace.closed[current] = workspace.generation
+		expanded += 1
+		if observer is not None:
+			observer.expand(current)
+		g = f-hath(current) if weight is None else workspace.cost[current]
+		for neighbor in grid.neighbors(current):
+			# 正向是从current进入neighbor，反向对应原图中从neighbor进入current
+			gcost = g+(1 if weight is None else weight[neighbor if side==0 else current])
+			if workspace.stamp[neighbor]!=workspace.generation or gcost<workspace.cost[neighbor]:
+				workspace.cost[neighbor] = gcost
+				workspace.parent[neighbor] = current
+				workspace.stamp[neighbor] = workspace.generation
+				workspace.closed[neighbor] = 0
+				if observer is not None:
+					observer.relax(neighbor,current,gcost)
+				hcost = hath(neighbor)
+				open_list.push(neighbor,gcost+hcost,hcost)
+			if other.stamp[neighbor]==other.generation and gcost+other.cost[neighbor]<best:
+				# 另一边也到过neighbor，经过它的一条路
+				best,meet = float(gcost+other.cost[neighbor]),neighbor
+	if meet<0:
+		path = []
+	else:
+		path = grid.workspace.path(meet)+grid.reverse_workspace.path(meet)[::-1][1:]
+	result = SearchResult(best,grid.coords(path),expanded,sides[0][2].pushes+sides[1][2].pushes,sides[0][2].pops+sides[1][2].pops,sides[0][2].stale+sides[1][2].stale,
+		peak_open=sides[0][2].peak+sides[1][2].peak)
+	if observer is not None:
+		observer.finish(grid,path,result)
+	result.search_time = perf_counter()-started
+	return result
+
+def _manhattan(grid,target=None):
+	# 因为咱们规定只能上下左右移动，所以曼哈顿距离一定满足 \hat{h} \le h.所以咱们的h就用曼哈顿距离估计了
+	# 带权栅格图上每一步至少要花min_weight，曼哈顿距离乘上min_weight仍然满足 \hat{h} \le h
+	end_x,end_y = grid.coord(grid.end if target is None else target)
+	ncols = grid.ncols
+	if grid.weight is not None:
+		scale = grid.min_weight
+		def hath(index):
+			x,y = divmod(index,ncols)
+			return scale*(abs(x-end_x)+abs(y-end_y))
+		return hath
+	def hath(index):
+		x,y = divmod(index,ncols)
+		return abs(x-end_x)+abs(y-end_y)
+	return hath
+
+def _grid(maparray,costarray=None):
+	return as_grid(maparray,costarray)
+
+def solve_dijkstra(maparray,observer=None,queue='heap',early_exit=False,costarray=None):
+	"""
+	不画图、不保存文件的dijkstra算法
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex，对同一个GridIndex重复求解不会再分配数组
+		observer(SearchObserver): 可选，需要观察求解过程时传入
+		queue(str): 'heap'为二叉堆，'bucket'为O(1)的桶队列
+		early_exit(bool): 为True时检查到终点就结束，不再把所有能到达的栅格都检查完
+		costarray(ndarray): 可选，和maparray形状相同，每个栅格的进入cost，不传入时每一步的cost都是1
+
+	Returns:
+		result(SearchResult)
+	"""
+	return _search(_grid(maparray,costarray),observer=observer,queue=queue,early_exit=early_exit)
+
+def solve_astar(maparray,observer=None,queue='heap',costarray=None):
+	"""
+	不画图、不保存文件的astar算法
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex，对同一个GridIndex重复求解不会再分配数组
+		observer(SearchObserver): 可选，需要观察求解过程时传入
+		queue(str): 'heap'为二叉堆，'bucket'为O(1)的桶队列
+		costarray(ndarray): 可选，和maparray形状相同，每个栅格的进入cost，不传入时每一步的cost都是1
+
+	Returns:
+		result(SearchResult)
+	"""
+	grid = _grid(maparray,costarray)
+	return _search(grid,hath=_manhattan(grid),observer=observer,queue=queue)
+
+def solve_bidirectional_dijkstra(maparray,observer=None,queue='heap',costarray=None):
+	"""
+	不画图、不保存文件的双向dijkstra算法，从起点和终点同时搜索，相遇后就结束
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex
+		observer(SearchObserver): 可选，两边扩展的栅格都会通知observer
+		queue(str): 'heap'或'bucket'
+		costarray(ndarray): 可选，和maparray形状相同，每个栅格的进入cost，不传入时每一步的cost都是1
+
+	Returns:
+		result(SearchResult)
+	"""
+	return _bidirectional(_grid(maparray,costarray),astar=False,observer=observer,queue=queue)
+
+def solve_bidirectional_astar(maparray,observer=None,queue='heap',costarray=None):
+	"""
+	不画图、不保存文件的双向astar算法，两边都用到对方出发点的曼哈顿距离作为启发函数
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex
+		observer(SearchObserver): 可选，两边扩展的栅格都会通知observer
+		queue(str): 'heap'或'bucket'
+		costarray(ndarray): 可选，和maparray形状相同，每个栅格的进入cost，不传入时每一步的cost都是1
+
+	Returns:
+		result(SearchResult)
+	"""
+	return _bidirectional(_grid(maparray,costarray),astar=True,observer=observer,queue=queue)
+
+def dijkstra(maparray,fig,ax,result_dir='result_pic',costarray=None):
 	"""
 	dijkstra算法在栅格图上求解最短路，同时对应的更新rastermap并保存图像
 
@@ -19,83 +356,18 @@ def dijkstra(maparray,fig,ax,result_dir='result_pic'):
 		maparray(ndarray)
 		fig(Figure)
 		ax(Axes)
+		costarray(ndarray): 可选，每个栅格的进入cost
 	
 	Returns:
 		shortest_path_len(float)
 	"""
-	# 检查放帧文件的目录
-	check_dir(result_dir)
-	# 创建raster map
 	rsm = RasterMap()
-	start_point,end_point,obstacle_point_group,all_point_group = rsm.buildMap(maparray) # 转换为Point和PointGroup对象
-	rsm.drawMap(ax)
-	# 把第一张图保存为cover
-	fig.savefig("./cover.png")
-	# 算法部分
-	inf = float('inf')
-	# 初始化cost和parent
-	for point in all_point_group:
-		if point is start_point:
-			point.cost = 0
-		else:
-			point.cost = inf
-		point.parent = None
-	to_be_checked_group = PointGroupOrdered("将被检查的节点集合")
-	to_be_checked_group.push(start_point)
-	already_checked_group = PointGroup("已经被检查的节点的集合")
-	while to_be_checked_group:
-		print(to_be_checked_group)
-		fig.savefig('./{}/{}.png'.format(result_dir,time()))
-		current_point = to_be_checked_group.pop() # 取出来cost最小的节点，这个节点已经找到最短路了
-		if current_point in already_checked_group:
-			# current_point里面可能有冗余，在already_checked_group里面的一定是以及找到最短路的点，并且以及访问过它的邻居节点，直接跳过
-			continue
-		already_checked_group.append(current_point)
-		rsm.updateMap(ax,current_point,"yellow") # 已经找到起点到该点最短路的点颜色改成黄色
-		# 上下左右四个方向的邻居
-		neighbor_top = all_point_group.getPoint(current_point.x,current_point.y+1)
-		neighbor_bottom = all_point_group.getPoint(current_point.x,current_point.y-1)
-		neighbor_left = all_point_group.getPoint(current_point.x-1,current_point.y)
-		neighbor_right = all_point_group.getPoint(current_point.x+1,current_point.y)
-		# 对邻居进行更新
-		if neighbor_top and (neighbor_top not in obstacle_point_group) and (neighbor_top not in already_checked_group):
-			if current_point.cost+1 < neighbor_top.cost:
-				neighbor_top.cost = current_point.cost+1
-				neighbor_top.parent = current_point
-			to_be_checked_group.push(neighbor_top)
-		if neighbor_bottom and (neighbor_bottom not in obstacle_point_group) and (neighbor_bottom not in already_checked_group):
-			if current_point.cost+1 < neighbor_bottom.cost:
-				neighbor_bottom.cost = current_point.cost+1
-				neighbor_bottom.parent = current_point
-			to_be_checked_group.push(neighbor_bottom)
-		if neighbor_left and (neighbor_left not in obstacle_point_group) and (neighbor_left not in already_checked_group):
-			if current_point.cost+1 < neighbor_left.cost:
-				neighbor_left.cost = current_point.cost+1
-				neighbor_left.parent = current_point
-			to_be_checked_group.push(neighbor_left)
-		if neighbor_right and (neighbor_right not in obstacle_point_group) and (neighbor_right not in already_checked_group):
-			if current_point.cost+1 < neighbor_right.cost:
-				neighbor_right.cost = current_point.cost+1
-				neighbor_right.parent = current_point
-			to_be_checked_group.push(neighbor_right)
-	# 从end_point开始回溯parent，找到构成最短路的节点的集合
-	shortest_path = PointGroup("构成最短路的节点集合")
-	shortest_path.insert(0,end_point)
-	flag = False
-	while True:
-		shortest_path.insert(0,shortest_path[0].parent)
-		if flag:
-			# 已经把起点加进去了
-			break
-		if shortest_path[0].parent is start_point:
-			flag = True
-	for point in shortest_path:
-		rsm.updateMap(ax,point,"blue") # 将起点到终点最短路上的点标记未蓝色
-		fig.savefig('./{}/{}.png'.format(result_dir,time()))
-	print("end_point.cost={}".format(end_point.cost))
-	return end_point.cost
+	rsm.buildMap(maparray,costarray) # 转换为Point和PointGroup对象，画图时要用到
+	result = _search(rsm.grid,observer=FrameObserver(rsm,fig,ax,result_dir))
+	print("end_point.cost={}".format(result.cost))
+	return result.cost
 
-def astar(maparray,fig,ax,result_dir='result_pic'):
+def astar(maparray,fig,ax,result_dir='result_pic',costarray=None):
 	"""
 	astar算法在栅格图上求解最短路，同时对应的更新rastermap并保存图像
 
@@ -103,107 +375,15 @@ def astar(maparray,fig,ax,result_dir='result_pic'):
 		maparray(ndarray)
 		fig(Figure)
 		ax(Axes)
+		costarray(ndarray): 可选，每个栅格的进入cost
 	
 	Returns:
 		shortest_path_len(float)
 	"""
-	check_dir(result_dir)
 	rsm = RasterMap()
-	start_point,end_point,obstacle_point_group,all_point_group = rsm.buildMap(maparray) # 转换为Point和PointGroup对象
-	rsm.drawMap(ax)
-	# 把第一张图保存为cover
-	fig.savefig("./cover.png")
-	# 算法部分
-	# 因为咱们规定只能上下左右移动，所以曼哈顿距离一定满足 \hat{h} \le h.所以咱们的h就用曼哈顿距离估计了
-	hath = lambda point:abs(point.x-end_point.x)+abs(point.y-end_point.y) 
-	# 先给每个Point对象新增gcost和hcost属性,再初始化
-	inf = float('inf')
-	for point in all_point_group:
-		if point is start_point:
-			point.gcost = 0
-		elif point is end_point:
-			point.gcost = inf
-		else:
-			point.gcost = inf
-		point.hcost = hath(point)
-		point.cost = point.gcost+point.hcost
-		point.parent = None
-	to_be_checked_group = PointGroupOrdered("将被检查的节点集合")
-	to_be_checked_group.push(start_point)
-	# a star中再already_checked_group里不一定保证以及找到了从起点到该点的最短路，当能找到更短时还得重新提到to_be_checked_group中去。
-	# already_checked_group再a star中只起到跳过to_be_checked_group点的作用
-	already_checked_group = PointGroup("已经被检查的节点的集合") 
-	while to_be_checked_group:
-		print(to_be_checked_group,"不能反应算法合适结束，因为算法可能通过if条件提前终止!")
-		fig.savefig('./{}/{}.png'.format(result_dir,time()))
-		current_point = to_be_checked_group.pop() # 取出f最小也就是cost最小的点
-		if current_point in already_checked_group:
-			# current_point里面可能有冗余，在already_checked_group里面的一定是以及找到最短路的点，并且以及访问过它的邻居节点，直接跳过
-			continue
-		already_checked_group.append(current_point)
-		rsm.updateMap(ax,current_point,"yellow")
-		# 已经找到起点到终点的最短路了，结束
-		if current_point is end_point:
-			# 从end_point开始回溯parent，找到构成最短路的节点的集合
-			shortest_path = PointGroup("构成最短路的节点集合")
-			shortest_path.insert(0,end_point)
-			flag = False
-			while True:
-				shortest_path.insert(0,shortest_path[0].parent)
-				if flag:
-					# 已经把起点加进去了
-					break
-				if shortest_path[0].parent is start_point:
-					flag = True
-			for point in shortest_path:
-				rsm.updateMap(ax,point,"blue") # 将起点到终点最短路上的点标记未蓝色
-				fig.savefig('./{}/{}.png'.format(result_dir,time()))
-			print("end_point.cost={}".format(end_point.cost))
-			return end_point.cost
-		# 上下左右四个方向的邻居
-		neighbor_top = all_point_group.getPoint(current_point.x,current_point.y+1)
-		neighbor_bottom = all_point_group.getPoint(current_point.x,current_point.y-1)
-		neighbor_left = all_point_group.getPoint(current_point.x-1,current_point.y)
-		neighbor_right = all_point_group.getPoint(current_point.x+1,current_point.y)
-		# 更新邻居,注意看这块条件和dijkstar的区别
-		if neighbor_top and (neighbor_top not in obstacle_point_group):
-			# 更新gcost和parent
-			if current_point.gcost+1<neighbor_top.gcost:
-				neighbor_top.gcost = current_point.gcost+1
-				neighbor_top.parent = current_point
-			if (neighbor_top in already_checked_group) and (neighbor_top.gcost+neighbor_top.hcost < neighbor_top.cost):
-				# 把neibor_top从already_checked_group中删除来
-				already_checked_group.delPoint(neighbor_top.x,neighbor_top.y)
-			neighbor_top.cost = neighbor_top.gcost+neighbor_top.hcost
-			if neighbor_top not in already_checked_group:
-				to_be_checked_group.push(neighbor_top)
-		if neighbor_bottom and (neighbor_bottom not in obstacle_point_group):
-			if current_point.gcost+1<neighbor_bottom.gcost:
-				neighbor_bottom.gcost = current_point.gcost+1
-				neighbor_bottom.parent = current_point
-			if (neighbor_bottom in already_checked_group) and (neighbor_bottom.gcost+neighbor_bottom.hcost)<neighbor_bottom.cost:
-				already_checked_group.delPoint(neighbor_bottom.x,neighbor_bottom.y)
-			neighbor_bottom.cost = neighbor_bottom.gcost+neighbor_bottom.hcost
-			if neighbor_bottom not in already_checked_group:
-				to_be_checked_group.push(neighbor_bottom)
-		if neighbor_left and (neighbor_left not in obstacle_point_group):
-			if current_point.gcost+1<neighbor_left.gcost:
-				neighbor_left.gcost = current_point.gcost+1
-				neighbor_left.parent = current_point
-			if (neighbor_left in already_checked_group) and (neighbor_left.gcost+neighbor_left.hcost)<neighbor_left.cost:
-				already_checked_group.delPoint(neighbor_left.x,neighbor_left.y)
-			neighbor_left.cost = neighbor_left.gcost+neighbor_left.hcost
-			if neighbor_left not in already_checked_group:
-				to_be_checked_group.push(neighbor_left)
-		if neighbor_right and (neighbor_right not in obstacle_point_group):
-			if current_point.gcost+1<neighbor_right.gcost:
-				neighbor_right.gcost = current_point.gcost+1
-				neighbor_right.parent = current_point
-			if (neighbor_right in already_checked_group) and (neighbor_right.gcost+neighbor_right.hcost)<neighbor_right.cost:
-				already_checked_group.delPoint(neighbor_right.x,neighbor_right.y)
-			neighbor_right.cost = neighbor_right.gcost+neighbor_right.hcost
-			if neighbor_right not in already_checked_group:
-				to_be_checked_group.push(neighbor_right) 
-		# 未来优化：这里打断类似结构的if实际上可单独写个函数，方便复用。
-
-__all__ = ['dijkstra','astar']
+	rsm.buildMap(maparray,costarray) # 转换为Point和PointGroup对象，画图时要用到
+	result = _search(rsm.grid,hath=_manhattan(rsm.grid),observer=FrameObserver(rsm,fig,ax,result_dir))
+	print("end_point.cost={}".format(result.cost))
+	return result.cost
+
+__all__ = ['SearchResult','SearchObserver','FrameObserver','solve_dijkstra','solve_astar','solve_bidirectional_dijkstra','solve_bidirectional_astar','dijkstra','astar']
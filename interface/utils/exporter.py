@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 19:37:45
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块把TraceRecorder记录的Trace直接导出为动画，不经过matplotlib，也不产生中间的帧图像文件。
+
+- 帧数预算：搜索很长时不再每一步一帧，而是把相邻的若干步合并成一帧，总帧数不超过预算（或目标时长x帧率），
+  画最短路的那几步单独分配一部分预算，保证最短路一格一格画出来的过程不会被合并掉；
+- 并行渲染：选出来的帧按顺序分成几段交给进程池，每段只重建一次起始状态，之后每帧只叠加中间的事件；
+- 帧直接画成调色板图像（每个像素是颜色表中的序号），Pillow写gif时不需要再做颜色量化；
+- 边画边写：画好的帧通过生成器交给Pillow（或ffmpeg），同一时间只有几段帧在内存中，内存占用和总帧数无关。
+  Pillow写apng时要把append_images遍历两遍，所以apng仍然先把所有帧画出来。
+gif和apng由Pillow写出，mp4需要系统中能找到ffmpeg。
+
+Usage:
+from utils.exporter import export_trace
+export_trace(recorder.trace,'astar.gif',frame_budget=300)
+export_trace(recorder.trace,'astar.png',duration=10) # apng，大约10秒
+"""
+
+from multiprocessing import Pool,cpu_count
+from math import ceil
+from shutil import which
+from subprocess import Popen,PIPE
+from numpy import concatenate,flatnonzero,full,linspace,searchsorted,unique,asarray,uint8
+from PIL import Image
+from .tracerecorder import PATH,EXPANDED,TraceReplay
+
+GRID_COLOR = (128,128,128) # 栅格之间的边框颜色，对应EDGECOLOR='gray'
+LAST_FRAME_HOLD = 1000 # 最后一帧多停留的毫秒数
+PARALLEL_PIXELS = 2*10**7 # 所有帧的像素总数超过它时才启动进程池
+CHUNK_FRAMES = 64 # 每一段最多多少帧，内存中最多同时有进程数这么多段
+
+def select_steps(trace,budget=None):
+	"""
+	选出要画成帧的步，返回从小到大排列的步序号数组。最后一步总是被选中
+
+	Args:
+		trace(Trace)
+		budget(int): 帧数上限，None时每一步都是一帧。画最短路的步最多占四分之一的预算，其余的留给搜索过程
+	"""
+	total = len(trace)
+	if budget is None or total<=budget:
+		return asarray(range(total))
+	assert budget>=2,"The frame budget must be at least 2!"
+	events = trace.events
+	path_steps = events['step'][events['state']==PATH]
+	search_end = int(path_steps[0])-1 if path_steps.size else total-1
+	path_budget = min(path_steps.size,budget//4)
+	# 最短路一帧都分不到时，最后一步要占掉搜索过程的一帧
+	search = linspace(0,search_end,budget-path_budget-(path_budget==0 and search_end<total-1)).round()
+	path = linspace(total-1,search_end+1,path_budget).round() if path_budget else [] # 只有一帧时也要落在最后一步
+	return unique(concatenate((search,path,[total-1])).astype(int))
+
+class FrameRenderer:
+	"""
+	把Trace的某一步画成调色板图像的序号数组，每个栅格cell_size x cell_size个像素，栅格之间有1像素的边框，
+	上方是y最大的一行，和RasterMap的方向一致
+	"""
+
+	def __init__(self,trace,cell_size):
+		self.replay = TraceReplay(trace)
+		self.cell_size = cell_size
+		# 调色板：叠加状态*4+底色，最后一个是边框
+		colors = self.replay._palette.reshape(-1,3).tolist()
+		self.grid_index = len(colors)
+		self.palette = [value for color in colors+[list(GRID_COLOR)] for value in color]
+
+	def size(self):
+		# 图像的(宽,高)
+		nrows,ncols = self.replay.trace.shape
+		return nrows*self.cell_size+1,ncols*self.cell_size+1
+
+	def _indexed(self,state):
+		overlay = (state>=EXPANDED).astype(uint8)+(state==PATH)
+		nrows,ncols = self.replay.trace.shape
+		cells = (overlay*4+self.replay.trace.state).reshape(nrows,ncols).T[::-1] # 第0行是y最大的一行
+		cell = self.cell_size
+		width,height = self.size()
+		image = full((height,width),self.grid_index,dtype=uint8)
+		image[:-1,:-1] = cells.repeat(cell,0).repeat(cell,1)
+		if cell>=3:
+			image[::cell,:] = self.grid_index
+			image[:,::cell] = self.grid_index
+		return image
+
+	def render(self,steps):
+		"""
+		依次画出steps中的每一步，steps从小到大排列，只在开头重建一次状态
+		"""
+		state = self.replay.frame(steps[0])
+		frames = [self._indexed(state)]
+		for previous,step in zip(steps,steps[1:]):
+			frames.append(self._indexed(self.replay.advance(state,previous,step)))
+		return frames
+
+_renderer = None # 工作进程中的FrameRenderer
+
+def _init_worker(trace,cell_size):
+	global _renderer
+	_renderer = FrameRenderer(trace,cell_size)
+
+def _render_chunk(steps):
+	return _renderer.render(steps)
+
+def _write_mp4(frames,palette,size,filename,FPS,hold=0):
+	ffmpeg = which('ffmpeg')
+	if ffmpeg is None:
+		raise RuntimeError("Exporting mp4 needs ffmpeg on PATH, use .gif or .png instead")
+	colors = asarray(palette,dtype=uint8).reshape(-1,3)
+	command = [ffmpeg,'-y','-loglevel','error','-f','rawvideo','-pix_fmt','rgb24','-s','{}x{}'.format(*size),'-r','{:.6g}'.format(FPS),'-i','-',
+		'-vf','pad=ceil(iw/2)*2:ceil(ih/2)*2','-pix_fmt','yuv420p',filename]
+	process = Popen(command,stdin=PIPE)
+	try:
+		for frame in frames:
+			process.stdin.write(colors[frame].tobytes())
+		# mp4没有单独的帧时长，最后一帧重复hold次来停留
+		for _ in range(hold):
+			process.stdin.write(colors[frame].tobytes())
+	finally:
+		process.stdin.close()
+	if process.wait()!=0:
+		raise RuntimeError("ffmpeg failed to write {}".format(filename))
+
+def export_trace(trace,filename,frame_budget=None,duration=None,FPS=24,cell_size=None,max_size=600,processes=None,progress=None):
+	"""
+	把Trace导出为动画，格式由filename的后缀决定：.gif、.png（apng）或.mp4
+
+	Args:
+		trace(Trace)
+		filename(str)
+		frame_budget(int): 帧数上限，超出时合并相邻的步
+		duration(float): 目标时长（秒），帧数上限取duration*FPS，帧数不够时每帧显示得更久（mp4降低帧率）
+		FPS(int): 每秒帧数，给了duration时是最高帧率
+		cell_size(int): 每个栅格的边长（像素），默认让图像的长边不超过max_size
+		processes(int): 进程数，默认在帧很多时使用所有CPU
+		progress(function): 可选，每画好一段帧调用一次progress(已经画好的帧数,总帧数)，在里面抛出异常可以中止
+
+	Returns:
+		frames(int): 写出的帧数
+	"""
+	budget = frame_budget
+	if duration is not None:
+		budget = min(budget or float('inf'),max(int(duration*FPS),2))
+	steps = select_steps(trace,budget).tolist()
+	if cell_size is None:
+		cell_size = max(1,(max_size-1)//max(trace.shape))
+	renderer = FrameRenderer(trace,cell_size)
+	width,height = renderer.size()
+	if processes is None:
+		processes = cpu_count() if len(steps)*width*height>PARALLEL_PIXELS else 1
+	# 按顺序分段，每个进程至少分到4段，方便报告进度；每段不超过CHUNK_FRAMES帧
+	count = max(1,min(len(steps),max(processes*4,ceil(len(steps)/CHUNK_FRAMES))))
+	bounds = linspace(0,len(steps),count+1).round().astype(int)
+	tasks = [steps[begin:end] for begin,end in zip(bounds,bounds[1:]) if end>begin]
+
+	def chunks():
+		if processes==1:
+			yield from map(renderer.render,tasks)
+			return
+		# 进程池每次只画进程数这么多段，写得慢时画好的帧不会堆积在内存中
+		with Pool(processes,initializer=_init_worker,initargs=(trace,cell_size)) as pool:
+			for window in range(0,len(tasks),processes):
+				yield from pool.imap(_render_chunk,tasks[window:window+processes])
+
+	def frames():
+		# 按顺序产生画好的帧
+		done = 0
+		for chunk in chunks():
+			done += len(chunk)
+			if progress is not None:
+				progress(done,len(steps))
+			yield from chunk
+
+	def images():
+		for frame in frames():
+			image = Image.fromarray(frame,mode='P')
+			image.putpalette(renderer.palette)
+			yield image
+
+	interval = 1000/FPS if duration is None else max(1000*duration/len(steps),1000/FPS)
+	if filename.lower().endswith('.mp4'):
+		# 帧率由每帧的显示时长决定，给了duration时视频大约就是这么长
+		stream = frames()
+		try:
+			_write_mp4(stream,renderer.palette,(width,height),filename,1000/interval,hold=round(LAST_FRAME_HOLD/interval))
+		finally:
+			stream.close() # 中途出错时也要关掉进程池
+		return len(steps)
+	durations = [round(interval)]*len(steps)
+	durations[-1] += LAST_FRAME_HOLD
+	stream = images()
+	try:
+		first = next(stream)
+		# Pillow写apng时先遍历一遍append_images检查尺寸和模式，生成器会被耗尽，只能传列表
+		rest = list(stream) if filename.lower().endswith('.png') else stream
+		first.save(filename,save_all=True,append_images=rest,duration=durations,loop=0)
+	finally:
+		stream.close()
+	return len(steps)
+
+__all__ = ['select_steps','FrameRenderer','export_trace']
@@ -43,7 +43,7 @@ def generate_gif(result_dir,output_name,fig,ax,FPS=24,DPI=100):
 	"""
 	ax.axis('off')  # 关闭坐标轴，因为是展示图片，所以关闭刻度用处不大
 	frame_files = sorted([f for f in listdir(result_dir) if f.endswith('.png')], 
-                    key=lambda x: int(x.split('.')[0])) # 按顺序读取每一帧文件的文件名
+                    key=lambda x: float(x[:-len('.png')])) # 按顺序读取每一帧文件的文件名（文件名是time()的浮点数，同一秒内的帧也要分开）
 	first_frame = Image.open(join(result_dir,frame_files[0])) # 将第一帧率图片读取为Image类对象，这个对象有__array__方法可以转换为数组
 	im = ax.imshow(array(first_frame), animated=True) # 现在ax上把第一帧画出来
 	# 创建动画
@@ -60,4 +60,55 @@ def generate_gif(result_dir,output_name,fig,ax,FPS=24,DPI=100):
 	ani.save(output_name+'.gif', writer=writer, dpi=DPI)
 	print("动画已保存至: {}".format(output_name+'.gif'))
 
-__all__ = ['check_dir','generate_gif']
\ No newline at end of file
+def draw_trace_frame(ax,frame):
+	"""
+	在ax上画出TraceReplay.render得到的一帧（形状为(ncols,nrows,3)），返回对应的AxesImage，之后的帧用set_data更新即可
+	"""
+	ncols,nrows = frame.shape[:2]
+	ax.set_xlim([0,nrows])
+	ax.set_ylim([0,ncols])
+	ax.set_xticks([])
+	ax.set_yticks([])
+	im = ax.imshow(frame,origin='lower',extent=(0,nrows,0,ncols),interpolation='nearest',animated=True)
+	# 栅格之间的灰色边框
+	ax.vlines(range(nrows+1),0,ncols,colors='gray',linewidth=0.5)
+	ax.hlines(range(ncols+1),0,nrows,colors='gray',linewidth=0.5)
+	return im
+
+def _update_trace(frame,im,replay):
+	# 帧是按顺序要的，seek只需要在上一帧的基础上叠加这一帧的事件
+	im.set_data(replay.image(replay.seek(frame)))
+	return im,
+
+def generate_gif_from_trace(trace,output_name,fig,ax,FPS=24,DPI=100,progress=None):
+	"""
+	不需要帧图像文件，直接根据tracerecorder记录的Trace逐帧重建栅格图并组合成gif
+
+	Args:
+		trace(Trace)：TraceRecorder记录的事件轨迹
+		output_name(str)：生成的gif图像的名称
+		FPS：每秒帧数
+		DPI：清晰度
+		ax: 指定的axes对象
+		fig: 指定的fig对象
+		progress(function)：可选，每写一帧之前调用一次progress(已经写好的帧数,总帧数)，全部写完后再调用一次，
+			已经写好至少一帧时可以在里面抛出异常中止
+	"""
+	from .tracerecorder import TraceReplay # tracerecorder依赖easypathfinder，放在这里导入避免循环导入
+	replay = TraceReplay(trace)
+	im = draw_trace_frame(ax,replay.render(0))
+	ani = FuncAnimation(
+	    fig, 
+	    partial(_update_trace,im=im,replay=replay), 
+	    frames=len(replay),
+	    interval=1000/FPS,
+	    blit=True,
+	    repeat=True,
+	)
+	writer = PillowWriter(fps=FPS)
+	ani.save(output_name+'.gif', writer=writer, dpi=DPI, progress_callback=progress)
+	if progress is not None:
+		progress(len(replay),len(replay))
+	print("动画已保存至: {}".format(output_name+'.gif'))
+
+__all__ = ['check_dir','generate_gif','draw_trace_frame','generate_gif_from_trace']
\ No newline at end of file
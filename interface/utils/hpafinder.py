@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 15:40:12
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了分层寻路（HPA*，Hierarchical Path-Finding A*），用于很大的栅格图。
+
+预处理（HPAGraph.build）只和maparray有关，做一次就可以反复查询，也可以保存为.npz文件：
+- 把栅格图切成cluster_size x cluster_size的簇；
+- 相邻两个簇的边界上，两边都能通行的连续栅格构成一个入口，入口较短时在中间放一个过渡点，较长时在两端各放一个，
+  过渡点两边的栅格都是抽象图的节点，它们之间连一条边；
+- 同一个簇内的节点两两之间只在簇内的最短路长度作为边的cost。
+查询时先把起点和终点连到它们所在簇的节点上，在抽象图上做astar，再把抽象路径上的每条簇内边在簇内展开成栅格路径。
+
+得到的路径总是可行的，但入口只取了少数过渡点，所以可能比真正的最短路略长，差距见benchmark.hpa_benchmark。
+
+Usage:
+from utils.hpafinder import solve_hpa
+result = solve_hpa(maparray,cluster_size=16)
+"""
+
+from collections import OrderedDict
+from heapq import heappush,heappop
+from time import perf_counter
+from numpy import arange,argsort,asarray,concatenate,flatnonzero,full,load,lexsort,ones,savez_compressed,searchsorted,zeros,inf,float64,int32,int64
+from .openlist import make_open_list
+from .connectivity import as_grid,reachable
+from .easypathfinder import SearchResult
+
+MIN_SPLIT = 6 # 入口长度不小于它时在两端各放一个过渡点，否则在中间放一个
+
+class HPAGraph:
+	"""
+	HPA*的抽象图。nodes是节点在GridIndex中的索引，按所在的簇排好序，第c个簇的节点是nodes[cluster_ptr[c]:cluster_ptr[c+1]]；
+	边以CSR的形式保存，节点i的出边指向targets[indptr[i]:indptr[i+1]]，对应的cost为costs[indptr[i]:indptr[i+1]]。
+	带权的栅格图上进入栅格的cost算在被进入的栅格上，所以边是有方向的。
+	"""
+
+	def __init__(self,shape,cluster_size,fingerprint,nodes,cluster_ptr,indptr,targets,costs):
+		self.shape = tuple(int(n) for n in shape)
+		self.nrows,self.ncols = self.shape
+		self.cluster_size = int(cluster_size)
+		self.fingerprint = str(fingerprint)
+		self.nodes = asarray(nodes,dtype=int64)
+		self.cluster_ptr = asarray(cluster_ptr,dtype=int64)
+		self.indptr = asarray(indptr,dtype=int64)
+		self.targets = asarray(targets,dtype=int32)
+		self.costs = asarray(costs,dtype=float64)
+		self._node_id = dict(zip(self.nodes.tolist(),range(self.nodes.size)))
+		self.cluster_columns = -(-self.ncols//self.cluster_size)
+
+	def __len__(self):
+		return self.nodes.size
+
+	def __str__(self):
+		return "<HPAGraph of a {}x{} map with {} nodes and {} edges>".format(*self.shape,len(self),self.targets.size)
+
+	def cluster(self,index):
+		# 栅格所在簇的编号
+		x,y = divmod(index,self.ncols)
+		return x//self.cluster_size*self.cluster_columns+y//self.cluster_size
+
+	def bounds(self,cluster):
+		# 簇的范围(x0,x1,y0,y1)，x0<=x<x1，y0<=y<y1
+		x0 = cluster//self.cluster_columns*self.cluster_size
+		y0 = cluster%self.cluster_columns*self.cluster_size
+		return x0,min(x0+self.cluster_size,self.nrows),y0,min(y0+self.cluster_size,self.ncols)
+
+	def clusterNodes(self,cluster):
+		return self.nodes[self.cluster_ptr[cluster]:self.cluster_ptr[cluster+1]]
+
+	def edges(self,index):
+		# 节点index的出边，返回(目标节点的索引列表,cost列表)
+		node = self._node_id.get(index)
+		if node is None:
+			return [],[]
+		begin,end = self.indptr[node],self.indptr[node+1]
+		return self.nodes[self.targets[begin:end]].tolist(),self.costs[begin:end].tolist()
+
+	@classmethod
+	def build(cls,grid,cluster_size=16):
+		"""
+		在grid上划分簇、找出入口并计算簇内节点之间的距离
+		"""
+		assert cluster_size>=2,"cluster_size must be at least 2!"
+		nrows,ncols = grid.shape
+		state = grid.state.reshape(nrows,ncols)
+		weight = ones(nrows*ncols) if grid.weight is None else grid.weight
+		# 相邻两个簇之间的边
+		sources,targets,costs = [],[],[]
+		for axis in (0,1):
+			inside,outside = _transitions(state,cluster_size,axis)
+			sources += [inside,outside]
+			targets += [outside,inside]
+			costs += [weight[outside],weight[inside]]
+		inter = concatenate(sources),concatenate(targets),concatenate(costs).astype(float64)
+		graph = cls(grid.shape,cluster_size,grid.fingerprint(),zeros(0),zeros(1),zeros(1),zeros(0),zeros(0)) # 只用来算簇的编号和范围
+		nodes = asarray(sorted(set(inter[0].tolist())),dtype=int64)
+		clusters = graph.cluster(nodes)
+		order = lexsort((nodes,clusters))
+		nodes,clusters = nodes[order],clusters[order]
+		nclusters = -(-nrows//cluster_size)*graph.cluster_columns
+		cluster_ptr = searchsorted(clusters,arange(nclusters+1))
+		# 同一个簇内的节点两两之间的边
+		sources,targets,costs = [inter[0]],[inter[1]],[inter[2]]
+		for cluster in flatnonzero(cluster_ptr[1:]-cluster_ptr[:-1]>1).tolist():
+			members = nodes[cluster_ptr[cluster]:cluster_ptr[cluster+1]]
+			x0,x1,y0,y1 = bounds = graph.bounds(cluster)
+			x,y = divmod(members,ncols)
+			distance = _cluster_distances(grid,bounds,members)[:,x-x0,y-y0]
+			source,target = (distance<inf).nonzero()
+			keep = source!=target
+			sources.append(members[source[keep]])
+			targets.append(members[target[keep]])
+			costs.append(distance[source[keep],target[keep]])
+		sources,targets,costs = concatenate(sources),concatenate(targets),concatenate(costs)
+		# 索引换成节点编号，再按出发的节点排序得到CSR
+		order = argsort(nodes)
+		source_ids = order[searchsorted(nodes,sources,sorter=order)]
+		target_ids = order[searchsorted(nodes,targets,sorter=order)]
+		edge_order = argsort(source_ids,kind='stable')
+		indptr = searchsorted(source_ids[edge_order],arange(nodes.size+1))
+		return cls(grid.shape,cluster_size,grid.fingerprint(),nodes,cluster_ptr,indptr,target_ids[edge_order],costs[edge_order])
+
+	def save(self,filename):
+		savez_compressed(filename,shape=asarray(self.shape),cluster_size=self.cluster_size,fingerprint=self.fingerprint,
+			nodes=self.nodes,cluster_ptr=self.cluster_ptr,indptr=self.indptr,targets=self.targets,costs=self.costs)
+
+	@classmethod
+	def load(cls,filename):
+		with load(filename) as data:
+			return cls(data['shape'],data['cluster_size'],data['fingerprint'],data['nodes'],data['cluster_ptr'],data['indptr'],data['targets'],data['costs'])
+
+def _transitions(state,cluster_size,axis):
+	"""
+	找出所有垂直于axis的簇边界上的过渡点，返回过渡点两侧栅格的索引(inside,outside)，inside在边界靠前的一侧
+	"""
+	nrows,ncols = state.shape
+	if axis==1:
+		# 转置之后按axis=0处理，最后再把坐标换回来
+		inside,outside = _transitions(state.T,cluster_size,0)
+		return inside%nrows*ncols+inside//nrows,outside%nrows*ncols+outside//nrows
+	# 第b条边界在第b*cluster_size-1行和第b*cluster_size行之间
+	rows = arange(cluster_size,nrows,cluster_size)
+	passable = (state[rows-1]!=3)&(state[rows]!=3)
+	# 入口在簇的边界处断开
+	y = arange(ncols)
+	boundary = y%cluster_size==0
+	previous = zeros(passable.shape,dtype=bool)
+	previous[:,1:] = passable[:,:-1]
+	following = zeros(passable.shape,dtype=bool)
+	following[:,:-1] = passable[:,1:]
+	begins = (passable&(~previous|boundary)).nonzero()
+	ends = (passable&(~following|((y+1)%cluster_size==0))).nonzero()
+	border,first,last = rows[begins[0]],begins[1],ends[1]
+	split = last-first+1>=MIN_SPLIT
+	middle = (first+last)//2
+	border = concatenate((border[~split],border[split],border[split]))
+	column = concatenate((middle[~split],first[split],last[split]))
+	return (border-1)*ncols+column,border*ncols+column
+
+def _local_search(grid,source,bounds,target=-1,reverse=False):
+	"""
+	只在bounds=(x0,x1,y0,y1)范围内从source出发的dijkstra，检查到target就结束
+
+	reverse为True时cost[index]是从index走到source的cost（进入栅格的cost算在被进入的栅格上）。
+	返回(cost,parent,expanded)，cost和parent都是以索引为键的dict
+	"""
+	x0,x1,y0,y1 = bounds
+	ncols = grid.ncols
+	weight = grid.weight
+	cost = {source:0}
+	parent = {source:-1}
+	closed = set()
+	heap = [(0,source)]
+	while heap:
+		g,current = heappop(heap)
+		if current in closed:
+			continue
+		closed.add(current)
+		if current==target:
+			break
+		for neighbor in grid.neighbors(current):
+			x,y = divmod(neighbor,ncols)
+			if not (x0<=x<x1 and y0<=y<y1):
+				continue
+			gcost = g+(1 if weight is None else weight[current if reverse else neighbor].item())
+			if gcost<cost.get(neighbor,inf):
+				cost[neighbor] = gcost
+				parent[neighbor] = current
+				heappush(heap,(gcost,neighbor))
+	return cost,parent,len(closed)
+
+def _cluster_distances(grid,bounds,sources):
+	"""
+	簇内从每个source出发到簇内每个栅格的最短路长度，形状为(len(sources),x1-x0,y1-y0)，不可达为inf
+	每一步的cost都是1时所有source一起用NumPy做逐层的宽度优先搜索
+	"""
+	x0,x1,y0,y1 = bounds
+	distance = full((len(sources),x1-x0,y1-y0),inf)
+	x,y = divmod(asarray(sources),grid.ncols)
+	if grid.weight is None:
+		free = grid.state.reshape(grid.shape)[x0:x1,y0:y1]!=3
+		frontier = zeros(distance.shape,dtype=bool)
+		frontier[arange(len(sources)),x-x0,y-y0] = True
+		reached = frontier.copy()
+		step = 0
+		while frontier.any():
+			distance[frontier] = step
+			step += 1
+			grown = zeros(distance.shape,dtype=bool)
+			grown[:,1:] |= frontier[:,:-1]
+			grown[:,:-1] |= frontier[:,1:]
+			grown[:,:,1:] |= frontier[:,:,:-1]
+			grown[:,:,:-1] |= frontier[:,:,1:]
+			frontier = grown&free&~reached
+			reached |= frontier
+		return distance
+	for i,source in enumerate(sources.tolist()):
+		cost = _local_search(grid,source,bounds)[0]
+		cx,cy = divmod(asarray(list(cost.keys())),grid.ncols)
+		distance[i,cx-x0,cy-y0] = list(cost.values())
+	return distance
+
+_graphs = OrderedDict() # (指纹,簇的边长) -> HPAGraph，最近用过的放在最后
+
+def hpa_graph(grid,cluster_size=16,cache_size=4):
+	"""
+	返回grid的HPAGraph，同一张栅格图只预处理一次，最多缓存cache_size张栅格图
+	"""
+	key = (grid.fingerprint(),cluster_size)
+	if key in _graphs:
+		_graphs.move_to_end(key)
+		return _graphs[key]
+	graph = _graphs[key] = HPAGraph.build(grid,cluster_size)
+	while len(_graphs)>cache_size:
+		_graphs.popitem(last=False)
+	return graph
+
+def _search_hpa(grid,graph,observer=None,queue='heap'):
+	started = perf_counter()
+	start,end = grid.start,grid.end
+	assert start>=0 and end>=0,"maparray must contain a starting block (1) and an endpoint block (2)!"
+	assert graph.fingerprint==grid.fingerprint(),"The HPAGraph was built for another map!"
+	grid.reset()
+	if observer is not None:
+		observer.start(grid)
+	# 把起点和终点连到它们所在簇的节点上，起点和终点不在同一个连通分量里时什么都不用搜索
+	connected = reachable(grid)
+	start_cluster,end_cluster = graph.cluster(start),graph.cluster(end)
+	start_cost,start_expanded,end_cost,end_expanded = {},0,{},0
+	if connected:
+		start_cost,_,start_expanded = _local_search(grid,start,graph.bounds(start_cluster))
+		end_cost,_,end_expanded = _local_search(grid,end,graph.bounds(end_cluster),reverse=True)
+	start_edges = {node:start_cost[node] for node in graph.clusterNodes(start_cluster).tolist() if node in start_cost}
+	if end in start_cost:
+		start_edges[end] = start_cost[end]
+	end_edges = {node:end_cost[node] for node in graph.clusterNodes(end_cluster).tolist() if node in end_cost}
+	# 在抽象图上做astar
+	workspace = grid.workspace
+	generation = workspace.generation
+	cost,parent,stamp,closed = workspace.cost,workspace.parent,workspace.stamp,workspace.closed
+	end_x,end_y = divmod(end,grid.ncols)
+	hath = lambda index:(abs(index//grid.ncols-end_x)+abs(index%grid.ncols-end_y))*grid.min_weight
+	cost[start] = 0
+	parent[start] = -1
+	stamp[start] = generation
+	to_be_checked_group = make_open_list(queue)
+	if connected:
+		to_be_checked_group.push(start,hath(start))
+	expanded = 0
+	while to_be_checked_group:
+		current,f = to_be_checked_group.pop()
+		if observer is not None:
+			observer.pop(current)
+		closed[current] = generation
+		expanded += 1
+		if observer is not None:
+			observer.expand(current)
+		if current==end:
+			break
+		g = cost[current]
+		neighbors,steps = graph.edges(current)
+		if current==start:
+			neighbors,steps = neighbors+list(start_edges),steps+list(start_edges.values())
+		if current in end_edges:
+			neighbors,steps = neighbors+[end],steps+[end_edges[current]]
+		for neighbor,step in zip(neighbors,steps):
+			gcost = g+step
+			if stamp[neighbor]!=generation or gcost<cost[neighbor]:
+				cost[neighbor] = gcost
+				parent[neighbor] = current
+				stamp[neighbor] = generation
+				closed[neighbor] = 0
+				if observer is not None:
+					observer.relax(neighbor,current,gcost)
+				hcost = hath(neighbor)
+				to_be_checked_group.push(neighbor,gcost+hcost,hcost)
+	# 簇内的边在簇内重新搜索展开，相邻簇之间的边本来就是相邻的两个栅格
+	abstract = grid.path(end)
+	path = abstract[:1]
+	refined = 0
+	for previous,current in zip(abstract,abstract[1:]):
+		cluster = graph.cluster(previous)
+		if cluster!=graph.cluster(current):
+			path.append(current)
+			continue
+		_,local_parent,local_expanded = _local_search(grid,previous,graph.bounds(cluster),current)
+		refined += local_expanded
+		segment = [current]
+		while local_parent[segment[-1]]!=previous:
+			segment.append(local_parent[segment[-1]])
+		path.extend(reversed(segment))
+	result = SearchResult(float(workspace.getCost(end)),grid.coords(path),expanded+start_expanded+end_expanded+refined,
+		to_be_checked_group.pushes,to_be_checked_group.pops,to_be_checked_group.stale,peak_open=to_be_checked_group.peak)
+	if observer is not None:
+		observer.finish(grid,path,result)
+	result.search_time = perf_counter()-started
+	return result
+
+def solve_hpa(maparray,observer=None,queue='heap',graph=None,cluster_size=16,costarray=None):
+	"""
+	不画图、不保存文件的分层寻路，路径可能比最短路略长
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex
+		observer(SearchObserver): 可选，pop和expand只会在抽象图的节点上调用
+		queue(str): 抽象图上的open list，'heap'或'bucket'
+		graph(HPAGraph): 可选，不传入时使用按指纹缓存的HPAGraph
+		cluster_size(int): 不传入graph时簇的边长
+		costarray(ndarray): 可选，每个栅格的进入cost
+
+	Returns:
+		result(SearchResult): expanded包括抽象图上扩展的节点和簇内搜索检查过的栅格
+	"""
+	grid = as_grid(maparray,costarray)
+	return _search_hpa(grid,graph or hpa_graph(grid,cluster_size),observer,queue)
+
+__all__ = ['HPAGraph','hpa_graph','solve_hpa']
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 17:46:03
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块提供观察求解过程的工具：统计数据、可以随时挂上去的钩子和性能分析。
+钩子都是通过SearchObserver实现的，求解函数没有传入observer时不会调用任何钩子，也就没有额外的开销。
+
+- SearchStats：一次求解的统计数据，画图和保存帧文件的时间从搜索时间中单独拿出来；
+- HookObserver：把start、pop、expand、relax、finish事件转给注册的回调函数；
+- ObserverGroup：把事件同时转给多个observer，比如一边画图一边调用钩子；
+- ProgressObserver：每隔一段时间报告一次进度，并在被取消时抛出SearchCancelled结束求解；
+- profile_solve：用cProfile或tracemalloc包住一次求解，得到一份文本报告。
+
+Usage:
+from utils.instrument import SearchStats,HookObserver,profile_solve
+hooks = HookObserver(expand=lambda index:print(index))
+result = solve_astar(maparray,observer=hooks)
+print(SearchStats.fromResult(result))
+result,report = profile_solve(solve_astar,maparray,mode='cprofile')
+"""
+
+from cProfile import Profile
+from io import StringIO
+from pstats import Stats
+from tracemalloc import start,stop,take_snapshot,get_traced_memory
+from .easypathfinder import SearchObserver
+
+class SearchStats:
+	"""
+	一次求解的统计数据
+
+	Attributes:
+		expanded(int): 被扩展过的栅格数量
+		pushes(int): 放入open list的次数
+		pops(int): 从open list弹出的次数
+		stale(int): 弹出后被丢掉的过期条目数量
+		peak_open(int): open list中同时存在的栅格数量的最大值
+		search_time(float): 搜索本身用了多少秒，不包括画图和保存帧文件
+		render_time(float): 画图用了多少秒
+		io_time(float): 保存帧文件用了多少秒
+	"""
+
+	def __init__(self,expanded=0,pushes=0,pops=0,stale=0,peak_open=0,search_time=0.0,render_time=0.0,io_time=0.0):
+		self.expanded = expanded
+		self.pushes = pushes
+		self.pops = pops
+		self.stale = stale
+		self.peak_open = peak_open
+		self.search_time = search_time
+		self.render_time = render_time
+		self.io_time = io_time
+
+	def __str__(self):
+		return ("<SearchStats {} expanded, {} pushes, {} stale pops, peak open list {}, "
+			"search {:.4f}s, render {:.4f}s, frame I/O {:.4f}s>").format(self.expanded,self.pushes,self.stale,self.peak_open,self.search_time,self.render_time,self.io_time)
+
+	@property
+	def total_time(self):
+		return self.search_time+self.render_time+self.io_time
+
+	@classmethod
+	def fromResult(cls,result,observer=None):
+		"""
+		从SearchResult中取出统计数据，observer（或者ObserverGroup中的observer）带有render_time、io_time时
+		（比如FrameObserver），把这部分时间从result.search_time中扣掉
+		"""
+		observers = observer.observers if isinstance(observer,ObserverGroup) else [observer]
+		render_time = sum(getattr(observer,'render_time',0.0) for observer in observers)
+		io_time = sum(getattr(observer,'io_time',0.0) for observer in observers)
+		return cls(result.expanded,result.pushes,result.pops,result.stale,result.peak_open,
+			max(result.search_time-render_time-io_time,0.0),render_time,io_time)
+
+	def asdict(self):
+		return dict(vars(self),total_time=self.total_time)
+
+class HookObserver(SearchObserver):
+	"""
+	把求解过程中的事件转给注册的回调函数，回调函数的参数和SearchObserver中对应的方法一样
+	"""
+
+	EVENTS = ('start','pop','expand','relax','finish')
+
+	def __init__(self,**hooks):
+		"""
+		Args:
+			hooks: 事件名=回调函数，例如HookObserver(expand=f,finish=g)
+		"""
+		self._hooks = {event:[] for event in self.EVENTS}
+		for event,hook in hooks.items():
+			self.add(event,hook)
+
+	def add(self,event,hook):
+		assert event in self.EVENTS,"event must be one of {}".format(self.EVENTS)
+		self._hooks[event].append(hook)
+
+	def remove(self,event,hook):
+		self._hooks[event].remove(hook)
+
+	def start(self,grid):
+		for hook in self._hooks['start']:
+			hook(grid)
+
+	def pop(self,index):
+		for hook in self._hooks['pop']:
+			hook(index)
+
+	def expand(self,index):
+		for hook in self._hooks['expand']:
+			hook(index)
+
+	def relax(self,index,parent,cost):
+		for hook in self._hooks['relax']:
+			hook(index,parent,cost)
+
+	def finish(self,grid,path,result):
+		for hook in self._hooks['finish']:
+			hook(grid,path,result)
+
+class ObserverGroup(SearchObserver):
+	"""
+	把事件按顺序转给多个observer
+	"""
+
+	def __init__(self,*observers):
+		self.observers = list(observers)
+
+	def start(self,grid):
+		for observer in self.observers:
+			observer.start(grid)
+
+	def pop(self,index):
+		for observer in self.observers:
+			observer.pop(index)
+
+	def expand(self,index):
+		for observer in self.observers:
+			observer.expand(index)
+
+	def relax(self,index,parent,cost):
+		for observer in self.observers:
+			observer.relax(index,parent,cost)
+
+	def finish(self,grid,path,result):
+		for observer in self.observers:
+			observer.finish(grid,path,result)
+
+class SearchCancelled(Exception):
+	"""
+	求解被用户取消
+	"""
+
+class ProgressObserver(SearchObserver):
+	"""
+	每弹出every个栅格调用一次progress('search',已经弹出的栅格数,total)，total是可以通行的栅格数量，
+	dijkstra最多弹出这么多次，astar通常远少于它。cancel（threading.Event）被set之后，下一次报告时抛出SearchCancelled
+	"""
+
+	def __init__(self,progress=None,cancel=None,every=256):
+		self.progress = progress
+		self.cancel = cancel
+		self.every = every
+		self.popped = 0
+		self.total = 0
+
+	def start(self,grid):
+		if self.cancel is not None and self.cancel.is_set():
+			raise SearchCancelled()
+		self.popped = 0
+		self.total = int((grid.state!=3).sum())
+
+	def pop(self,index):
+		self.popped += 1
+		if self.popped%self.every:
+			return
+		if self.cancel is not None and self.cancel.is_set():
+			raise SearchCancelled()
+		if self.progress is not None:
+			self.progress('search',self.popped,self.total)
+
+	def finish(self,grid,path,result):
+		if self.progress is not None:
+			self.progress('search',self.total,self.total)
+
+def profile_solve(solve,*args,mode='cprofile',report=None,limit=25,**kwargs):
+	"""
+	调用solve(*args,**kwargs)，同时做性能分析
+
+	Args:
+		solve(function): 求解函数，比如solve_astar
+		mode(str): 'cprofile'按函数统计耗时，'tracemalloc'按代码行统计求解结束时还占用的内存和内存峰值
+		report(str): 可选，报告保存的文件名，cprofile模式下以.prof结尾时保存原始数据，可以用pstats或snakeviz打开
+		limit(int): 报告中最多列出多少项
+
+	Returns:
+		(result,text): solve的返回值和文本报告
+	"""
+	stream = StringIO()
+	if mode=='cprofile':
+		profile = Profile()
+		result = profile.runcall(solve,*args,**kwargs)
+		Stats(profile,stream=stream).sort_stats('cumulative').print_stats(limit)
+		if report is not None and report.endswith('.prof'):
+			profile.dump_stats(report)
+			report = None
+	elif mode=='tracemalloc':
+		start(10)
+		try:
+			result = solve(*args,**kwargs)
+			snapshot = take_snapshot()
+			current,peak = get_traced_memory()
+		finally:
+			stop()
+		stream.write("current {} bytes, peak {} bytes\n".format(current,peak))
+		for statistic in snapshot.statistics('lineno')[:limit]:
+			stream.write("{}\n".format(statistic))
+	else:
+		raise ValueError("mode must be 'cprofile' or 'tracemalloc', got {!r}".format(mode))
+	text = stream.getvalue()
+	if report is not None:
+		with open(report,'w') as f:
+			f.write(text)
+	return result,text
+
+__all__ = ['SearchStats','HookObserver','ObserverGroup','SearchCancelled','ProgressObserver','profile_solve']
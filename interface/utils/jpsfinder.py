@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 13:02:55
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了四连通栅格图上的跳点搜索（Jump Point Search），输入输出和easypathfinder中的dijkstra、astar一样。
+跳点搜索依赖每一步cost相同带来的对称性，所以不支持带权（costarray）的栅格图。
+
+每一步的cost都是1、只能上下左右移动时，大量最短路是互相对称的，astar会把它们都展开。
+跳点搜索只在跳点上展开，两个跳点之间总是一条直线：
+- 沿y方向（上、下）移动时一直往前跳，直到旁边（x方向）原来被挡住的栅格变得可以通行（强迫邻居），这里就是跳点；
+- 沿x方向（左、右）移动时，每经过一个栅格都向上、向下各跳一次，只要有一个方向能跳到跳点（或终点），这里就是跳点。
+
+沿每个方向能跳多远和maparray有关、和起点终点无关，JumpTable把它们一次性用NumPy算好（JPS+的预处理），
+跳一次只需要查一次表。同一张栅格图的JumpTable会按栅格图的指纹（GridIndex.fingerprint）缓存起来，也可以保存为.npz文件。
+
+Usage:
+from utils.jpsfinder import solve_jps
+result = solve_jps(maparray)
+"""
+
+from collections import OrderedDict
+from time import perf_counter
+from numpy import arange,asarray,load,maximum,minimum,ones,savez_compressed,where,int32
+from .rasterbuilder import RasterMap
+from .openlist import make_open_list
+from .connectivity import as_grid,reachable
+from .easypathfinder import SearchResult,FrameObserver
+
+UP,DOWN,LEFT,RIGHT = 0,1,2,3 # 与GridIndex.neighbors的上、下、左、右一致：y+1,y-1,x-1,x+1
+
+class JumpTable:
+	"""
+	JPS+的预处理结果。table[direction][index]>0时，从index沿direction跳table[direction][index]步会到达跳点；
+	table[direction][index]<=0时，沿direction走-table[direction][index]步后就会碰到障碍物或边界，途中没有跳点。
+	终点和起点无关，所以终点要在搜索时单独判断。
+	"""
+
+	def __init__(self,shape,table):
+		self.shape = tuple(shape)
+		self.table = asarray(table,dtype=int32)
+
+	def __str__(self):
+		return "<JumpTable of a {}x{} map>".format(*self.shape)
+
+	@classmethod
+	def build(cls,grid):
+		nrows,ncols = grid.shape
+		free = ones((nrows+2,ncols+2),dtype=bool) # 四周补一圈障碍物，边界外面都当作障碍物
+		free[:,0] = free[:,-1] = free[0,:] = free[-1,:] = False
+		free[1:-1,1:-1] = grid.state.reshape(nrows,ncols)!=3
+		inner = free[1:-1,1:-1]
+		# 沿y方向走到(x,y)时，旁边(x±1,y)可以通行而上一个栅格旁边(x±1,y∓1)被挡住，(x,y)就是跳点
+		forced_up = inner&((free[2:,1:-1]&~free[2:,:-2])|(free[:-2,1:-1]&~free[:-2,:-2]))
+		forced_down = inner&((free[2:,1:-1]&~free[2:,2:])|(free[:-2,1:-1]&~free[:-2,2:]))
+		up = _distance(forced_up,inner,1,True)
+		down = _distance(forced_down,inner,1,False)
+		# 沿x方向经过的栅格只要向上或向下能跳到跳点，它就是跳点
+		jumpable = inner&((up>0)|(down>0))
+		left = _distance(jumpable,inner,0,False)
+		right = _distance(jumpable,inner,0,True)
+		return cls((nrows,ncols),[table.ravel() for table in (up,down,left,right)])
+
+	def save(self,filename):
+		savez_compressed(filename,shape=asarray(self.shape),table=self.table)
+
+	@classmethod
+	def load(cls,filename):
+		with load(filename) as data:
+			return cls(data['shape'],data['table'])
+
+def _distance(stop,free,axis,forward):
+	"""
+	沿axis的正方向（forward为True）或反方向，计算每个栅格到下一个stop栅格的距离（>0），
+	如果先碰到障碍物，就返回能走的步数的相反数（<=0）
+	"""
+	length = stop.shape[axis]
+	position = arange(length).reshape((-1,1) if axis==0 else (1,-1))
+	if forward:
+		# 严格在当前栅格之后的第一个stop和第一个障碍物，没有的话就是边界外的length
+		next_stop = _shift(minimum.accumulate(where(stop,position,length)[_reverse(axis)],axis=axis)[_reverse(axis)],axis,length)
+		next_wall = _shift(minimum.accumulate(where(free,length,position)[_reverse(axis)],axis=axis)[_reverse(axis)],axis,length)
+		return where(next_stop<next_wall,next_stop-position,-(next_wall-position-1)).astype(int32)
+	previous_stop = _shift(maximum.accumulate(where(stop,position,-1),axis=axis),axis,-1,backward=True)
+	previous_wall = _shift(maximum.accumulate(where(free,-1,position),axis=axis),axis,-1,backward=True)
+	return where(previous_stop>previous_wall,position-previous_stop,-(position-previous_wall-1)).astype(int32)
+
+def _reverse(axis):
+	return (slice(None,None,-1),slice(None)) if axis==0 else (slice(None),slice(None,None,-1))
+
+def _shift(array,axis,fill,backward=False):
+	# forward时第i个位置取原来第i+1个位置的值，backward时取第i-1个位置的值，空出来的位置填fill
+	shifted = array.copy()
+	if axis==0:
+		if backward:
+			shifted[1:],shifted[0] = array[:-1],fill
+		else:
+			shifted[:-1],shifted[-1] = array[1:],fill
+	else:
+		if backward:
+			shifted[:,1:],shifted[:,0] = array[:,:-1],fill
+		else:
+			shifted[:,:-1],shifted[:,-1] = array[:,1:],fill
+	return shifted
+
+_tables = OrderedDict() # 指纹 -> JumpTable，最近用过的放在最后
+
+def jump_table(grid,cache_size=8):
+	"""
+	返回grid的JumpTable，同一张栅格图只预处理一次，最多缓存cache_size张栅格图
+	"""
+	key = grid.fingerprint()
+	if key in _tables:
+		_tables.move_to_end(key)
+		return _tables[key]
+	table = _tables[key] = JumpTable.build(grid)
+	while len(_tables)>cache_size:
+		_tables.popitem(last=False)
+	return table
+
+def _jump(grid,table,current,direction):
+	"""
+	从current沿direction跳，返回(跳点,步数)，跳不到返回(-1,0)
+	"""
+	ncols = grid.ncols
+	x,y = divmod(current,ncols)
+	end_x,end_y = divmod(grid.end,ncols)
+	distance = int(table[direction][current])
+	reach = distance if distance>0 else -distance # 沿途都可以通行的步数
+	if direction<=DOWN:
+		step = 1 if direction==UP else -1
+		# 终点就在这条线上并且够得着
+		k = (end_y-y)*step
+		if end_x==x and 0<k<=reach:
+			return grid.end,k
+	else:
+		step = ncols if direction==RIGHT else -ncols
+		k = (end_x-x)*(1 if direction==RIGHT else -1)
+		if 0<k<=reach and (distance<=0 or k<distance):
+			# 经过终点所在的那一列时，如果向上或向下能直接走到终点，那里就是跳点
+			crossing = current+k*step
+			if end_y==y:
+				return crossing,k
+			vertical = UP if end_y>y else DOWN
+			free = table[vertical][crossing]
+			if abs(end_y-y)<=(free if free>0 else -free):
+				return crossing,k
+	if distance>0:
+		return current+distance*step,distance
+	return -1,0
+
+def _directions(grid,parent,current):
+	"""
+	从parent跳到current之后，还需要继续尝试的方向
+	"""
+	if parent<0:
+		return (UP,DOWN,LEFT,RIGHT)
+	ncols = grid.ncols
+	if parent//ncols!=current//ncols:
+		# 沿x方向来的：继续往前，并且向上、向下都跳一次
+		return (RIGHT if current>parent else LEFT,UP,DOWN)
+	# 沿y方向来的：继续往前，旁边出现强迫邻居时也往旁边跳
+	direction = UP if current>parent else DOWN
+	previous = current-1 if direction==UP else current+1
+	directions = [direction]
+	state = grid.state
+	x = current//ncols
+	if x>0 and state[current-ncols]!=3 and state[previous-ncols]==3:
+		directions.append(LEFT)
+	if x+1<grid.nrows and state[current+ncols]!=3 and state[previous+ncols]==3:
+		directions.append(RIGHT)
+	return directions
+
+def _search_jps(grid,table,observer=None,queue='heap'):
+	started = perf_counter()
+	start,end = grid.start,grid.end
+	assert start>=0 and end>=0,"maparray must contain a starting block (1) and an endpoint block (2)!"
+	grid.reset()
+	if observer is not None:
+		observer.start(grid)
+	workspace = grid.workspace
+	generation = workspace.generation
+	cost,parent,stamp,closed = workspace.cost,workspace.parent,workspace.stamp,workspace.closed
+	end_x,end_y = divmod(end,grid.ncols)
+	hath = lambda index:abs(index//grid.ncols-end_x)+abs(index%grid.ncols-end_y)
+	cost[start] = 0
+	parent[start] = -1
+	stamp[start] = generation
+	to_be_checked_group = make_open_list(queue)
+	if reachable(grid):
+		to_be_checked_group.push(start,hath(start))
+	expanded = 0
+	while to_be_checked_group:
+		current,f = to_be_checked_group.pop()
+		if observer is not None:
+			observer.pop(current)
+		closed[current] = generation
+		expanded += 1
+		if observer is not None:
+			observer.expand(current)
+		if current==end:
+			break
+		g = f-hath(current)
+		for direction in _directions(grid,int(parent[current]),current):
+			jump_point,distance = _jump(grid,table.table,current,direction)
+			if jump_point<0:
+				continue
+			gcost = g+distance
+			if stamp[jump_point]!=generation or gcost<cost[jump_point]:
+				cost[jump_point] = gcost
+				parent[jump_point] = current
+				stamp[jump_point] = generation
+				closed[jump_point] = 0
+				if observer is not None:
+					observer.relax(jump_point,current,gcost)
+				hcost = hath(jump_point)
+				to_be_checked_group.push(jump_point,gcost+hcost,hcost)
+	# 跳点之间都是直线，把中间的栅格补上
+	jump_points = grid.path(end)
+	path = jump_points[:1]
+	for previous,current in zip(jump_points,jump_points[1:]):
+		step = 1 if previous//grid.ncols==current//grid.ncols else grid.ncols
+		step = step if current>previous else -step
+		path.extend(range(previous+step,current+step,step))
+	result = SearchResult(float(workspace.getCost(end)),grid.coords(path),expanded,to_be_checked_group.pushes,to_be_checked_group.pops,to_be_checked_group.stale,
+		peak_open=to_be_checked_group.peak)
+	if observer is not None:
+		observer.finish(grid,path,result)
+	result.search_time = perf_counter()-started
+	return result
+
+def solve_jps(maparray,observer=None,queue='heap',table=None):
+	"""
+	不画图、不保存文件的跳点搜索，得到的最短路长度和dijkstra、astar一样，但只在跳点上展开
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex
+		observer(SearchObserver): 可选，需要观察求解过程时传入，expand只会在跳点上调用
+		queue(str): 'heap'或'bucket'
+		table(JumpTable): 可选，不传入时使用按指纹缓存的JumpTable
+
+	Returns:
+		result(SearchResult)
+	"""
+	grid = as_grid(maparray)
+	assert grid.weight is None,"Jump point search only works on maps where every move costs 1!"
+	return _search_jps(grid,table or jump_table(grid),observer,queue)
+
+def jps(maparray,fig,ax,result_dir='result_pic'):
+	"""
+	跳点搜索在栅格图上求解最短路，同时对应的更新rastermap并保存图像
+
+	Args：
+		maparray(ndarray)
+		fig(Figure)
+		ax(Axes)
+	
+	Returns:
+		shortest_path_len(float)
+	"""
+	rsm = RasterMap()
+	rsm.buildMap(maparray)
+	result = _search_jps(rsm.grid,jump_table(rsm.grid),FrameObserver(rsm,fig,ax,result_dir))
+	print("end_point.cost={}".format(result.cost))
+	return result.cost
+
+__all__ = ['JumpTable','jump_table','solve_jps','jps']
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 16:21:35
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了增量式的重新规划（Lifelong Planning A*，LPA*），用于障碍物会出现、消失的场景。
+
+IncrementalPlanner在两次查询之间保留搜索的状态：每个栅格的g（上一次求出的cost）和rhs（根据邻居的g算出的cost）。
+某些栅格在0和3之间变化后，只有g和rhs不再相等的栅格会被放回open list重新检查，
+所以改动几个栅格之后的重新规划只会修复最短路树中受影响的部分，而不是从头再搜一遍。
+
+Usage:
+from utils.lpafinder import IncrementalPlanner
+planner = IncrementalPlanner(maparray)
+result = planner.solve()
+planner.update([(5,6,3),(7,2,0)]) # (x,y)处的栅格变为障碍物/可以通行
+result = planner.solve()
+"""
+
+from heapq import heappush,heappop,heapify
+from time import perf_counter
+from numpy import full,inf,float64
+from .rasterbuilder import GridIndex
+from .easypathfinder import SearchResult
+from .connectivity import component_labels
+
+class IncrementalPlanner:
+	"""
+	在同一张栅格图上反复求解同一对起点和终点之间的最短路，栅格图中的障碍物可以在两次求解之间变化
+	"""
+
+	def __init__(self,maparray,costarray=None):
+		"""
+		Args:
+			maparray(ndarray): 也可以直接传入GridIndex，之后update会直接修改它的state
+			costarray(ndarray): 可选，每个栅格的进入cost
+		"""
+		self.grid = maparray if isinstance(maparray,GridIndex) else GridIndex(maparray,costarray)
+		grid = self.grid
+		assert grid.start>=0 and grid.end>=0,"maparray must contain a starting block (1) and an endpoint block (2)!"
+		self.start,self.end = grid.start,grid.end
+		self.g = full(len(grid),inf,dtype=float64)
+		self.rhs = full(len(grid),inf,dtype=float64)
+		self.rhs[self.start] = 0
+		# 和其他带权求解器一样用min_weight缩放曼哈顿距离，障碍物清除后min_weight变小时在update中重新计算key
+		self.scale = grid.min_weight
+		self._end_x,self._end_y = divmod(self.end,grid.ncols)
+		self._open = {} # 在open list中的栅格 -> 它的key，堆里key对不上的条目都已经过期
+		self._heap = []
+		self.pushes = self.pops = self.stale = 0
+		# 连通分量的编号随update增量更新，起点和终点不连通时solve不需要修复最短路树
+		self.components = component_labels(grid).copy()
+		self._insert(self.start)
+
+	def __str__(self):
+		return "<IncrementalPlanner on a {}x{} map>".format(*self.grid.shape)
+
+	def _hath(self,index):
+		x,y = divmod(index,self.grid.ncols)
+		return (abs(x-self._end_x)+abs(y-self._end_y))*self.scale
+
+	def _key(self,index):
+		g = min(self.g[index],self.rhs[index])
+		return (g+self._hath(index),g)
+
+	def _insert(self,index):
+		key = self._open[index] = self._key(index)
+		heappush(self._heap,(key,index))
+		self.pushes += 1
+
+	def _adjacent(self,index):
+		# 上下左右四个方向上的栅格，包括障碍物
+		grid = self.grid
+		x,y = divmod(index,grid.ncols)
+		adjacent = []
+		if y+1<grid.ncols:
+			adjacent.append(index+1)
+		if y>0:
+			adjacent.append(index-1)
+		if x>0:
+			adjacent.append(index-grid.ncols)
+		if x+1<grid.nrows:
+			adjacent.append(index+grid.ncols)
+		return adjacent
+
+	def _step(self,index):
+		# 进入栅格index的cost
+		weight = self.grid.weight
+		return 1 if weight is None else weight[index].item()
+
+	def _updateVertex(self,index):
+		grid = self.grid
+		if index!=self.start:
+			if grid.state[index]==3:
+				self.rhs[index] = inf
+			else:
+				neighbors = grid.neighbors(index)
+				g = self.g
+				self.rhs[index] = min(g[neighbor] for neighbor in neighbors)+self._step(index) if neighbors else inf
+		self._open.pop(index,None)
+		if self.g[index]!=self.rhs[index]:
+			self._insert(index)
+
+	def _top(self):
+		# 跳过过期的条目，返回open list中最小的key
+		heap = self._heap
+		while heap and self._open.get(heap[0][1])!=heap[0][0]:
+			heappop(heap)
+			self.pops += 1
+			self.stale += 1
+		return heap[0][0] if heap else (inf,inf)
+
+	def update(self,changes):
+		"""
+		修改一些栅格的值，下一次solve只修复受影响的部分
+
+		Args:
+			changes(iterable): 每一项为(x,y,value)，坐标和Point一样，value为0（可以通行）或3（障碍物）
+		"""
+		grid = self.grid
+		for x,y,value in changes:
+			index = grid.index(x,y)
+			assert index>=0,"({},{}) is outside the map!".format(x,y)
+			assert value in (0,3),"Only blocks changing between 0 and 3 are supported!"
+			assert index!=self.start and index!=self.end,"The starting block and the endpoint block cannot change!"
+			if grid.state[index]==value:
+				continue
+			grid.setState(index,value)
+			self.components.setState(index,value)
+			# index本身和以它为前驱的邻居的rhs都可能变了
+			self._updateVertex(index)
+			for neighbor in self._adjacent(index):
+				if grid.state[neighbor]!=3:
+					self._updateVertex(neighbor)
+		if grid.min_weight<self.scale:
+			self._rescale()
+
+	def _rescale(self):
+		# 清除的障碍物比原来所有可以通行的栅格都便宜，缩小启发函数让它仍然不会高估，open list中的key全部重新计算。
+		# g和rhs与启发函数无关，不需要修改
+		self.scale = self.grid.min_weight
+		self._open = {index:self._key(index) for index in self._open}
+		self._heap = [(key,index) for index,key in self._open.items()]
+		heapify(self._heap)
+
+	def solve(self):
+		"""
+		修复（第一次调用时是建立）最短路树，返回起点到终点的最短路
+
+		Returns:
+			result(SearchResult): expanded、pushes、pops、stale只统计这一次调用
+		"""
+		started = perf_counter()
+		self.pushes = self.pops = self.stale = 0
+		g,rhs,end = self.g,self.rhs,self.end
+		grid = self.grid
+		if not self.components.connected(self.start,end):
+			# 终点不可达，open list里没处理完的栅格留到重新连通之后再处理
+			result = SearchResult(inf,grid.coords([]),0)
+			result.search_time = perf_counter()-started
+			return result
+		expanded = 0
+		while self._top()<self._key(end) or rhs[end]!=g[end]:
+			key,current = heappop(self._heap)
+			self.pops += 1
+			del self._open[current]
+			expanded += 1
+			if g[current]>rhs[current]:
+				# 找到了更短的路
+				g[current] = rhs[current]
+			else:
+				# 原来的路变长了或者断了，先作废，再重新计算
+				g[current] = inf
+				self._updateVertex(current)
+			for neighbor in grid.neighbors(current):
+				self._updateVertex(neighbor)
+		path = self._path()
+		result = SearchResult(float(g[end]),grid.coords(path),expanded,self.pushes,self.pops,self.stale)
+		result.search_time = perf_counter()-started
+		return result
+
+	def _path(self):
+		# 从终点开始每次退到g+进入cost最小的邻居，直到起点
+		g,grid = self.g,self.grid
+		if g[self.end]==inf:
+			return []
+		path = [self.end]
+		while path[-1]!=self.start:
+			current = path[-1]
+			step = self._step(current)
+			path.append(min(grid.neighbors(current),key=lambda neighbor:g[neighbor]+step))
+		path.reverse()
+		return path
+
+__all__ = ['IncrementalPlanner']
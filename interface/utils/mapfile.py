@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 16:58:20
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块定义了栅格图的二进制文件格式（.spmap），用来代替读写都很慢的Excel文件。
+
+文件由64字节的文件头、每个栅格1个字节的state、可选的权重和可选的地标距离表（见altfinder模块）组成，state和权重都按GridIndex的顺序保存，
+所以open_map用numpy.memmap打开文件后直接在上面建立GridIndex，不用复制，也不用把整个文件读进内存，
+搜索时操作系统只会把实际访问到的那部分栅格图读进来。
+保存时也可以选择每个栅格只占2位（packed），文件只有四分之一大小，但打开时要全部读进内存解压。
+
+在interface目录下把Excel文件转换为.spmap文件：
+python -m utils.mapfile ../testdata/rasterbuilder_test_data.xlsx rasterbuilder_test_data.spmap
+
+Usage:
+from utils.mapfile import save_map,open_map,load_map,open_landmarks
+save_map("map.spmap",maparray)
+grid = open_map("map.spmap") # GridIndex，可以直接传给solve_dijkstra等
+maparray,costarray = load_map("map.spmap")
+save_map("map.spmap",maparray,landmarks=landmark_table(grid)) # 把ALT的地标一起保存
+landmarks = open_landmarks("map.spmap") # LandmarkTable，没有保存地标时为None
+"""
+
+from numpy import arange,asarray,dtype,fromfile,memmap,uint8,zeros
+from .rasterbuilder import GridIndex
+
+MAP_SUFFIX = '.spmap'
+MAGIC = b'SPTK-MAP'
+VERSION = 1
+HEADER = dtype([
+	('magic','S8'),
+	('version','<u2'),
+	('packed','u1'), # 1表示state每个栅格占2位
+	('weight','u1'), # 0表示没有权重，1表示int64，2表示float64
+	('nrows','<u4'),
+	('ncols','<u4'),
+	('start','<i8'),
+	('end','<i8'),
+	('min_weight','<f8'),
+	('landmarks','<u2'), # 地标的数量
+	('landmark_dtype','u1'), # 地标距离表的类型，1表示int32，2表示float64
+	('reserved','V17'),
+])
+WEIGHT_DTYPES = (None,dtype('<i8'),dtype('<f8'))
+LANDMARK_DTYPES = (None,dtype('<i4'),dtype('<f8'))
+
+def _pack(state):
+	# 每4个栅格拼成一个字节，第i个栅格在第i//4个字节的第2*(i%4)位
+	padded = zeros(-(-state.size//4)*4,dtype=uint8)
+	padded[:state.size] = state
+	padded = padded.reshape(-1,4)
+	return padded[:,0]|(padded[:,1]<<2)|(padded[:,2]<<4)|(padded[:,3]<<6)
+
+def _unpack(packed,size):
+	return ((asarray(packed)[:,None]>>(arange(4,dtype=uint8)*2))&3).astype(uint8).ravel()[:size]
+
+def _layout(header):
+	# 返回state、权重和地标在文件中的偏移量，权重和地标都按8字节对齐
+	size = int(header['nrows'])*int(header['ncols'])
+	state_bytes = -(-size//4) if header['packed'] else size
+	weight_offset = HEADER.itemsize+-(-state_bytes//8)*8
+	return HEADER.itemsize,weight_offset,weight_offset+(size*8 if header['weight'] else 0)
+
+def save_map(filename,maparray,costarray=None,packed=False,landmarks=None):
+	"""
+	把栅格图保存为.spmap文件
+
+	Args:
+		filename(str)
+		maparray(ndarray): 也可以直接传入GridIndex
+		costarray(ndarray): 可选，每个栅格的进入cost，障碍物上无效的cost（比如空格子）会保存为1
+		packed(bool): 每个栅格是否只占2位
+		landmarks(LandmarkTable): 可选，这张栅格图的地标，保存在权重后面
+	"""
+	grid = maparray if isinstance(maparray,GridIndex) else GridIndex(maparray,costarray)
+	header = zeros(1,dtype=HEADER)
+	header['magic'] = MAGIC
+	header['version'] = VERSION
+	header['packed'] = packed
+	header['weight'] = 0 if grid.weight is None else 1 if grid.weight.dtype.kind=='i' else 2
+	header['nrows'],header['ncols'] = grid.shape
+	header['start'],header['end'] = grid.start,grid.end
+	header['min_weight'] = grid.min_weight
+	if landmarks is not None and len(landmarks):
+		assert landmarks.shape==grid.shape,"The LandmarkTable was built for another map!"
+		header['landmarks'] = len(landmarks)
+		header['landmark_dtype'] = 1 if landmarks.distance.dtype.kind=='i' else 2
+	state_offset,weight_offset,landmark_offset = _layout(header[0])
+	state = asarray(grid.state,dtype=uint8)
+	with open(filename,'wb') as f:
+		header.tofile(f)
+		(_pack(state) if packed else state).tofile(f)
+		if grid.weight is not None:
+			f.seek(weight_offset)
+			asarray(grid.weight,dtype=WEIGHT_DTYPES[header['weight'][0]]).tofile(f)
+		if header['landmarks'][0]:
+			# 地标的索引（int64）之后是每个地标一行的距离表
+			f.seek(landmark_offset)
+			asarray(landmarks.landmarks,dtype='<i8').tofile(f)
+			asarray(landmarks.distance,dtype=LANDMARK_DTYPES[header['landmark_dtype'][0]]).tofile(f)
+
+def _header(filename):
+	header = fromfile(filename,dtype=HEADER,count=1)
+	assert header.size==1 and header['magic'][0]==MAGIC,"{} is not a map file!".format(filename)
+	header = header[0]
+	assert header['version']<=VERSION,"{} was saved by a newer version!".format(filename)
+	return header
+
+def open_map(filename,mode='r'):
+	"""
+	用numpy.memmap打开.spmap文件，直接在文件上建立GridIndex
+
+	Args:
+		filename(str)
+		mode(str): 'r'只读，'r+'时GridIndex.setState会直接修改文件，'c'时修改只留在内存中
+
+	Returns:
+		grid(GridIndex): 起点和终点来自文件头，packed的文件会被解压到内存中
+	"""
+	header = _header(filename)
+	shape = (int(header['nrows']),int(header['ncols']))
+	size = shape[0]*shape[1]
+	state_offset,weight_offset,_ = _layout(header)
+	if header['packed']:
+		state = _unpack(memmap(filename,dtype=uint8,mode='r',offset=state_offset,shape=(-(-size//4),)),size)
+	else:
+		state = memmap(filename,dtype=uint8,mode=mode,offset=state_offset,shape=(size,))
+	weight = None
+	if header['weight']:
+		weight = memmap(filename,dtype=WEIGHT_DTYPES[header['weight']],mode=mode,offset=weight_offset,shape=(size,))
+	min_weight = header['min_weight'].item()
+	if weight is not None and weight.dtype.kind=='i':
+		min_weight = int(min_weight)
+	return GridIndex.fromArrays(shape,state,weight,int(header['start']),int(header['end']),min_weight)
+
+def load_map(filename):
+	"""
+	读取.spmap文件，返回和Excel文件中一样排列的(maparray,costarray)，它们都是文件上的只读视图，没有权重时costarray为None
+	"""
+	grid = open_map(filename)
+	maparray = grid.state.reshape(grid.shape)[::-1]
+	costarray = None if grid.weight is None else grid.weight.reshape(grid.shape)[::-1]
+	return maparray,costarray
+
+def open_landmarks(filename):
+	"""
+	用numpy.memmap打开.spmap文件中保存的地标距离表
+
+	Returns:
+		landmarks(LandmarkTable): 没有保存地标时为None
+	"""
+	from .altfinder import LandmarkTable
+	header = _header(filename)
+	count = int(header['landmarks'])
+	if not count:
+		return None
+	shape = (int(header['nrows']),int(header['ncols']))
+	landmark_offset = _layout(header)[2]
+	landmarks = memmap(filename,dtype='<i8',mode='r',offset=landmark_offset,shape=(count,))
+	distance = memmap(filename,dtype=LANDMARK_DTYPES[header['landmark_dtype']],mode='r',offset=landmark_offset+count*8,shape=(count,shape[0]*shape[1]))
+	return LandmarkTable(shape,landmarks,distance)
+
+def read_excel_map(path):
+	"""
+	从Excel中读取(maparray,costarray)，第一个sheet是maparray，如果有第二个sheet，它就是和maparray形状相同的costarray
+	"""
+	from pandas import read_excel
+	sheets = list(read_excel(path,header=None,sheet_name=None).values())
+	return sheets[0].values,sheets[1].values if len(sheets)>1 else None
+
+def convert_excel(path,filename,packed=False):
+	"""
+	把Excel文件转换为.spmap文件
+	"""
+	maparray,costarray = read_excel_map(path)
+	save_map(filename,maparray,costarray,packed)
+
+__all__ = ['MAP_SUFFIX','save_map','open_map','load_map','open_landmarks','read_excel_map','convert_excel']
+
+if __name__ == '__main__':
+	from sys import argv
+	assert len(argv) in (3,4),"usage: python -m utils.mapfile input.xlsx output.spmap [--packed]"
+	convert_excel(argv[1],argv[2],packed=argv[3:]==['--packed'])
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 18:49:05
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了多起点、多终点的最近目标搜索，maparray中可以有多个1（起点）和多个2（终点）。
+
+"离这里最近的是N个目标中的哪一个"不需要求解N次：把所有起点的cost都设为0一起放进open list，
+第一个被检查到的终点就是离某个起点最近的终点，继续搜索下去，终点被检查到的顺序就是它们由近到远的顺序，
+所以一次搜索就能得到最近的k个终点和它们的最短路。
+
+启发函数取到所有终点的曼哈顿距离中的最小值，它不会高估到任何一个终点的距离，而且满足一致性，
+所以astar检查到终点的顺序和dijkstra一样。栅格的启发函数值在搜索第一次用到它时才算，然后记下来，不为整张栅格图建立数组。
+已经缓存了连通分量的编号时（传入ndarray时会建立，见connectivity模块），和所有起点都不在同一个连通分量里的终点在搜索之前就被去掉了。
+
+Usage:
+from utils.multigoal import solve_nearest
+result = solve_nearest(maparray) # maparray中所有的1和2
+result = solve_nearest(maparray,k=3,sources=[(0,0)],goals=[(5,5),(9,2),(19,19)])
+result.goals # 由近到远的终点坐标
+result.paths[0] # 到最近的终点的最短路，和result.path一样
+"""
+
+from time import perf_counter
+from numpy import asarray,zeros,inf,float64,intp
+from .openlist import make_open_list
+from .easypathfinder import SearchResult
+from .connectivity import as_grid,cached_labels
+
+class NearestResult(SearchResult):
+	"""
+	一次最近目标搜索的结果，cost和path是到最近的终点的，expanded、pushes等统计的是整个搜索
+
+	Attributes:
+		goals(ndarray): 找到的终点的(x,y)坐标，由近到远排列，形状为(m,2)，m不超过k
+		sources(ndarray): 到第i个终点的最短路是从哪个起点出发的，形状为(m,2)
+		costs(ndarray): 到每个终点的最短路长度，形状为(m,)
+		paths(list): 到每个终点的最短路，都是形状为(n,2)的(x,y)坐标数组
+	"""
+
+	def __init__(self,goals,sources,costs,paths,expanded,pushes=0,pops=0,stale=0,search_time=0.0,peak_open=0):
+		SearchResult.__init__(self,float(costs[0]) if len(costs) else inf,paths[0] if paths else zeros((0,2),dtype=intp),
+			expanded,pushes,pops,stale,search_time,peak_open)
+		self.goals = goals
+		self.sources = sources
+		self.costs = costs
+		self.paths = paths
+
+	def __str__(self):
+		return "<NearestResult with {} goals found, nearest cost={}, {} expanded>".format(len(self.costs),self.cost,self.expanded)
+
+def _nearest_manhattan(grid,goals):
+	"""
+	返回hath(index)：栅格index到最近的终点的曼哈顿距离（不考虑障碍物）乘上min_weight。
+	终点不多时逐个比较，多时用NumPy对所有终点一次算出；每个栅格只算一次
+	"""
+	ncols,scale = grid.ncols,grid.min_weight
+	goal_x,goal_y = divmod(asarray(sorted(goals),dtype=intp),ncols)
+	few = len(goals)<=16
+	coords = list(zip(goal_x.tolist(),goal_y.tolist()))
+	values = {}
+
+	def hath(index):
+		value = values.get(index)
+		if value is None:
+			x,y = divmod(index,ncols)
+			if few:
+				value = min(abs(x-gx)+abs(y-gy) for gx,gy in coords)*scale
+			else:
+				value = (abs(goal_x-x)+abs(goal_y-y)).min().item()*scale
+			values[index] = value
+		return value
+	return hath
+
+def _search_nearest(grid,sources,goals,k,hath=None,observer=None,queue='heap'):
+	started = perf_counter()
+	grid.reset()
+	if observer is not None:
+		observer.start(grid)
+	workspace = grid.workspace
+	generation = workspace.generation
+	cost,parent,stamp,closed = workspace.cost,workspace.parent,workspace.stamp,workspace.closed
+	weight = grid.weight
+	# 只有和某个起点在同一个连通分量里的终点才找得到，没有缓存编号时所有终点都留着
+	labels = cached_labels(grid)
+	remaining = set(goals)
+	if labels is not None:
+		components = set(labels.label[sources].tolist())
+		remaining = {goal for goal in goals if labels.label[goal] in components}
+	wanted = min(k,len(remaining))
+	to_be_checked_group = make_open_list(queue)
+	for source in sources:
+		cost[source] = 0
+		parent[source] = -1
+		stamp[source] = generation
+		if wanted:
+			to_be_checked_group.push(source,hath(source) if hath else 0)
+	found = []
+	expanded = 0
+	while to_be_checked_group:
+		current,f = to_be_checked_group.pop()
+		if observer is not None:
+			observer.pop(current)
+		closed[current] = generation
+		expanded += 1
+		if observer is not None:
+			observer.expand(current)
+		if current in remaining:
+			# 启发函数满足一致性，终点第一次被检查到时cost就是最短路长度
+			remaining.discard(current)
+			found.append(current)
+			if len(found)==wanted:
+				break
+		g = (f-hath(current) if hath else f) if weight is None else cost[current]
+		for neighbor in grid.neighbors(current):
+			gcost = g+(1 if weight is None else weight[neighbor])
+			if stamp[neighbor]!=generation or gcost<cost[neighbor]:
+				cost[neighbor] = gcost
+				parent[neighbor] = current
+				stamp[neighbor] = generation
+				closed[neighbor] = 0
+				if observer is not None:
+					observer.relax(neighbor,current,gcost)
+				if hath:
+					hcost = hath(neighbor)
+					to_be_checked_group.push(neighbor,gcost+hcost,hcost)
+				else:
+					to_be_checked_group.push(neighbor,gcost)
+	paths = [grid.path(goal) for goal in found]
+	result = NearestResult(grid.coords(found),grid.coords([path[0] for path in paths]),asarray([cost[goal] for goal in found],dtype=float64),
+		[grid.coords(path) for path in paths],expanded,to_be_checked_group.pushes,to_be_checked_group.pops,to_be_checked_group.stale,
+		peak_open=to_be_checked_group.peak)
+	if observer is not None:
+		observer.finish(grid,paths[0] if paths else [],result)
+	result.search_time = perf_counter()-started
+	return result
+
+def _indexes(grid,coords,default):
+	if coords is None:
+		return default.tolist()
+	indexes = [grid.index(x,y) for x,y in coords]
+	assert all(index>=0 for index in indexes),"Every source and goal must be inside the map!"
+	return indexes
+
+def solve_nearest(maparray,k=1,sources=None,goals=None,observer=None,queue='heap',heuristic=True,costarray=None):
+	"""
+	不画图、不保存文件的最近目标搜索，一次搜索找到离起点（们）最近的k个终点
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex
+		k(int): 要找几个终点
+		sources(list): 起点的(x,y)坐标，坐标和Point一样，默认为maparray中所有的1
+		goals(list): 终点的(x,y)坐标，默认为maparray中所有的2
+		observer(SearchObserver): 可选，需要观察求解过程时传入，finish收到的是到最近的终点的最短路
+		queue(str): 'heap'或'bucket'
+		heuristic(bool): True时是以到最近的终点的曼哈顿距离为启发函数的astar，False时是dijkstra
+		costarray(ndarray): 可选，每个栅格的进入cost
+
+	Returns:
+		result(NearestResult): 一个终点也找不到时cost为inf，goals为空
+	"""
+	grid = as_grid(maparray,costarray)
+	sources = _indexes(grid,sources,grid.starts)
+	goals = _indexes(grid,goals,grid.ends)
+	assert sources and goals,"maparray must contain at least one starting block (1) and one endpoint block (2)!"
+	assert all(grid.state[index]!=3 for index in sources+goals),"Sources and goals cannot be obstacles!"
+	hath = None
+	if heuristic:
+		hath = _nearest_manhattan(grid,goals)
+	return _search_nearest(grid,sources,set(goals),k,hath,observer,queue)
+
+__all__ = ['NearestResult','solve_nearest']
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 11:05:21
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块提供dijkstra和astar使用的待检查集合（open list），里面只存整数索引，不再存Point对象。
+
+- HeapOpenList：以(f,tiebreak,栅格索引)元组为键的二叉堆，适用于任意非负的cost。
+- BucketOpenList：Dial桶队列，f必须是整数，push和pop都是O(1)，适合这里单位cost和小整数权重的栅格图。
+
+两者都会记住每个栅格最后一次push时的f：f没有变小的push会被直接拒绝，pop时遇到f已经过期的条目
+（同一个栅格后来又以更小的f push过）会把它当作stale条目丢掉。pushes、pops、stale三个计数器可以用来比较两种实现，
+peak是集合中同时存在的栅格数量（不算stale条目）的最大值。
+"""
+
+from heapq import heappush,heappop
+
+class HeapOpenList:
+	"""
+	以(f,tiebreak,栅格索引)为键的二叉堆，f相同时tiebreak小的先出
+	"""
+
+	def __init__(self):
+		self._heap = []
+		self._key = {} # 栅格索引 -> 最后一次push时的f
+		self.pushes = 0
+		self.pops = 0
+		self.stale = 0
+		self.peak = 0
+
+	def __len__(self):
+		# 还在集合中的栅格数量（不算stale条目）
+		return len(self._key)
+
+	def __contains__(self,index):
+		return index in self._key
+
+	def __str__(self):
+		return "<HeapOpenList with {} blocks in it>".format(len(self))
+
+	def push(self,index,f,tiebreak=0):
+		"""
+		把栅格index以f放进集合，如果集合中已经有这个栅格并且f不比原来的小，就什么也不做并返回False
+		"""
+		if index in self._key and self._key[index]<=f:
+			return False
+		self._key[index] = f
+		heappush(self._heap,(f,tiebreak,index))
+		self.pushes += 1
+		if len(self._key)>self.peak:
+			self.peak = len(self._key)
+		return True
+
+	def pop(self):
+		"""
+		弹出f最小的栅格，返回(栅格索引,f)
+		"""
+		while True:
+			f,tiebreak,index = heappop(self._heap)
+			self.pops += 1
+			if self._key.get(index)==f:
+				del self._key[index]
+				return index,f
+			self.stale += 1
+
+	def peek(self):
+		"""
+		返回f最小的栅格(栅格索引,f)但不弹出，堆顶的stale条目会被顺便丢掉
+		"""
+		while True:
+			f,tiebreak,index = self._heap[0]
+			if self._key.get(index)==f:
+				return index,f
+			heappop(self._heap)
+			self.pops += 1
+			self.stale += 1
+
+class BucketOpenList:
+	"""
+	Dial桶队列：f相同的栅格放在同一个桶里。astar和dijkstra弹出的f不会减小，所以只需要一个只往前走的游标，
+	push和pop都是O(1)（游标跨过空桶的开销均摊到每次pop）。桶按需创建、空了就删掉，带权栅格图上f的范围很大时
+	也只占用非空桶的内存。同一个桶中后放入的先出，astar会先检查离终点更近的栅格。
+	"""
+
+	def __init__(self):
+		self._buckets = {} # f -> 这个f上的栅格索引列表
+		self._cursor = 0 # 比它小的桶都是空的
+		self._key = {}
+		self.pushes = 0
+		self.pops = 0
+		self.stale = 0
+		self.peak = 0
+
+	def __len__(self):
+		return len(self._key)
+
+	def __contains__(self,index):
+		return index in self._key
+
+	def __str__(self):
+		return "<BucketOpenList with {} blocks in it>".format(len(self))
+
+	def push(self,index,f,tiebreak=0):
+		"""
+		和HeapOpenList.push一样，但f必须是非负整数（小整数权重的栅格图上总是这样），tiebreak会被忽略
+		"""
+		if index in self._key and self._key[index]<=f:
+			return False
+		bucket = int(f)
+		assert bucket==f and bucket>=0,"BucketOpenList only accepts non-negative integer keys!"
+		if bucket in self._buckets:
+			self._buckets[bucket].append(index)
+		else:
+			self._buckets[bucket] = [index]
+		self._key[index] = bucket
+		# 启发函数不一致时f可能比游标小，把游标退回去保证正确
+		if bucket<self._cursor:
+			self._cursor = bucket
+		self.pushes += 1
+		if len(self._key)>self.peak:
+			self.peak = len(self._key)
+		return True
+
+	def pop(self):
+		index,f = self.peek()
+		bucket = self._buckets[f]
+		bucket.pop()
+		if not bucket:
+			del self._buckets[f]
+		self.pops += 1
+		del self._key[index]
+		return index,f
+
+	def peek(self):
+		while True:
+			while self._cursor not in self._buckets:
+				self._cursor += 1
+			bucket = self._buckets[self._cursor]
+			index = bucket[-1]
+			if self._key.get(index)==self._cursor:
+				return index,self._cursor
+			bucket.pop()
+			if not bucket:
+				del self._buckets[self._cursor]
+			self.pops += 1
+			self.stale += 1
+
+def make_open_list(queue):
+	"""
+	根据名字创建open list
+
+	Args:
+		queue(str): 'heap'或者'bucket'
+	"""
+	if queue=='heap':
+		return HeapOpenList()
+	elif queue=='bucket':
+		return BucketOpenList()
+	raise ValueError("queue must be 'heap' or 'bucket', got {!r}".format(queue))
+
+__all__ = ['HeapOpenList','BucketOpenList','make_open_list']
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 18:52:17
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了边解码边播放的动画播放器，不再在播放之前把所有帧都解码成数组。
+
+- GifFrames：从gif文件中按需解码帧；
+- TraceFrames：从TraceRecorder记录的Trace按需重建帧，顺序播放时每一帧只叠加一步的事件；
+- AnimationPlayer：在ax上播放一个帧来源，解码好第一帧就开始播放，可以暂停、跳到任意一帧、调整播放速度。
+
+两种帧来源都只在一个有上限的LRU中缓存最近用过的帧，所以内存占用和总帧数无关。
+
+Usage:
+from utils.player import GifFrames,AnimationPlayer
+player = AnimationPlayer(fig,ax,GifFrames('astar_gif.gif'))
+player.seek(100)
+player.setSpeed(2)
+"""
+
+from collections import OrderedDict
+from numpy import asarray
+from PIL import Image
+from matplotlib.animation import FuncAnimation
+from .tracerecorder import Trace,TraceReplay
+
+MIN_INTERVAL = 20 # 两帧之间最短的间隔（毫秒），播放得更快时跳帧
+
+class FrameSource:
+	"""
+	按需解码的帧来源，子类实现__len__和_decode。最近用过的cache_size帧会被缓存起来
+	"""
+
+	interval = 100 # 每一帧默认显示多少毫秒
+
+	def __init__(self,cache_size=32):
+		self.cache_size = cache_size
+		self._cache = OrderedDict() # 帧序号 -> RGB数组，最近用过的放在最后
+
+	def __getitem__(self,i):
+		if i in self._cache:
+			self._cache.move_to_end(i)
+			return self._cache[i]
+		frame = self._cache[i] = self._decode(i)
+		while len(self._cache)>self.cache_size:
+			self._cache.popitem(last=False)
+		return frame
+
+	def _decode(self,i):
+		raise NotImplementedError
+
+	def close(self):
+		self._cache.clear()
+
+class GifFrames(FrameSource):
+	"""
+	从gif文件中按需解码帧。gif的每一帧都是在前一帧上修改得到的，Pillow往前跳时要从头重新解码，
+	所以顺序播放和往后跳都很快，往前跳的开销和跳到的位置成正比
+	"""
+
+	def __init__(self,filename,cache_size=32):
+		super().__init__(cache_size)
+		self.image = Image.open(filename)
+		self.interval = self.image.info.get('duration') or FrameSource.interval
+		self._length = None
+
+	def __len__(self):
+		if self._length is None:
+			# n_frames要扫描一遍文件，但不需要把帧转换成数组
+			self._length = getattr(self.image,'n_frames',1)
+		return self._length
+
+	def _decode(self,i):
+		self.image.seek(i)
+		return asarray(self.image.convert('RGB'))
+
+	def close(self):
+		super().close()
+		self.image.close()
+
+class TraceFrames(FrameSource):
+	"""
+	从Trace按需重建帧，trace也可以是Trace保存的.npz文件名。
+	记住上一次重建到的那一步，顺序播放（或者往后跳）时只需要叠加中间的事件，往前跳时才从头重建
+	"""
+
+	def __init__(self,trace,cache_size=32,interval=FrameSource.interval):
+		super().__init__(cache_size)
+		self.replay = TraceReplay(trace if isinstance(trace,Trace) else Trace.load(trace))
+		self.interval = interval
+		self._step = 0
+		self._state = self.replay.trace.state.copy()
+
+	def __len__(self):
+		return len(self.replay)
+
+	def _decode(self,i):
+		if i<self._step:
+			self._step = 0
+			self._state = self.replay.trace.state.copy()
+		self.replay.advance(self._state,self._step,i)
+		self._step = i
+		return self.replay.image(self._state)
+
+class AnimationPlayer:
+	"""
+	用FuncAnimation在ax上播放source，播放器自己持有FuncAnimation，只要播放器还在就不会被回收
+	"""
+
+	def __init__(self,fig,ax,source,on_frame=None,**kwargs):
+		"""
+		Args:
+			fig(Figure)
+			ax(Axes)
+			source(FrameSource)
+			on_frame(function): 可选，每显示一帧调用一次on_frame(帧序号)，比如用来更新进度条
+			kwargs: 传给imshow的参数，比如TraceFrames需要origin='lower'
+		"""
+		self.fig = fig
+		self.source = source
+		self.on_frame = on_frame
+		self.position = 0
+		self.speed = 1.0
+		self.step = 1
+		self.playing = True
+		self.image = ax.imshow(source[0],animated=True,**kwargs)
+		self.animation = FuncAnimation(fig,self._update,frames=self._frames,init_func=lambda:(self.image,),
+			interval=source.interval,blit=True,cache_frame_data=False)
+
+	def __len__(self):
+		return len(self.source)
+
+	def _frames(self):
+		# 无限的帧序号生成器，seek直接修改position，下一次就显示跳到的那一帧
+		while True:
+			yield self.position
+
+	def _update(self,i):
+		self.image.set_array(self.source[i])
+		if self.playing:
+			self.position = (i+self.step)%len(self.source)
+		if self.on_frame is not None:
+			self.on_frame(i)
+		return self.image,
+
+	def play(self):
+		self.playing = True
+
+	def pause(self):
+		self.playing = False
+
+	def seek(self,i):
+		self.position = min(max(int(i),0),len(self.source)-1)
+
+	def setSpeed(self,speed):
+		"""
+		speed为1时按原来的帧率播放，间隔短于MIN_INTERVAL时改为跳帧
+		"""
+		assert speed>0,"speed must be positive!"
+		self.speed = speed
+		interval = self.source.interval/speed
+		self.step = max(1,round(MIN_INTERVAL/interval))
+		self.animation.event_source.interval = max(interval,MIN_INTERVAL)
+
+	def stop(self):
+		self.animation.event_source.stop()
+
+	def close(self):
+		# 换成别的动画之前调用：停掉计时器，关闭帧来源（比如打开着的gif文件），之后这个播放器不能再用
+		self.stop()
+		self.source.close()
+
+__all__ = ['FrameSource','GifFrames','TraceFrames','AnimationPlayer']
@@ -8,6 +8,8 @@
 This module provides RasterMap objects for quickly creating raster maps, 
 as well as Point, PointGroup, and PointGroupOdered objects, making it very
 convenient for users to access the blocks in the created raster map!
+The GridIndex object keeps the same raster map in NumPy arrays, which is what
+the solvers in easypathfinder work on.
 
 Usage:
 from rasterbuilder import *
@@ -32,9 +34,14 @@ rasterbuilder_test_data.xlsx to learn how to get a valid maparray.
 If you have any questions about the use of this module or would like it to 
 provide some new features, please feel free to contact me at any time.
 """
+from hashlib import sha1
 from heapq import heapify,heappush,heappop
-from numpy import ndarray
-from matplotlib.patches import Rectangle
+from numpy import ndarray,arange,array,asarray,column_stack,empty,flatnonzero,iinfo,isfinite,where,zeros,inf,uint8,uint32,int32,int64,float64,intp
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb,to_rgba
+
+FACECOLORS = ('white','green','red','black') # maparray中0,1,2,3对应的颜色
+EDGECOLOR = 'gray'
 
 class Point:
 	"""
@@ -51,8 +58,13 @@ class Point:
 	In addition, the cost values can be directly compared between any two Point objects
 	(a common operation in Dijkstar and A-star algorithms) without the need to first 
 	read the cost values of the Point objects before comparing the sizes.
+
+	Point uses __slots__, and the Points of a map are only created by GridIndex.point when
+	they are asked for, so a large map does not hold one Point per block.
 	"""
 
+	__slots__ = ('x','y','facecolor','edgecolor','cost','parent')
+
 	def __init__(self,anchor_x,anchor_y):
 		self.x = anchor_x
 		self.y = anchor_y
@@ -83,29 +95,89 @@ class PointGroup(list):
 	whether a Point object is in the collection. At the same time, the corresponding Point object can be directly 
 	obtained through the x and y properties of the Point object (which is very convenient when implementing 
 	algorithms such as Dijkstar and A-star to obtain neighboring blocks of a block).
+
+	A dictionary keyed by (x,y) is maintained next to the list, so the in operator, getPoint and the lookup
+	part of delPoint no longer scan the whole group.
 	"""
 
 	def __init__(self,name,iterable=[]):
 		super(PointGroup,self).__init__(iterable)
 		self.name = name
+		self._reindex()
+
+	def _reindex(self):
+		# (x,y) -> 这个坐标上的Point对象列表（组里允许出现重复的Point）
+		self._index = {}
+		for point in self:
+			self._index.setdefault((point.x,point.y),[]).append(point)
+
+	def _add(self,point):
+		self._index.setdefault((point.x,point.y),[]).append(point)
+
+	def _discard(self,point):
+		points = self._index.get((point.x,point.y))
+		if points:
+			for i,indexed in enumerate(points):
+				if indexed is point:
+					del points[i]
+					break
+			if not points:
+				del self._index[(point.x,point.y)]
+
+	def append(self,point):
+		super(PointGroup,self).append(point)
+		self._add(point)
+
+	def extend(self,iterable):
+		for point in iterable:
+			self.append(point)
+
+	def insert(self,i,point):
+		super(PointGroup,self).insert(i,point)
+		self._add(point)
+
+	def pop(self,i=-1):
+		point = super(PointGroup,self).pop(i)
+		self._discard(point)
+		return point
+
+	def remove(self,point):
+		self.pop(self.index(point))
+
+	def clear(self):
+		super(PointGroup,self).clear()
+		self._index = {}
+
+	def __setitem__(self,key,value):
+		super(PointGroup,self).__setitem__(key,value)
+		self._reindex()
+
+	def __delitem__(self,key):
+		super(PointGroup,self).__delitem__(key)
+		self._reindex()
+
+	def __iadd__(self,iterable):
+		self.extend(iterable)
+		return self
 
 	def __str__(self):
 		return "<PointGroup named {} with {} Points in it>".format(self.name,len(self))
 
 	def __contains__(self,item):
-		return (item.x,item.y) in [(point.x,point.y) for point in self]
+		return (item.x,item.y) in self._index
 
 	def getPoint(self,x,y):
-		for point in self:
-			if (point.x==x) and (point.y==y):
-				return point
-		else:
-			return # 没找到
+		points = self._index.get((x,y))
+		if points:
+			return points[0]
+		return # 没找到
 
 	def delPoint(self,x,y):
-		for i,point in enumerate(self):
-			if (point.x==x) and (point.y==y):
-				self.pop(i) # 从中剔除这个Point对象
+		if (x,y) not in self._index:
+			return
+		# 把这个坐标上的Point对象全部从组中剔除
+		super(PointGroup,self).__setitem__(slice(None),[point for point in self if (point.x,point.y)!=(x,y)])
+		del self._index[(x,y)]
 
 class PointGroupOrdered(PointGroup):
 	"""
@@ -122,20 +194,381 @@ class PointGroupOrdered(PointGroup):
 	def push(self,point):
 		# 将point放入组中，保持顺序
 		heappush(self,point)
+		self._add(point)
 
 	def pop(self):
 		# 将组中最小的point弹出来
-		return heappop(self)
+		point = heappop(self)
+		self._discard(point)
+		return point
 
 	def __str__(self):
 		return "<PointGroupOrdered named {} with {} Points in it>".format(self.name,len(self))
 
+class GridPointGroup(PointGroup):
+	"""
+	The GridPointGroup object is a PointGroup over a GridIndex. It holds no Point objects itself:
+	the blocks in it are either all the blocks of the grid (value is None) or the blocks whose state equals
+	value, and their Points are created by GridIndex.point only when they are iterated or looked up.
+	The groups are kept in the order of the GridIndex and always reflect the current state of the grid.
+
+	Changing a group writes through to the grid: appending (or inserting) a Point sets the state of its block
+	to value, e.g. appending to the obstacle group puts an obstacle there, and removing a Point (remove, pop,
+	delPoint, del, clear) sets the state of its block back to 0. The group of all blocks (value is None) and
+	assignments to positions (group[i] = point) cannot be changed this way and raise TypeError.
+	"""
+
+	def __init__(self,name,grid,value=None):
+		list.__init__(self)
+		self.name = name
+		self.grid = grid
+		self.value = value
+		self._indexes = None
+		self._version = -1 # 算_indexes时grid的版本，grid.setState之后要重新算
+		self._index = {}
+
+	def _setState(self,point,value):
+		if self.value is None:
+			raise TypeError("The group of all blocks cannot be changed, change the state of the blocks instead!")
+		index = self.grid.index(point.x,point.y)
+		if index<0:
+			raise IndexError("({},{}) is outside the map!".format(point.x,point.y))
+		self.grid.setState(index,value)
+
+	def append(self,point):
+		self._setState(point,self.value)
+
+	def extend(self,iterable):
+		for point in list(iterable):
+			self.append(point)
+
+	def insert(self,i,point):
+		# 组内的顺序就是GridIndex的顺序，i没有意义
+		self.append(point)
+
+	def __iadd__(self,iterable):
+		self.extend(iterable)
+		return self
+
+	def remove(self,point):
+		if point not in self:
+			raise ValueError("{} is not in {}".format(point,self))
+		self._setState(point,0)
+
+	def pop(self,i=-1):
+		point = self[i]
+		self.remove(point)
+		return point
+
+	def delPoint(self,x,y):
+		point = self.getPoint(x,y)
+		if point is not None:
+			self.remove(point)
+
+	def clear(self):
+		for point in list(self):
+			self.remove(point)
+
+	def __delitem__(self,key):
+		for point in (self[key] if isinstance(key,slice) else [self[key]]):
+			self.remove(point)
+
+	def __setitem__(self,key,value):
+		raise TypeError("{} is kept in the order of the GridIndex, use append and remove instead!".format(self))
+
+	def indexes(self):
+		# 组内栅格在GridIndex中的索引
+		if self._indexes is None or self._version!=self.grid.version:
+			self._indexes = arange(len(self.grid)) if self.value is None else flatnonzero(self.grid.state==self.value)
+			self._version = self.grid.version
+		return self._indexes
+
+	def __len__(self):
+		return len(self.grid) if self.value is None else self.indexes().size
+
+	def __iter__(self):
+		for index in self.indexes().tolist():
+			yield self.grid.point(index)
+
+	def __getitem__(self,i):
+		if isinstance(i,slice):
+			return [self.grid.point(index) for index in self.indexes()[i].tolist()]
+		return self.grid.point(int(self.indexes()[i]))
+
+	def __contains__(self,item):
+		return self.getPoint(item.x,item.y) is not None
+
+	def getPoint(self,x,y):
+		index = self.grid.index(x,y)
+		if index<0 or (self.value is not None and self.grid.state[index]!=self.value):
+			return # 没找到
+		return self.grid.point(index)
+
+	def __str__(self):
+		return "<PointGroup named {} with {} Points in it>".format(self.name,len(self))
+
+class GridIndex:
+	"""
+	The GridIndex object stores a raster map in flat NumPy arrays instead of Point objects. The block whose
+	Point has the anchor (x,y) is stored at the index x*ncols+y, so its neighbours, its state and its search
+	data can all be reached in O(1):
+	- state: the value of the block in maparray (0,1,2 or 3).
+	- weight: the cost of entering the block, taken from the optional costarray of the same shape as maparray.
+	  It is None for the usual maps where every move costs 1, min_weight is the smallest weight of a block
+	  that is not an obstacle and is used to scale the heuristics so that they stay admissible. Obstacles keep
+	  their costarray value so that it is still known when they are cleared, invalid values become 1.
+	- workspace: the SearchWorkspace holding the search data, which is allocated by the first search and
+	  reused by every later search on this grid. Bidirectional searches keep the backward half of their
+	  data in reverse_workspace.
+	- cost: the cost from the starting block, inf if it has not been reached yet.
+	- parent: the index of the previous block on the shortest path, -1 if there is none.
+	- visited: whether the shortest path to the block has already been found.
+	- point(index): the Point object of a block, created the first time it is asked for.
+	cost, parent and visited are dense copies made from the workspace of the last search.
+	The indexes of the starting block and the endpoint block are kept in start and end (-1 if missing),
+	like RasterMap.buildMap the last one in maparray wins when there are several of them. The indexes of
+	all of them are given by starts and ends, which the multi-goal search in multigoal uses.
+	"""
+
+	def __init__(self,maparray:ndarray,costarray:ndarray=None):
+		self.shape = maparray.shape
+		self.nrows,self.ncols = maparray.shape
+		# Point(x,y)对应maparray的第nrows-x-1行第y列，所以先上下翻转再展平；总是复制一份，
+		# load_map返回的是文件上的只读视图，不复制的话翻转两次得到的还是这个视图，之后setState就改不了了
+		self.state = array(maparray[::-1],dtype=uint8).ravel()
+		self.weight = None
+		self.min_weight = 1
+		if costarray is not None:
+			assert costarray.shape==maparray.shape,"costarray must have the same shape as maparray!"
+			weight = array(costarray[::-1],dtype=float64).ravel()
+			# 障碍物被清除之后（比如IncrementalPlanner.update）要用它原来的权重，只有无效的权重（比如Excel里的空格子）才换成1
+			weight[(self.state==3)&~(isfinite(weight)&(weight>0))] = 1
+			assert (weight>0).all(),"The cost of every block that is not an obstacle must be positive!"
+			# 都是整数时用整数保存，这样才能用BucketOpenList
+			self.weight = weight.astype(int64) if (weight==weight.round()).all() else weight
+			passable = self.weight[self.state!=3]
+			self.min_weight = passable.min().item() if passable.size else 1
+		self._workspace = None # 第一次搜索时才分配
+		self._reverse_workspace = None # 双向搜索中从终点出发的那一半
+		self._points = {} # 已经创建过的Point，保证同一个栅格总是同一个Point对象
+		self._fingerprint = None
+		self.version = 0 # 每次setState加1
+		self.start = self._last(maparray,1)
+		self.end = self._last(maparray,2)
+
+	@classmethod
+	def fromArrays(cls,shape,state,weight=None,start=-1,end=-1,min_weight=None):
+		"""
+		Build a GridIndex directly on an existing flat state array (and weight array) in GridIndex order without
+		copying them, e.g. arrays in shared memory or a numpy.memmap. Pass min_weight when it is already known,
+		otherwise the whole weight array is scanned for it.
+		"""
+		grid = cls.__new__(cls)
+		grid.shape = tuple(shape)
+		grid.nrows,grid.ncols = grid.shape
+		grid.state = state
+		grid.weight = weight
+		grid.min_weight = 1
+		if weight is not None:
+			if min_weight is None:
+				passable = weight[state!=3]
+				min_weight = passable.min().item() if passable.size else 1
+			grid.min_weight = min_weight
+		grid._workspace = None
+		grid._reverse_workspace = None
+		grid._points = {}
+		grid._fingerprint = None
+		grid.version = 0
+		grid.start = start
+		grid.end = end
+		return grid
+
+	def fingerprint(self):
+		"""
+		The sha1 fingerprint of the map, maps with the same shape, states and weights share a fingerprint.
+		It is computed once and cached, so state and weight should not be changed afterwards.
+		"""
+		if self._fingerprint is None:
+			digest = sha1(asarray(self.shape,dtype=int64).tobytes())
+			digest.update(self.state.tobytes())
+			if self.weight is not None:
+				digest.update(self.weight.tobytes())
+			self._fingerprint = digest.hexdigest()
+		return self._fingerprint
+
+	@property
+	def starts(self):
+		# 所有起点的索引，从小到大排列
+		return flatnonzero(self.state==1)
+
+	@property
+	def ends(self):
+		# 所有终点的索引，从小到大排列
+		return flatnonzero(self.state==2)
+
+	def _last(self,maparray,value):
+		found = flatnonzero(maparray==value)
+		if found.size==0:
+			return -1
+		i,j = divmod(int(found[-1]),self.ncols)
+		return self.index(self.nrows-i-1,j)
+
+	def __len__(self):
+		return self.state.size
+
+	def __str__(self):
+		return "<GridIndex with {}x{} blocks in it>".format(self.nrows,self.ncols)
+
+	def index(self,x,y):
+		# 超出栅格图范围返回-1
+		if 0<=x<self.nrows and 0<=y<self.ncols:
+			return x*self.ncols+y
+		return -1
+
+	def point(self,index):
+		point = self._points.get(index)
+		if point is None:
+			point = self._points[index] = Point(*divmod(index,self.ncols))
+			point.facecolor = FACECOLORS[self.state[index]]
+			point.edgecolor = EDGECOLOR
+		return point
+
+	def coord(self,index):
+		return divmod(index,self.ncols)
+
+	def coords(self,indexes):
+		# 把索引列表转换成(x,y)坐标数组，形状为(n,2)
+		return column_stack(divmod(asarray(indexes,dtype=intp),self.ncols))
+
+	def neighbors(self,index):
+		"""
+		返回上下左右四个方向上可以通行的邻居的索引（顺序与Point坐标的上、下、左、右一致）
+		"""
+		x,y = divmod(index,self.ncols)
+		state = self.state
+		neighbors = []
+		if y+1<self.ncols and state[index+1]!=3:
+			neighbors.append(index+1)
+		if y>0 and state[index-1]!=3:
+			neighbors.append(index-1)
+		if x>0 and state[index-self.ncols]!=3:
+			neighbors.append(index-self.ncols)
+		if x+1<self.nrows and state[index+self.ncols]!=3:
+			neighbors.append(index+self.ncols)
+		return neighbors
+
+	def setState(self,index,value):
+		"""
+		Change the state of a block in place, e.g. when an obstacle appears (0 -> 3) or disappears (3 -> 0).
+		The fingerprint is computed again the next time it is asked for, version is increased so that the
+		GridPointGroup views of this grid see the change. Setting a block to 1 (2) makes it the starting block
+		(the endpoint block), changing the current starting block (endpoint block) to something else falls back
+		to another block with that value, or -1 if there is none.
+		"""
+		old = int(self.state[index])
+		self.state[index] = value
+		self._fingerprint = None
+		self.version += 1
+		for special,attribute in ((1,'start'),(2,'end')):
+			if value==special:
+				setattr(self,attribute,index)
+			elif old==special and getattr(self,attribute)==index:
+				others = flatnonzero(self.state==special)
+				setattr(self,attribute,int(others[-1]) if others.size else -1)
+		if self.weight is not None and value!=3:
+			# 清除的障碍物的权重可能比其它栅格都小
+			self.min_weight = min(self.min_weight,self.weight[index].item())
+		point = self._points.get(index)
+		if point is not None:
+			point.facecolor = FACECOLORS[value]
+
+	@property
+	def workspace(self):
+		if self._workspace is None:
+			self._workspace = SearchWorkspace(self.state.size)
+		return self._workspace
+
+	@property
+	def reverse_workspace(self):
+		if self._reverse_workspace is None:
+			self._reverse_workspace = SearchWorkspace(self.state.size)
+		return self._reverse_workspace
+
+	@property
+	def cost(self):
+		workspace = self.workspace
+		return where(workspace.stamp==workspace.generation,workspace.cost,inf)
+
+	@property
+	def parent(self):
+		workspace = self.workspace
+		return where(workspace.stamp==workspace.generation,workspace.parent,-1)
+
+	@property
+	def visited(self):
+		return self.workspace.closed==self.workspace.generation
+
+	def reset(self):
+		# 开始新的搜索，上一次搜索留下的cost、parent和visited全部作废
+		self.workspace.reset()
+
+	def path(self,goal):
+		"""
+		从goal开始回溯parent，返回从起点到goal的索引列表，goal不可达时返回空列表
+		"""
+		return self.workspace.path(goal)
+
+class SearchWorkspace:
+	"""
+	The SearchWorkspace object holds the cost, parent and visited data of a search in arrays that are allocated
+	once and reused by every later search on the same grid. Instead of refilling the arrays, reset only increases
+	the generation counter: cost[index] and parent[index] are valid only when stamp[index]==generation, and a
+	block is visited only when closed[index]==generation, so whatever an earlier search left behind is ignored.
+	"""
+
+	def __init__(self,size):
+		self.cost = empty(size)
+		self.parent = empty(size,dtype=int32 if size<2**31 else int64)
+		self.stamp = zeros(size,dtype=uint32) # cost和parent是第几代写入的
+		self.closed = zeros(size,dtype=uint32) # 栅格是第几代被检查的
+		self.generation = 1 # 从1开始，stamp和closed里的0永远不会是有效的一代
+
+	def __str__(self):
+		return "<SearchWorkspace of {} blocks at generation {}>".format(self.cost.size,self.generation)
+
+	def reset(self):
+		if self.generation==iinfo(uint32).max:
+			# 计数器用完了，真正清空一次（每40多亿次搜索才发生一次）
+			self.stamp.fill(0)
+			self.closed.fill(0)
+			self.generation = 1
+		self.generation += 1
+
+	def getCost(self,index):
+		return self.cost[index] if self.stamp[index]==self.generation else inf
+
+	def path(self,goal):
+		"""
+		从goal开始回溯parent，返回从起点到goal的索引列表，goal不可达时返回空列表
+		"""
+		if self.stamp[goal]!=self.generation:
+			return []
+		path = [goal]
+		while self.parent[path[-1]]!=-1:
+			path.append(int(self.parent[path[-1]]))
+		path.reverse()
+		return path
+
 class RasterMap:
 	"""
 	The RasterMap class is the core class of the Rasterbuider module, which provides the following functions:
 	1. Convert the array maparray to Point, PointGroup objects, which also uniquely correspond to a raster map.
+	   The map itself is kept in a GridIndex (the grid attribute), the groups are views of it and the Points
+	   are only created when they are accessed.
 	2. Draw the raster map defined using Point and PointGroup objects onto the specified Axes.
 	3. Update the color of the specified block on the raster map drawn on the specified Axes.
+	   The map is drawn as a single RGBA image, updating a block only changes one pixel of it,
+	   so the cost of drawing a frame stays the same however many blocks have been updated.
 	"""
 
 	def __init__(self):
@@ -143,44 +576,56 @@ class RasterMap:
 		self.end_point = None
 		self.obstacle_point_group = PointGroup("obstacle")
 		self.all_point_group = PointGroup("all")
+		self.start_point_group = PointGroup("start")
+		self.end_point_group = PointGroup("end")
+		self.grid = None
+		self._images = {} # Axes -> drawMap在这个Axes上画出的AxesImage
 
-	def buildMap(self,maparray:ndarray):
+	def buildMap(self,maparray:ndarray,costarray:ndarray=None):
+		"""
+		Every call builds a new map from scratch, the groups of the previous map are dropped.
+		costarray is the optional cost of entering each block, see GridIndex.
+		"""
 		self.size = maparray.shape
-		for i in range(maparray.shape[0]):
-			for j in range(maparray.shape[1]):
-				point = Point(maparray.shape[0]-i-1,j)
-				if maparray[i,j] == 1:
-					point.facecolor='green'
-					point.edgecolor='gray'
-					self.start_point = point
-				elif maparray[i,j] == 2:
-					point.facecolor='red'
-					point.edgecolor='gray'
-					self.end_point = point
-				elif maparray[i,j] == 3:
-					point.facecolor='black'
-					point.edgecolor='gray'
-					self.obstacle_point_group.append(point)
-				else:
-					point.facecolor='white'
-					point.edgecolor='gray'
-				self.all_point_group.append(point)
+		self.grid = GridIndex(maparray,costarray)
+		# 分类只是在grid.state上做比较，Point对象等到用到的时候再由grid.point创建
+		self.all_point_group = GridPointGroup("all",self.grid)
+		self.obstacle_point_group = GridPointGroup("obstacle",self.grid,3)
+		# maparray中可以有多个起点和终点，start_point和end_point只是其中的最后一个
+		self.start_point_group = GridPointGroup("start",self.grid,1)
+		self.end_point_group = GridPointGroup("end",self.grid,2)
+		self.start_point = self.grid.point(self.grid.start) if self.grid.start>=0 else None
+		self.end_point = self.grid.point(self.grid.end) if self.grid.end>=0 else None
 		return self.start_point,self.end_point,self.obstacle_point_group,self.all_point_group
 
 	def drawMap(self,ax):
+		"""
+		The whole raster map is one RGBA image shown through a single imshow, plus one LineCollection for the
+		gray block edges, so the number of artists on ax does not grow with the size of the map.
+		"""
 		try:
-			ax.set_xlim([0,self.size[0]])
-			ax.set_ylim([0,self.size[1]])
+			nrows,ncols = self.size
+			# 每个栅格一个像素，图像的第y行第x列就是Point(x,y)
+			rgba = array([to_rgba(color) for color in FACECOLORS])[self.grid.state].reshape(nrows,ncols,4).transpose(1,0,2)
+			self._images[ax] = ax.imshow(rgba,origin='lower',extent=(0,nrows,0,ncols),interpolation='nearest',aspect='auto')
+			edges = [[(x,0),(x,ncols)] for x in range(nrows+1)]+[[(0,y),(nrows,y)] for y in range(ncols+1)]
+			ax.add_collection(LineCollection(edges,colors=EDGECOLOR,linewidths=1.0))
+			ax.set_xlim([0,nrows])
+			ax.set_ylim([0,ncols])
 			ax.set_xticks([])
 			ax.set_yticks([])
-			for point in self.all_point_group:
-				ax.add_patch(Rectangle((point.x,point.y),width=1,height=1,facecolor=point.facecolor,edgecolor=point.edgecolor))
 		except Exception as e:
 			print("Please first use maparray to create a map!")
 
 	def updateMap(self,ax,point,facecolor):
-		ax.add_patch(Rectangle((point.x,point.y),width=1,height=1,facecolor=facecolor,edgecolor=point.edgecolor,alpha=0.4))
+		"""
+		Blend facecolor with an alpha of 0.4 into the pixel of point, the image drawn by drawMap is changed in place.
+		"""
+		image = self._images[ax]
+		rgba = image.get_array()
+		rgba[point.y,point.x,:3] = 0.4*asarray(to_rgb(facecolor))+0.6*rgba[point.y,point.x,:3]
+		image.changed() # 让imshow丢掉缓存，下次draw时重新采样
 
-__all__ = ['Point','PointGroup','PointGroupOrdered','RasterMap']
+__all__ = ['Point','PointGroup','PointGroupOrdered','GridPointGroup','GridIndex','SearchWorkspace','RasterMap']
 
 
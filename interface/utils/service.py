@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 19:05:52
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块把求解器包装成一个本地服务（asyncio），客户端通过Unix socket或者localhost的TCP连接，每行发送一个JSON请求，每行收到一个JSON回复。
+
+- 栅格图只需要上传一次：服务按栅格图的指纹（GridIndex.fingerprint）保存解析好的栅格图，之后的请求只带指纹和(起点,终点)；
+  state和权重放在共享内存里，工作进程第一次用到某张栅格图时直接在共享内存上建立GridIndex，之后一直留着；
+- 合并：正在求解中的相同查询（同一张栅格图、同一个算法、同一对起点终点）只求解一次，结果发给所有等待它的请求；
+- 批处理：同一张栅格图、同一个算法的查询先攒batch_window秒（或者攒满max_batch个），再作为一个任务交给进程池；
+- 统计：stats请求返回请求数、合并掉的查询数、批次数和求解请求延迟的p50、p99。
+
+请求（id可选，回复中会原样带回，同一个连接上可以不等回复连续发送多个请求）：
+	{"op":"upload","map":[[0,1,...],...],"cost":[[...],...]} 或 {"op":"upload","file":"map.spmap"} -> {"map":指纹,"shape":[nrows,ncols]}
+	{"op":"solve","map":指纹,"pairs":[[[0,0],[19,19]],...],"algorithm":"astar","paths":true} -> {"costs":[...],"expanded":[...],"paths":[...]}
+	{"op":"stats"} -> {"requests":...,"latency_p50_ms":...,"latency_p99_ms":...,...}
+出错时回复{"error":"..."}。
+
+在interface目录下启动服务：
+python -m utils.service --unix /tmp/shortestpath.sock
+python -m utils.service --port 8765
+
+Usage:
+from utils.service import ServiceClient
+with ServiceClient(path='/tmp/shortestpath.sock') as client:
+	key = client.upload(maparray)
+	reply = client.solve(key,[[[0,0],[19,19]]],algorithm='astar')
+	client.stats()
+"""
+
+import asyncio
+import json
+import socket
+from argparse import ArgumentParser
+from collections import OrderedDict,deque
+from concurrent.futures import ProcessPoolExecutor,ThreadPoolExecutor
+from time import perf_counter
+from numpy import asarray,percentile,int32
+from .rasterbuilder import GridIndex
+from .batchsolver import ALGORITHMS,_share,_attach
+
+class _MapEntry:
+	"""
+	服务中保存的一张栅格图：GridIndex、放state和权重的共享内存，以及还在攒或者还没有完成的批次数（大于0时不会被淘汰）
+	"""
+
+	def __init__(self,grid):
+		self.grid = grid
+		self.shms = [_share(grid.state)]
+		if grid.weight is not None:
+			self.shms.append(_share(grid.weight))
+		weight = grid.weight
+		# 工作进程用它在共享内存上建立GridIndex
+		self.spec = (grid.fingerprint(),grid.shape,self.shms[0].name,self.shms[1].name if weight is not None else None,
+			weight.dtype.str if weight is not None else None,grid.min_weight)
+		self.jobs = 0
+
+	def close(self):
+		for shm in self.shms:
+			shm.close()
+			shm.unlink()
+
+_grids = OrderedDict() # 工作进程中：指纹 -> (共享内存,GridIndex)，最近用过的放在最后
+
+def _solve_batch(spec,algorithm,queries,cache_size=8):
+	"""
+	在工作进程中求解一批查询，返回每个查询的(cost,expanded,最短路的(x,y)坐标列表)
+	"""
+	key,shape,state_name,weight_name,weight_dtype,min_weight = spec
+	if key in _grids:
+		_grids.move_to_end(key)
+		grid = _grids[key][1]
+	else:
+		size = shape[0]*shape[1]
+		state_shm,state = _attach(state_name,(size,),'uint8')
+		shms,weight = [state_shm],None
+		if weight_name is not None:
+			weight_shm,weight = _attach(weight_name,(size,),weight_dtype)
+			shms.append(weight_shm)
+		grid = GridIndex.fromArrays(shape,state,weight,min_weight=min_weight)
+		_grids[key] = (shms,grid)
+		while len(_grids)>cache_size:
+			shms,evicted = _grids.popitem(last=False)[1]
+			del evicted # 共享内存上的数组都放掉之后才能close
+			for shm in shms:
+				shm.close()
+	solve = ALGORITHMS[algorithm]
+	results = []
+	for start,end in queries:
+		grid.start,grid.end = start,end
+		result = solve(grid)
+		results.append((float(result.cost),int(result.expanded),asarray(result.path,dtype=int32).tolist()))
+	return results
+
+class SolveService:
+	"""
+	异步的本地求解服务
+	"""
+
+	def __init__(self,processes=None,max_maps=8,batch_window=0.002,max_batch=256,history=10000):
+		"""
+		Args:
+			processes(int): 工作进程数，默认为CPU核数，为0时在服务进程的一个线程中求解
+			max_maps(int): 最多保存多少张栅格图，超出时淘汰最久没用过的
+			batch_window(float): 同一批查询最多等多少秒
+			max_batch(int): 一批最多多少个查询
+			history(int): 计算延迟分位数时使用最近多少个求解请求
+		"""
+		self.executor = ThreadPoolExecutor(1) if processes==0 else ProcessPoolExecutor(processes)
+		self.max_maps = max_maps
+		self.batch_window = batch_window
+		self.max_batch = max_batch
+		self._maps = OrderedDict() # 指纹 -> _MapEntry
+		self._inflight = {} # (指纹,算法,起点,终点) -> Future
+		self._pending = {} # (指纹,算法) -> (_MapEntry,[(起点,终点,Future),...],定时器)
+		self._latency = deque(maxlen=history)
+		self._batches = set() # 正在求解的批次的task
+		self._server = None
+		self.counters = dict(requests=0,errors=0,uploads=0,solves=0,queries=0,coalesced=0,batches=0,batched_queries=0)
+
+	def __str__(self):
+		return "<SolveService with {} maps>".format(len(self._maps))
+
+	async def start(self,path=None,host='127.0.0.1',port=8765):
+		"""
+		path不为None时监听Unix socket，否则监听host:port
+		"""
+		limit = 2**30 # 上传栅格图的那一行可能很长
+		if path is not None:
+			self._server = await asyncio.start_unix_server(self._handle,path,limit=limit)
+		else:
+			self._server = await asyncio.start_server(self._handle,host,port,limit=limit)
+		return self._server
+
+	async def serve_forever(self,path=None,host='127.0.0.1',port=8765):
+		server = await self.start(path,host,port)
+		async with server:
+			await server.serve_forever()
+
+	def close(self):
+		if self._server is not None:
+			self._server.close()
+		self.executor.shutdown(wait=True)
+		for entry in self._maps.values():
+			entry.close()
+		self._maps.clear()
+
+	async def _handle(self,reader,writer):
+		# 每个请求单独一个task，同一个连接上的请求可以同时在处理中，回复的顺序和完成的顺序一致
+		tasks = set()
+		try:
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+				task = asyncio.ensure_future(self._reply(line,writer))
+				tasks.add(task)
+				task.add_done_callback(tasks.discard)
+			if tasks:
+				await asyncio.wait(tasks)
+		finally:
+			writer.close()
+
+	async def _reply(self,line,writer):
+		started = perf_counter()
+		self.counters['requests'] += 1
+		message = {}
+		try:
+			message = json.loads(line)
+			reply = await self.dispatch(message)
+		except Exception as e:
+			self.counters['errors'] += 1
+			reply = {'error':"{}: {}".format(type(e).__name__,e)}
+		if isinstance(message,dict) and 'id' in message:
+			reply['id'] = message['id']
+		if isinstance(message,dict) and message.get('op')=='solve' and 'error' not in reply:
+			self._latency.append(perf_counter()-started)
+		writer.write(json.dumps(reply).encode()+b'\n')
+		await writer.drain()
+
+	async def dispatch(self,message):
+		"""
+		处理一个已经解析好的请求，返回回复
+		"""
+		op = message.get('op')
+		if op=='upload':
+			return self.upload(message)
+		if op=='solve':
+			return await self.solve(message)
+		if op=='stats':
+			return self.stats()
+		raise ValueError("unknown op {!r}".format(op))
+
+	def upload(self,message):
+		if 'file' in message:
+			from .mapfile import MAP_SUFFIX,open_map,read_excel_map
+			filename = message['file']
+			grid = open_map(filename) if filename.endswith(MAP_SUFFIX) else GridIndex(*read_excel_map(filename))
+		else:
+			cost = message.get('cost')
+			grid = GridIndex(asarray(message['map']),None if cost is None else asarray(cost))
+		key = grid.fingerprint()
+		self.counters['uploads'] += 1
+		if key in self._maps:
+			self._maps.move_to_end(key)
+		else:
+			self._maps[key] = _MapEntry(grid)
+			self._evict()
+		return {'map':key,'shape':list(grid.shape)}
+
+	def _evict(self):
+		# 还有批次在求解的栅格图先留着，刚用过的那张（比如刚上传的）也不淘汰，暂时超出max_maps
+		for key in list(self._maps)[:-1]:
+			if len(self._maps)<=self.max_maps:
+				break
+			if self._maps[key].jobs==0:
+				self._maps.pop(key).close()
+
+	async def solve(self,message):
+		key = message['map']
+		if key not in self._maps:
+			raise KeyError("unknown map {}, upload it first".format(key))
+		self._maps.move_to_end(key)
+		algorithm = message.get('algorithm','astar')
+		if algorithm not in ALGORITHMS:
+			raise ValueError("algorithm must be one of {}".format(sorted(ALGORITHMS)))
+		grid = self._maps[key].grid
+		pairs = message['pairs'] if 'pairs' in message else [[message['start'],message['goal']]]
+		queries = []
+		for (sx,sy),(ex,ey) in pairs:
+			start,end = grid.index(sx,sy),grid.index(ex,ey)
+			if start<0 or end<0 or grid.state[start]==3 or grid.state[end]==3:
+				raise ValueError("({},{})->({},{}) is outside the map or on an obstacle".format(sx,sy,ex,ey))
+			queries.append((start,end))
+		self.counters['solves'] += 1
+		self.counters['queries'] += len(queries)
+		results = await asyncio.gather(*[self._query(key,algorithm,start,end) for start,end in queries])
+		reply = {'costs':[cost for cost,_,_ in results],'expanded':[expanded for _,expanded,_ in results]}
+		if message.get('paths',True):
+			reply['paths'] = [path for _,_,path in results]
+		return reply
+
+	def _query(self,key,algorithm,start,end):
+		query = (key,algorithm,start,end)
+		if query in self._inflight:
+			self.counters['coalesced'] += 1
+			return asyncio.shield(self._inflight[query])
+		loop = asyncio.get_running_loop()
+		future = self._inflight[query] = loop.create_future()
+		group = (key,algorithm)
+		if group not in self._pending:
+			# 还在攒的批次也算一个任务，这段时间里上传别的栅格图不会把这张栅格图淘汰掉
+			entry = self._maps[key]
+			entry.jobs += 1
+			self._pending[group] = (entry,[],loop.call_later(self.batch_window,self._flush,group))
+		batch = self._pending[group][1]
+		batch.append((start,end,future))
+		if len(batch)>=self.max_batch:
+			self._flush(group)
+		return future
+
+	def _flush(self,group):
+		entry,batch,timer = self._pending.pop(group)
+		timer.cancel() # 攒满提前发出去时，旧的定时器不能再把下一批提前发出去
+		task = asyncio.ensure_future(self._run_batch(group,entry,batch))
+		self._batches.add(task) # 事件循环只弱引用task，求解完之前要自己留着
+		task.add_done_callback(self._batches.discard)
+
+	async def _run_batch(self,group,entry,batch):
+		key,algorithm = group
+		self.counters['batches'] += 1
+		self.counters['batched_queries'] += len(batch)
+		error = RuntimeError("the batch was cancelled")
+		try:
+			results = await asyncio.get_running_loop().run_in_executor(self.executor,_solve_batch,entry.spec,algorithm,
+				[(start,end) for start,end,_ in batch])
+		except Exception as e:
+			error = e
+		else:
+			for (start,end,future),result in zip(batch,results):
+				if not future.done():
+					future.set_result(result)
+		finally:
+			# 不管成功与否，等待这一批的请求都要收到回复，也不能留在_inflight里让之后相同的查询合并到它上面
+			entry.jobs -= 1
+			for start,end,future in batch:
+				self._inflight.pop((key,algorithm,start,end),None)
+				if not future.done():
+					future.set_exception(error)
+			self._evict()
+
+	def stats(self):
+		latency = asarray(self._latency)
+		p50,p99 = percentile(latency,[50,99])*1000 if latency.size else (0.0,0.0)
+		return dict(self.counters,maps=len(self._maps),inflight=len(self._inflight),latency_samples=int(latency.size),
+			latency_p50_ms=float(p50),latency_p99_ms=float(p99))
+
+class ServiceClient:
+	"""
+	SolveService的同步客户端，一问一答
+	"""
+
+	def __init__(self,path=None,host='127.0.0.1',port=8765):
+		if path is not None:
+			self._socket = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+			self._socket.connect(path)
+		else:
+			self._socket = socket.create_connection((host,port))
+		self._file = self._socket.makefile('rwb')
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self,*args):
+		self.close()
+
+	def close(self):
+		self._file.close()
+		self._socket.close()
+
+	def request(self,**message):
+		self._file.write(json.dumps(message).encode()+b'\n')
+		self._file.flush()
+		reply = json.loads(self._file.readline())
+		if 'error' in reply:
+			raise RuntimeError(reply['error'])
+		return reply
+
+	def upload(self,maparray,costarray=None):
+		"""
+		上传栅格图，返回它的指纹，之后的solve只需要带上指纹
+		"""
+		message = {'op':'upload','map':asarray(maparray).tolist()}
+		if costarray is not None:
+			message['cost'] = asarray(costarray).tolist()
+		return self.request(**message)['map']
+
+	def solve(self,key,pairs,algorithm='astar',paths=True):
+		return self.request(op='solve',map=key,pairs=asarray(pairs).tolist(),algorithm=algorithm,paths=paths)
+
+	def stats(self):
+		return self.request(op='stats')
+
+__all__ = ['SolveService','ServiceClient']
+
+if __name__ == '__main__':
+	parser = ArgumentParser(description='Serve the path finding solvers over a Unix socket or localhost TCP.')
+	parser.add_argument('--unix',help='path of the Unix socket, TCP is used when it is omitted')
+	parser.add_argument('--host',default='127.0.0.1')
+	parser.add_argument('--port',type=int,default=8765)
+	parser.add_argument('--processes',type=int,help='worker processes, 0 solves in a thread of the service process')
+	parser.add_argument('--max-maps',type=int,default=8)
+	args = parser.parse_args()
+	service = SolveService(args.processes,args.max_maps)
+	try:
+		asyncio.run(service.serve_forever(args.unix,args.host,args.port))
+	except KeyboardInterrupt:
+		pass
+	finally:
+		service.close()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 09:12:40
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块用紧凑的事件轨迹代替每一步保存一张png。
+
+TraceRecorder是一个SearchObserver，求解时把(step,cell,state)事件记到内存里，每一步只是往数组里追加三个整数；
+Trace可以保存为.npz文件再读回来；TraceReplay可以跳到任意一步，重建那一帧每个栅格的状态或者RGB图像，
+只有在真的需要图像的时候才去画。
+
+Usage:
+from utils.easypathfinder import solve_astar
+from utils.tracerecorder import TraceRecorder,TraceReplay
+recorder = TraceRecorder()
+solve_astar(maparray,observer=recorder)
+recorder.trace.save('astar_trace.npz')
+replay = TraceReplay(recorder.trace)
+image = replay.render(100) # 第100步时的栅格图
+images = [replay.image(replay.seek(step)) for step in range(len(replay))] # 逐帧播放
+"""
+
+from array import array
+from numpy import asarray,empty,load,savez_compressed,searchsorted,unique,dtype,uint8,uint32
+from matplotlib.colors import to_rgb
+from .rasterbuilder import FACECOLORS
+from .easypathfinder import SearchObserver
+
+EXPANDED = 4 # 栅格被检查过，画成黄色
+PATH = 5 # 栅格在最短路上，画成蓝色
+
+TRACE_DTYPE = dtype([('step',uint32),('cell',uint32),('state',uint8)])
+
+class Trace:
+	"""
+	一次求解的事件轨迹
+
+	Attributes:
+		state(ndarray): 求解开始时每个栅格的值（GridIndex的顺序），形状为(nrows*ncols,)
+		shape(tuple): 栅格图的形状(nrows,ncols)
+		events(ndarray): TRACE_DTYPE结构化数组，按step从小到大排列
+	"""
+
+	def __init__(self,state,shape,events):
+		self.state = asarray(state,dtype=uint8)
+		self.shape = tuple(shape)
+		self.events = asarray(events,dtype=TRACE_DTYPE)
+
+	def __len__(self):
+		# 总帧数，第0帧是还没开始搜索时的栅格图
+		return int(self.events['step'][-1])+1 if self.events.size else 1
+
+	def __str__(self):
+		return "<Trace of a {}x{} map with {} events in it>".format(self.shape[0],self.shape[1],self.events.size)
+
+	def save(self,filename):
+		savez_compressed(filename,state=self.state,shape=asarray(self.shape),events=self.events)
+
+	@classmethod
+	def load(cls,filename):
+		with load(filename) as data:
+			return cls(data['state'],data['shape'],data['events'])
+
+class TraceRecorder(SearchObserver):
+	"""
+	把求解过程记录成Trace，每检查一个栅格、每画出最短路上的一个栅格都算一步
+	"""
+
+	def __init__(self):
+		self.trace = None
+
+	def start(self,grid):
+		self._state = grid.state.copy()
+		self._shape = grid.shape
+		self._step = 0
+		self._steps = array('I')
+		self._cells = array('I')
+		self._states = array('B')
+
+	def _record(self,index,state):
+		self._step += 1
+		self._steps.append(self._step)
+		self._cells.append(index)
+		self._states.append(state)
+
+	def expand(self,index):
+		self._record(index,EXPANDED)
+
+	def finish(self,grid,path,result):
+		for index in path:
+			self._record(index,PATH)
+		events = empty(len(self._steps),dtype=TRACE_DTYPE)
+		events['step'] = self._steps
+		events['cell'] = self._cells
+		events['state'] = self._states
+		self.trace = Trace(self._state,self._shape,events)
+
+class TraceReplay:
+	"""
+	根据Trace重建任意一步的栅格图
+	"""
+
+	def __init__(self,trace):
+		self.trace = trace
+		# 每个栅格底色（maparray的0-3）与叠加状态（无、黄色、黄色再叠蓝色）组合成的颜色表，和RasterMap.updateMap的叠加效果一致
+		base = [to_rgb(color) for color in FACECOLORS]
+		yellow = [_blend(color,to_rgb('yellow')) for color in base]
+		blue = [_blend(color,to_rgb('blue')) for color in yellow]
+		self._palette = (asarray([base,yellow,blue])*255).round().astype(uint8) # 形状为(3,4,3)
+		self._cursor = None # seek上一次到的那一步，和那一步的状态
+		self._state = None
+
+	def __len__(self):
+		return len(self.trace)
+
+	def frame(self,step):
+		"""
+		返回第step步结束时每个栅格的状态（GridIndex的顺序），没有事件的栅格就是它在maparray中的值
+		"""
+		return self.advance(self.trace.state.copy(),0,step)
+
+	def advance(self,state,begin,end):
+		"""
+		把第begin步之后、第end步为止（包括第end步）的事件叠加到第begin步的状态state上，直接修改并返回state。
+		顺序播放时每一帧只需要叠加一步的事件
+		"""
+		events = self.trace.events
+		first,last = searchsorted(events['step'],(begin,end),side='right')
+		if last>first:
+			# 同一个栅格可能有多个事件，只保留最后一个
+			cells = events['cell'][first:last][::-1]
+			cells,latest = unique(cells,return_index=True)
+			state[cells] = events['state'][first:last][::-1][latest]
+		return state
+
+	def seek(self,step):
+		"""
+		返回第step步结束时每个栅格的状态。step比上一次seek的大时从上一次的状态往后叠加，顺序播放时每一帧只需要叠加这一帧的事件；
+		比上一次的小时从头重建。返回的数组会被下一次seek直接修改，需要保留时先copy
+		"""
+		if self._cursor is None or step<self._cursor:
+			self._state = self.trace.state.copy()
+			self._cursor = 0
+		self.advance(self._state,self._cursor,step)
+		self._cursor = step
+		return self._state
+
+	def render(self,step):
+		"""
+		返回第step步结束时的RGB图像，形状为(ncols,nrows,3)，第0行是y=0那一行，用imshow(origin='lower')画出来和RasterMap一样。
+		每次都从头重建，用于随意跳到某一步；逐帧播放时用image(seek(step))
+		"""
+		return self.image(self.frame(step))
+
+	def image(self,state):
+		# 把frame或advance得到的状态转换成RGB图像
+		overlay = (state>=EXPANDED).astype(uint8)+(state==PATH) # 0:无 1:黄色 2:黄色再叠蓝色
+		image = self._palette[overlay,self.trace.state]
+		return image.reshape(self.trace.shape[0],self.trace.shape[1],3).transpose(1,0,2)
+
+def _blend(below,above,alpha=0.4):
+	# 以alpha的透明度把above叠在below上
+	return tuple(alpha*a+(1-alpha)*b for a,b in zip(above,below))
+
+__all__ = ['EXPANDED','PATH','TRACE_DTYPE','Trace','TraceRecorder','TraceReplay']
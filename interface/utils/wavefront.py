@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Date    : 2026-10-17 18:31:47
+# @Author  : syuansheng (Dalian Maritime University)
+
+"""
+这个模块实现了每一步cost都是1的栅格图上的逐层宽度优先搜索（wavefront），用NumPy一次处理一整层栅格。
+
+每一步的cost都相同时dijkstra就是宽度优先搜索：第d层是所有cost为d的栅格，它们都是第d-1层栅格的邻居。
+所以不需要open list，每一层只要把当前这一层（frontier）的索引整体加上四个方向的偏移量，
+去掉越界的、障碍物和已经到达过的栅格，剩下的就是下一层，一层只需要几次数组运算，不用在Python中逐个检查栅格。
+只处理frontier中的栅格而不是对整张栅格图做移位，长长的迷宫走廊每一层也只花很少的时间。
+
+得到的cost和dijkstra完全一样，parent的方向也都在某条最短路上，但cost相同的几条路之间的取舍可能和dijkstra不同。
+带权（costarray）的栅格图不能用这个模块。
+
+Usage:
+from utils.wavefront import wavefront,solve_wavefront
+cost,direction = wavefront(grid,grid.start) # 整张栅格图的距离场，方向和DistanceField一样
+result = solve_wavefront(maparray) # 到达终点所在的那一层就停下
+"""
+
+from time import perf_counter
+from numpy import asarray,concatenate,full,int8,int32,intp
+from .easypathfinder import SearchResult
+from .connectivity import as_grid,reachable
+
+UP,DOWN,LEFT,RIGHT = 0,1,2,3 # 与GridIndex.neighbors的上、下、左、右一致：y+1,y-1,x-1,x+1
+OPPOSITE = (DOWN,UP,RIGHT,LEFT)
+
+def wavefront(grid,source,target=-1,observer=None):
+	"""
+	从source出发逐层搜索
+
+	Args:
+		grid(GridIndex): 必须是每一步的cost都是1的栅格图
+		source(int): 起点的索引
+		target(int): 终点的索引，到达终点所在的那一层之后就停下，-1时搜索整张栅格图
+		observer(SearchObserver): 可选，每一层的栅格按索引顺序调用expand
+
+	Returns:
+		(cost,direction): cost是int32数组，不可达（或提前停下时还没有到达）为-1；
+			direction是index的parent所在的方向（UP、DOWN、LEFT、RIGHT），source和没有到达的栅格为-1
+	"""
+	assert grid.weight is None,"The wavefront search only works on maps where every move costs 1!"
+	nrows,ncols = grid.shape
+	size = nrows*ncols
+	free = asarray(grid.state)!=3
+	cost = full(size,-1,dtype=int32)
+	direction = full(size,-1,dtype=int8)
+	cost[source] = 0
+	frontier = asarray([source],dtype=intp)
+	offsets = (1,-1,-ncols,ncols)
+	layer = 0
+	while frontier.size:
+		if observer is not None:
+			for index in frontier.tolist():
+				observer.expand(index)
+		if 0<=target and cost[target]>=0:
+			break
+		layer += 1
+		x,y = divmod(frontier,ncols)
+		inside = (y+1<ncols,y>0,x>0,x+1<nrows)
+		neighbors,parents = [],[]
+		for move in (UP,DOWN,LEFT,RIGHT):
+			neighbor = frontier[inside[move]]+offsets[move]
+			neighbor = neighbor[free[neighbor]&(cost[neighbor]<0)]
+			neighbors.append(neighbor)
+			parents.append(full(neighbor.size,OPPOSITE[move],dtype=int8))
+		neighbors,parents = concatenate(neighbors),concatenate(parents)
+		# 同一个栅格可能是几个frontier栅格的邻居，但来自不同的方向，写入之后方向还对得上的那一条就是留下来的
+		cost[neighbors] = layer
+		direction[neighbors] = parents
+		frontier = neighbors[direction[neighbors]==parents]
+	return cost,direction
+
+def _path(grid,direction,goal):
+	# 从goal开始沿parent的方向回溯
+	offsets = (1,-1,-grid.ncols,grid.ncols)
+	path = [goal]
+	while direction[path[-1]]>=0:
+		path.append(path[-1]+offsets[direction[path[-1]]])
+	path.reverse()
+	return path
+
+def solve_wavefront(maparray,observer=None,early_exit=True):
+	"""
+	不画图、不保存文件的逐层宽度优先搜索，得到的最短路长度和dijkstra一样
+
+	Args：
+		maparray(ndarray): 也可以直接传入GridIndex，必须是每一步的cost都是1的栅格图
+		observer(SearchObserver): 可选，只有start、expand和finish会被调用，每一层的栅格按索引顺序expand
+		early_exit(bool): 为True时到达终点所在的那一层就停下，否则搜索所有能到达的栅格
+
+	Returns:
+		result(SearchResult): expanded是到达过的栅格数，没有open list，pushes、pops都为0
+	"""
+	started = perf_counter()
+	grid = as_grid(maparray)
+	start,end = grid.start,grid.end
+	assert start>=0 and end>=0,"maparray must contain a starting block (1) and an endpoint block (2)!"
+	if observer is not None:
+		observer.start(grid)
+	path,expanded,shortest = [],0,float('inf')
+	if reachable(grid):
+		cost,direction = wavefront(grid,start,end if early_exit else -1,observer)
+		expanded = int((cost>=0).sum())
+		if cost[end]>=0:
+			path = _path(grid,direction,end)
+			shortest = float(cost[end])
+	result = SearchResult(shortest,grid.coords(path),expanded)
+	if observer is not None:
+		observer.finish(grid,path,result)
+	result.search_time = perf_counter()-started
+	return result
+
+__all__ = ['wavefront','solve_wavefront']
@@ -2,19 +2,17 @@
 # -*- coding: utf-8 -*-
 # @Date    : 2025-07-11 22:28:33
 # @Author  : syuansheng (Dalian Maritime University)
-from functools import partial
 from weakref import proxy
 from tkinter import *
 from tkinter.filedialog import askopenfilename,asksaveasfilename
 from tkinter.simpledialog import askinteger,askstring
+from tkinter.messagebox import showerror
 from tkinter.ttk import Notebook,Progressbar
 from matplotlib import pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.animation as animation
-from PIL import Image, ImageSequence
 from pandas import DataFrame
-from numpy import array
 from pandastable import Table
+from utils.player import GifFrames,AnimationPlayer
 import webbrowser
 
 class UI(Tk):
@@ -48,9 +46,9 @@ class UI(Tk):
 		"""
 		self.menu = Menu(self)
 		self.data_menu = Menu(self.menu,tearoff=False)
-		self.data_menu.add_command(label='读取(.xlsx)文件',command=self.controller.readFromFile)
+		self.data_menu.add_command(label='读取(.xlsx/.spmap)文件',command=self.controller.readFromFile)
 		self.data_menu.add_command(label='随机生成测试栅格',command=self.controller.randomData)
-		self.data_menu.add_command(label='将当前算例另存为(.xlsx)文件',command=self.controller.exportData)
+		self.data_menu.add_command(label='将当前算例另存为(.xlsx/.spmap)文件',command=self.controller.exportData)
 		self.menu.add_cascade(label='文件',menu=self.data_menu) # data_menu作为menu的子菜单
 		self.menu.add_command(label='使用说明',command=self.controller.openurl)
 		self.config(menu=self.menu) # 配置根窗口的菜单
@@ -86,21 +84,20 @@ class UI(Tk):
 		self.rb1 = Radiobutton(self.lf1,text='Dijkstra',variable=self.rbvar,value=1,command=self.controller.choose)
 		self.rb2 = Radiobutton(self.lf1,text='A Star',variable=self.rbvar,value=2,command=self.controller.choose)
 		self.bt = Button(self.lf1,text='Run',bitmap='hourglass',compound='left',relief="flat",command=self.controller.solve)
-		self.bt.pack(expand=True,side=BOTTOM,fill=BOTH)
-		self.rb1.pack(expand=True,side=LEFT)
-		self.rb2.pack(expand=True,side=RIGHT)
-		# self.pb = Progressbar(self.lf1,orient=HORIZONTAL,length=100,mode='determinate')
-		# self.pb['maximum'] = 100
-		# self.pb['value'] = 0
-		# self.pb.grid(row=0,column=0,columnspan=2,sticky=W+E+N+S)
-		# self.rb1.grid(row=1,column=0,sticky=W+E+N+S)
-		# self.rb2.grid(row=1,column=1,sticky=W+E+N+S)
-		# self.bt.grid(row=2,column=0,columnspan=2)
-		# self.lf1.rowconfigure(0,weight=1)    # grid让子组件完全应用父亲组件的空间
-		# self.lf1.rowconfigure(1,weight=1)
-		# self.lf1.rowconfigure(2,weight=1)
-		# self.lf1.columnconfigure(0,weight=1)
-		# self.lf1.columnconfigure(1,weight=1)
+		self.bt_cancel = Button(self.lf1,text='Cancel',relief="flat",state=DISABLED,command=self.controller.cancel)
+		self.pb = Progressbar(self.lf1,orient=HORIZONTAL,length=100,mode='determinate')
+		self.pb['maximum'] = 100
+		self.pb['value'] = 0
+		self.pb.grid(row=0,column=0,columnspan=2,sticky=W+E+N+S)
+		self.rb1.grid(row=1,column=0,sticky=W+E+N+S)
+		self.rb2.grid(row=1,column=1,sticky=W+E+N+S)
+		self.bt.grid(row=2,column=0,sticky=W+E+N+S)
+		self.bt_cancel.grid(row=2,column=1,sticky=W+E+N+S)
+		self.lf1.rowconfigure(0,weight=1)    # grid让子组件完全应用父亲组件的空间
+		self.lf1.rowconfigure(1,weight=1)
+		self.lf1.rowconfigure(2,weight=1)
+		self.lf1.columnconfigure(0,weight=1)
+		self.lf1.columnconfigure(1,weight=1)
 
 		self.lbvar1 = StringVar()
 		self.lbvar1.set('Unready')
@@ -118,16 +115,22 @@ class UI(Tk):
 		self.lbvar4.set('Unknown')
 		Label(self.lf2,text='求解时间(s)').grid(row=3,column=0,sticky=N+S+W+E)
 		self.lb4 = Label(self.lf2,textvariable=self.lbvar4,fg='red')
+		self.lbvar5 = StringVar()
+		self.lbvar5.set('Unknown')
+		Label(self.lf2,text='渲染时间(s)').grid(row=4,column=0,sticky=N+S+W+E)
+		self.lb5 = Label(self.lf2,textvariable=self.lbvar5,fg='red')
 		self.lf2.grid_rowconfigure(0,weight=1)  # 设置lf2内各个组件随着窗口变化等比例缩放
 		self.lf2.grid_rowconfigure(1,weight=1)
 		self.lf2.grid_rowconfigure(2,weight=1)
 		self.lf2.grid_rowconfigure(3,weight=1)
+		self.lf2.grid_rowconfigure(4,weight=1)
 		self.lf2.grid_columnconfigure(0,weight=1)
 		self.lf2.grid_columnconfigure(1,weight=1)
 		self.lb1.grid(row=0,column=1,sticky=N+S+W+E)
 		self.lb2.grid(row=1,column=1,sticky=N+S+W+E)
 		self.lb3.grid(row=2,column=1,sticky=N+S+W+E)
 		self.lb4.grid(row=3,column=1,sticky=N+S+W+E)
+		self.lb5.grid(row=4,column=1,sticky=N+S+W+E)
 
 		self.fig,self.ax = plt.subplots(figsize=(6,6),dpi=6,gridspec_kw={"wspace":0.05,"hspace":0.05}) 
 		self.fig.subplots_adjust(left=0,right=1,bottom=0,top=1)
@@ -144,6 +147,20 @@ class UI(Tk):
 		self.agger = FigureCanvasTkAgg(self.fig,self.lf3)
 		self.agger.draw() # 重新渲染figure上的图形到tkinter中
 		canvas = self.agger.get_tk_widget() # 返回widget用于布局
+		# 播放控制：拖动进度条跳到任意一帧，暂停/继续，调整播放速度
+		self.player = None # 正在播放的AnimationPlayer，必须保持引用，否则动画会被回收
+		self.frame_player = Frame(self.lf3)
+		self.frame_player.pack(side=BOTTOM,fill=X,padx=10)
+		self.seekvar = IntVar()
+		self._seeking = False # 播放器自己更新进度条时不要再触发seek
+		self.scale = Scale(self.frame_player,variable=self.seekvar,orient=HORIZONTAL,from_=0,to=0,showvalue=False,command=self._seek)
+		self.bt_pause = Button(self.frame_player,text='Pause',relief="flat",command=self._toggle_pause)
+		self.speedvar = StringVar()
+		self.speedvar.set('1x')
+		self.om_speed = OptionMenu(self.frame_player,self.speedvar,'0.5x','1x','2x','4x','8x',command=self._set_speed)
+		self.om_speed.pack(side=RIGHT)
+		self.bt_pause.pack(side=RIGHT)
+		self.scale.pack(side=LEFT,fill=X,expand=True)
 		canvas.pack(padx=10,pady=10,fill=BOTH,expand=True)
 
 	def _set_frame_table(self):
@@ -169,49 +186,53 @@ class UI(Tk):
 		"""
 		更新ax，展示当前选择的栅格图
 		"""
+		if self.player is not None:
+			self.player.close()
+			self.player = None
 		self.ax.cla()
 		rsm.drawMap(self.ax)
 		self.agger.draw()
 
-	def _update(self,frame,frames,img):
-		img.set_array(frames[frame])
-		return [img]
-
 	def update_ax_1(self,giffilename):
 		"""
-		更新ax，动态展示寻路过程
+		更新ax，动态展示寻路过程，gif的帧在播放时才解码，只缓存最近的几十帧
 		"""
+		if self.player is not None:
+			# 上一个播放器的计时器和gif文件都要关掉
+			self.player.close()
+			self.player = None
 		self.ax.cla()#清空axes
-		self.agger.draw()
-		gif = Image.open(giffilename+'.gif')
-		# 提取所有帧和延迟时间
-		frames = []
-		delays = []
-		for frame in ImageSequence.Iterator(gif):
-			# 转换为 RGB 模式
-			frame = frame.convert("RGB")
-			frames.append(array(frame))
-		    # 获取帧延迟（毫秒）
-			try:
-				delays.append(frame.info['duration'])
-			except KeyError:
-				delays.append(100)  # 默认延迟 100ms
-		img = self.ax.imshow(frames[0])
-		# 计算平均帧率（FPS）
-		avg_delay = sum(delays) / len(delays)
-		fps = 1000 / avg_delay  # 帧/秒
-		# 创建动画
-		ani = animation.FuncAnimation(
-			self.fig, 
-			partial(self._update,img=img,frames=frames), 
-			frames=len(frames),
-			interval=avg_delay,  # 帧间隔（毫秒）
-			blit=True
-		)
+		self.player = AnimationPlayer(self.fig,self.ax,GifFrames(giffilename+'.gif'),on_frame=self._on_frame)
+		self.scale.config(to=len(self.player)-1)
+		self.bt_pause.config(text='Pause')
+		self._set_speed(self.speedvar.get())
 		self.agger.draw() # 在fig上画好后渲染
 
+	def _on_frame(self,i):
+		self._seeking = True
+		self.seekvar.set(i)
+		self._seeking = False
+
+	def _seek(self,value):
+		if self.player is not None and not self._seeking:
+			self.player.seek(int(value))
+
+	def _toggle_pause(self):
+		if self.player is None:
+			return
+		if self.player.playing:
+			self.player.pause()
+			self.bt_pause.config(text='Play')
+		else:
+			self.player.play()
+			self.bt_pause.config(text='Pause')
+
+	def _set_speed(self,speed):
+		if self.player is not None:
+			self.player.setSpeed(float(speed[:-1]))
+
 	def getfilename(self):
-		path = askopenfilename(title='请选择后缀为(.xlsx)的数据文件',defaultextension=".xlsx", filetypes=(("Excel files", "*.xlsx"), ("All files", "*.*")))
+		path = askopenfilename(title='请选择后缀为(.xlsx)或(.spmap)的数据文件',defaultextension=".xlsx", filetypes=(("Excel files", "*.xlsx"), ("Map files", "*.spmap"), ("All files", "*.*")))
 		return path
 
 	def getoutputfilename(self):
@@ -234,9 +255,49 @@ class UI(Tk):
 		self.lb1.config(fg='green')
 		self.lb2.config(fg='green')
 
-	def update_state_check2(self,time):
-		self.lbvar4.set(str(time))
+	def update_state_check2(self,search_time,render_time):
+		"""
+		分别展示求解时间和生成gif的时间
+		"""
+		self.lbvar4.set("{:.3f}".format(search_time))
+		self.lbvar5.set("{:.1f}".format(render_time))
 		self.lb4.config(fg='green')
+		self.lb5.config(fg='green')
+
+	def start_progress(self):
+		"""
+		开始求解：清空进度条，求解期间不能再点Run，可以点Cancel
+		"""
+		self.pb['value'] = 0
+		self.bt.config(state=DISABLED)
+		self.bt_cancel.config(state=NORMAL)
+		self.lbvar4.set('Running')
+		self.lbvar5.set('Running')
+		self.lb4.config(fg='red')
+		self.lb5.config(fg='red')
+
+	def update_progress(self,stage,done,total):
+		"""
+		求解阶段占进度条的前40%，生成gif占后60%
+		"""
+		ratio = min(done/total,1) if total else 1
+		self.pb['value'] = 40*ratio if stage=='search' else 40+60*ratio
+
+	def finish_progress(self,state=None):
+		"""
+		求解结束（state为None）、被取消或者出错
+		"""
+		self.bt.config(state=NORMAL)
+		self.bt_cancel.config(state=DISABLED)
+		if state is None:
+			self.pb['value'] = 100
+		else:
+			self.pb['value'] = 0
+			self.lbvar4.set(state)
+			self.lbvar5.set(state)
+
+	def show_error(self,error):
+		showerror('求解失败',str(error))
 
 	def update_state_check3(self):
 		self.lbvar3.set(["Dijkstra",'A star'][self.rbvar.get()-1])